@@ -114,7 +114,7 @@ class Component(components.ComponentBase):
         list(map(q.put, job["identity"]))
         confirmed_identities = set()
         all_identities_sent = False
-        while True:
+        while not self.cancelled.is_set():
             try:
                 identity = q.get_nowait()
             except queue.Empty:
@@ -167,25 +167,15 @@ class Component(components.ComponentBase):
                             msg_id,
                             info,
                         )
-                        for _ in range(2400):
-                            if cache.get(data) in [
-                                driver.job_end,
-                                driver.job_failed,
-                            ]:
-                                self.log.debug(
-                                    "Job [ %s ] coordination complete for"
-                                    " [ %s ]",
-                                    msg_id,
-                                    info,
-                                )
-                                driver.backend_send(
-                                    msg_id=msg_id,
-                                    control=driver.coordination_ack,
-                                    info=info,
-                                )
-                                break
-                            self.driver.event.wait(0.25)
-                        else:
+                        try:
+                            cache.wait_for(
+                                key=data,
+                                predicate=lambda status: status
+                                in [driver.job_end, driver.job_failed],
+                                timeout=self.timeout,
+                                interval=0.25,
+                            )
+                        except TimeoutError:
                             self.log.debug(
                                 "Job [ %s ] expected SHA [ %s ] was not"
                                 " found.",
@@ -198,6 +188,18 @@ class Component(components.ComponentBase):
                                 info=info,
                                 stderr="Item was not found in cache",
                             )
+                        else:
+                            self.log.debug(
+                                "Job [ %s ] coordination complete for"
+                                " [ %s ]",
+                                msg_id,
+                                info,
+                            )
+                            driver.backend_send(
+                                msg_id=msg_id,
+                                control=driver.coordination_ack,
+                                info=info,
+                            )
                 elif control == driver.coordination_ack:
                     self.log.debug(
                         "Job [ %s ] coordination ACK for [ %s ] received",
@@ -250,3 +252,12 @@ class Component(components.ComponentBase):
                     "Waiting for coordination messages from %s",
                     sorted(set(job["identity"]) - confirmed_identities),
                 )
+
+        return (
+            None,
+            "Job cancelled",
+            False,
+            "Job [ {} ] was cancelled before coordination completed".format(
+                job["job_id"]
+            ),
+        )
@@ -89,30 +89,54 @@ class Component(components.ComponentBase):
         :returns: tuple
         """
 
-        warning_loops = start_time = time.time()
         missing_identity = set()
-        while (time.time() - start_time) < job["query_timeout"]:
-            args = cache.get("args")
-            if not args:
-                continue
 
-            query_args = args.get("query", dict())
+        def _found(args):
+            """Return True when the item is found in the query cache.
+
+            :param args: Cached arguments.
+            :type args: Dictionary
+            :returns: Boolean
+            """
+
+            query_args = (args or dict()).get("query")
             if not query_args:
-                continue
-            elif "identity" in job and job["identity"]:
+                return False
+            elif job.get("identity"):
+                missing_identity.clear()
                 for identity in job["identity"]:
                     items = query_args.get(identity)
-                    if isinstance(items, dict):
-                        if job["item"] not in items.keys():
-                            missing_identity.add(identity)
-                            break
-                        else:
-                            if identity in missing_identity:
-                                missing_identity.remove(identity)
-                    else:
+                    if not isinstance(items, dict) or job["item"] not in items:
                         missing_identity.add(identity)
-                        break
+                return not missing_identity
+            else:
+                return any(job["item"] in i for i in query_args.values())
+
+        end_time = time.time() + job["query_timeout"]
+        while not self.cancelled.is_set():
+            try:
+                cache.wait_for(
+                    key="args",
+                    predicate=_found,
+                    timeout=min(5, max(end_time - time.time(), 0)),
+                    interval=0.1,
+                )
+            except TimeoutError:
+                if time.time() >= end_time:
+                    break
+                elif missing_identity:
+                    self.log.warning(
+                        "QUERY argument [ %s ] not found in cache for %s",
+                        job["item"],
+                        missing_identity,
+                    )
                 else:
+                    self.log.debug(
+                        "QUERY argument [ %s ] not found in cache",
+                        job["item"],
+                    )
+            else:
+                if job.get("identity"):
                     return (
                         "Item found in all identities",
                         None,
@@ -124,33 +148,13 @@ class Component(components.ComponentBase):
                             )
                         ),
                     )
-                if missing_identity:
-                    if time.time() - warning_loops >= 5:
-                        self.log.warning(
-                            "QUERY argument [ %s ] not found in cache for %s",
-                            job["item"],
-                            missing_identity,
-                        )
-                        warning_loops = time.time()
-            else:
-                for value in query_args.values():
-                    if job["item"] in value:
-                        return (
-                            "Item found",
-                            None,
-                            True,
-                            "Item {} found in the query cache".format(
-                                job["item"]
-                            ),
-                        )
-
-            if time.time() - warning_loops >= 5:
-                self.log.debug(
-                    "QUERY argument [ %s ] not found in cache", job["item"]
-                )
-                warning_loops = time.time()
-
-            self.driver.event.wait(0.01)
+                else:
+                    return (
+                        "Item found",
+                        None,
+                        True,
+                        "Item {} found in the query cache".format(job["item"]),
+                    )
 
         if missing_identity:
             info = (
@@ -20,6 +20,7 @@ import os
 import queue
 import socket
 import sys
+import threading
 
 from types import SimpleNamespace
 
@@ -77,11 +78,30 @@ def plugin_import(plugin):
     return importlib.import_module(plugin, package="directord")
 
 
-def component_import(component, job_id=None):
-    """Import a component and return a tuple with the class object.
+_COMPONENT_REGISTRY = dict()
+_COMPONENT_REGISTRY_LOCK = threading.Lock()
 
-    If the component isn't a builtin the system will search
-    the shared path for a user defined component.
+
+def _component_signature(transfer):
+    """Return the signature of a component source file.
+
+    Builtin components are returned with a signature of None as they're only
+    loaded once.
+
+    :param transfer: Path to the user component source file.
+    :type transfer: String
+    :returns: Tuple|None
+    """
+
+    if not transfer:
+        return None
+
+    stat = os.stat(transfer)
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def _component_load(component, job_id=None):
+    """Import a component and return a tuple with the class.
 
     > Return: (Boolean, Boolean, Object|String)
 
@@ -129,7 +149,58 @@ def component_import(component, job_id=None):
             )
             return False, transfer, info
 
-    return True, transfer, component_obj.Component()
+    return True, transfer, component_obj.Component
+
+
+def component_import(component, job_id=None):
+    """Import a component and return a tuple with the class object.
+
+    If the component isn't a builtin the system will search
+    the shared path for a user defined component.
+
+    Resolved component classes are stored in a registry so that a module is
+    only loaded once. User defined components are reloaded when the source
+    file changes. Every call returns a new component instance.
+
+    > Return: (Boolean, Boolean, Object|String)
+
+    :param component: String name of the component.
+    :type component: String
+    :param job_id: Job UUID, used client side.
+    :type job_id: String
+    :returns: Tuple
+    """
+
+    with _COMPONENT_REGISTRY_LOCK:
+        registered = _COMPONENT_REGISTRY.get(component)
+        if registered:
+            transfer, signature, component_class = registered
+            try:
+                if _component_signature(transfer=transfer) == signature:
+                    return True, transfer, component_class()
+            except FileNotFoundError:
+                pass
+
+            _COMPONENT_REGISTRY.pop(component, None)
+
+        success, transfer, component_class = _component_load(
+            component=component, job_id=job_id
+        )
+        if not success:
+            return success, transfer, component_class
+
+        try:
+            signature = _component_signature(transfer=transfer)
+        except FileNotFoundError:
+            pass
+        else:
+            _COMPONENT_REGISTRY[component] = (
+                transfer,
+                signature,
+                component_class,
+            )
+
+    return True, transfer, component_class()
 
 
 class Processor:
@@ -13,9 +13,15 @@
 #   under the License.
 
 import collections
+import concurrent.futures
+import concurrent.futures.process
 import datetime
-import json
+import functools
+import multiprocessing
 import os
+import queue
+import sys
+import threading
 import time
 import traceback
 
@@ -23,8 +29,85 @@ import directord
 from directord import components
 from directord import interface
 from directord import iodict
+from directord import models
 from directord import utils
 
+# NOTE(cloudnull): Process pool workers are started from a forkserver so
+#                  they are never forked from a threaded process.
+_PROCESS_CONTEXT = "forkserver"
+# Component outcome used to return incremental command output.
+OUTPUT_DELTA = "output_delta"
+# NOTE(cloudnull): Process pool worker state, set by the pool initializer.
+_PROCESS_CACHE = None
+_PROCESS_DRIVER = None
+
+
+class ProcessDriver(models.BaseModel):
+    """Minimal driver object used by components within the process pool."""
+
+    def __init__(self, identity):
+        """Initialize the process driver.
+
+        :param identity: Client identity
+        :type identity: String
+        """
+
+        self.identity = identity
+
+
+def _process_pool_init(cache_path, lock, identity):
+    """Initialize a component process pool worker.
+
+    :param cache_path: Client cache path.
+    :type cache_path: String
+    :param lock: Locking object shared with the client cache.
+    :type lock: Object
+    :param identity: Client identity
+    :type identity: String
+    """
+
+    global _PROCESS_CACHE
+    global _PROCESS_DRIVER
+
+    _PROCESS_CACHE = iodict.Cache(path=cache_path, lock=lock, memory=True)
+    _PROCESS_DRIVER = ProcessDriver(identity=identity)
+
+
+def _process_component_run(
+    command, info, job, output_limit=0, output_spill_path=None
+):
+    """Run a component client within a process pool worker.
+
+    :param command: Command used to run a given job.
+    :type command: String
+    :param info: Information that was sent over with the original message.
+    :type info: String
+    :param job: Job definition
+    :type job: Dictionary
+    :param output_limit: Maximum number of bytes captured for command output.
+    :type output_limit: Integer
+    :param output_spill_path: Directory used to store truncated output.
+    :type output_spill_path: String
+    :returns: Tuple
+    """
+
+    success, _, component = directord.component_import(
+        component=command.lower(),
+        job_id=job["job_id"],
+    )
+    if not success:
+        raise ImportError(component)
+
+    setattr(component, "command", command)
+    setattr(component, "info", info)
+    setattr(component, "driver", _PROCESS_DRIVER)
+    setattr(component, "output_limit", output_limit)
+    setattr(component, "output_spill_path", output_spill_path)
+    stdout, stderr, outcome, info = component.client(
+        cache=_PROCESS_CACHE, job=job
+    )
+    return stdout, stderr, outcome, info, component.block_on_tasks
+
 
 class Client(interface.ProcessInterface):
     """Directord client class."""
@@ -45,6 +128,35 @@ class Client(interface.ProcessInterface):
         self.base_component = components.ComponentBase()
         self.cache = dict()
         self.start_time = time.time()
+        self.max_inflight_jobs = getattr(self.args, "max_inflight_jobs", 0)
+        self.inflight_jobs = 0
+        self.inflight_lock = threading.Lock()
+        self.component_process_pool = getattr(
+            self.args, "component_process_pool", 0
+        )
+        self.process_pool = None
+        self.cache_lock = None
+        self.output_limit = getattr(self.args, "output_limit", 0)
+        self.output_spill_path = getattr(self.args, "output_spill_path", None)
+        self.output_stream_interval = getattr(
+            self.args, "output_stream_interval", 0
+        )
+        self.compression_threshold = getattr(
+            self.args, "compression_threshold", 0
+        )
+        # NOTE(cloudnull): Compression is enabled once the server signals
+        #                  that it can decode compressed data.
+        self.compression = False
+        self.payload_encoding = getattr(self.args, "payload_encoding", "json")
+        # NOTE(cloudnull): Msgpack results are sent once the server sends a
+        #                  msgpack encoded job.
+        self.encoding = None
+        self.result_batch = None
+        result_batch_window = getattr(self.args, "result_batch_window", 0)
+        if result_batch_window:
+            self.result_batch = utils.ResultBatch(
+                ctx=self, window=result_batch_window
+            )
 
     def exit_gracefully(self, *args, **kwargs):
         """Set the driver event to begin the shutdown of the application."""
@@ -54,30 +166,79 @@ class Client(interface.ProcessInterface):
         )
         self.driver.event.set()
 
-    def q_processor(self, queue, lock):
-        """Process jobs from the known queue.
+    @staticmethod
+    def _parent_queue_name(job):
+        """Return the parent queue name and bypass state for a job.
 
-        :param queue: queue object.
-        :type queue: Object
-        :param lock: Locking object, used if a component requires it.
-        :type lock: Object
+        Bypass and async jobs are grouped by parent, all other jobs share
+        the general parent queue.
+
+        :param job: Job definition
+        :type job: Dictionary
+        :returns: Tuple
         """
 
-        for item in queue.getter():
-            component_kwargs, command, info = item
-            self.log.debug(
-                "Job received [ %s ]", component_kwargs["job"]["job_id"]
+        if job.get("parent_async_bypass") is True:
+            return (
+                "q_bypass_{}".format(job.get("parent_id", job["job_id"])),
+                True,
+            )
+        elif job.get("parent_async") is True:
+            return (
+                "q_async_{}".format(job.get("parent_id", job["job_id"])),
+                False,
             )
-            self.job_q_component_run(component_kwargs, command, info, lock)
+        else:
+            return "q_general", False
 
-            if self.driver.event.is_set():
-                return
+    def get_process_pool(self):
+        """Return a started component process pool.
+
+        Process pool workers are started from a forkserver, and the client
+        cache is passed to the workers by path. All workers are started
+        before the pool is returned.
+
+        :returns: Object
+        """
+
+        if sys.version_info < (3, 7):
+            self.log.warning(
+                "The component process pool requires Python 3.7 or later,"
+                " components will be executed within threads."
+            )
+            return None
+
+        self.log.info(
+            "Starting component process pool with [ %s ] workers",
+            self.component_process_pool,
+        )
+        pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.component_process_pool,
+            mp_context=multiprocessing.get_context(_PROCESS_CONTEXT),
+            initializer=_process_pool_init,
+            initargs=(
+                os.path.join(self.args.cache_path, "client"),
+                self.cache_lock,
+                self.driver.identity,
+            ),
+        )
+        concurrent.futures.wait(
+            [
+                pool.submit(os.getpid)
+                for _ in range(self.component_process_pool)
+            ]
+        )
+        return pool
 
     def job_q_processor(self, q_processes, lock=None):
         """Process a given work queue.
 
-        The defined `queue` is processed. The `processes` arg allows this
-        method to spawn N processes.
+        Jobs are read from `q_processes` with a blocking get and scheduled
+        onto a bounded pool of worker threads sized by `cpu_count`. Jobs are
+        grouped into parent queues and every parent queue is executed in
+        FIFO order by at most one worker at a time. Bypass parents are not
+        bound to the pool, every ready bypass parent is given its own
+        thread so they're never blocked by general work or by each other.
 
         :param q_processes: Queue object
         :type q_processes: Object
@@ -85,208 +246,184 @@ class Client(interface.ProcessInterface):
         :type lock: Object
         """
 
-        def _get_pending_bypass_threads(parents):
-            """Return the current non-bypass thread objects.
+        if not lock:
+            lock = self.driver.get_lock()
+
+        parents = collections.OrderedDict()
+        active = set()
+        scheduler_lock = threading.Lock()
+        lane = queue.Queue()
 
-            :param parents: Dictionary of all parent objects.
-            :type parents: Dictionary
-            :returns: List
+        def _schedule(name, bypass):
+            """Mark a parent queue ready, the scheduler lock must be held.
+
+            :param name: Parent queue name.
+            :type name: String
+            :param bypass: Parent queue bypass state.
+            :type bypass: Boolean
             """
 
-            return [
-                i["t"].name
-                for i in parents.values()
-                if i["bypass"]
-                and not i["t"].is_alive()
-                and i["t"].ident is None
-            ]
+            if name in active:
+                return
+
+            active.add(name)
+            # NOTE(cloudnull): Bypass work, query waits and the callbacks
+            #                  which release them, is never bound to a
+            #                  pool. A bounded bypass pool can be filled by
+            #                  waiters, starving the callbacks they are
+            #                  waiting on.
+            if bypass:
+                threading.Thread(
+                    target=_run,
+                    kwargs=dict(name=name, bypass=bypass),
+                    name="q_bypass_{}".format(name),
+                    daemon=True,
+                ).start()
+            else:
+                lane.put((name, bypass))
 
-        def _get_pending_threads(parents):
-            """Return the current non-bypass thread objects.
+        def _run(name, bypass):
+            """Execute the next job from a ready parent queue.
 
-            :param parents: Dictionary of all parent objects.
-            :type parents: Dictionary
-            :returns: List
+            :param name: Parent queue name.
+            :type name: String
+            :param bypass: Parent queue bypass state.
+            :type bypass: Boolean
             """
 
-            return [
-                i["t"].name
-                for i in parents.values()
-                if not i["bypass"]
-                and not i["t"].is_alive()
-                and i["t"].ident is None
-            ]
+            with scheduler_lock:
+                try:
+                    component_kwargs, command, info = parents[name].popleft()
+                except (KeyError, IndexError):
+                    active.discard(name)
+                    parents.pop(name, None)
+                    return
 
-        def _get_thread_count(parents):
-            """Return the current non-bypass thread count.
+            try:
+                self.log.debug(
+                    "Job received [ %s ]",
+                    component_kwargs["job"]["job_id"],
+                )
+                self.job_q_component_run(component_kwargs, command, info, lock)
+            except Exception as e:
+                self.log.critical(
+                    "Parent queue [ %s ] job failure [ %s ]", name, str(e)
+                )
+            finally:
+                with scheduler_lock:
+                    active.discard(name)
+                    if parents.get(name):
+                        _schedule(name=name, bypass=bypass)
+                    else:
+                        parents.pop(name, None)
+
+        def _worker():
+            """Execute one job at a time from ready parent queues."""
+
+            for name, bypass in iter(lane.get, None):
+                _run(name=name, bypass=bypass)
 
-            :param parents: Dictionary of all parent objects.
-            :type parents: Dictionary
-            :returns: Integer
+        def _purge(job):
+            """Purge all queued jobs, the scheduler lock must be held.
+
+            :param job: Job definition
+            :type job: Dictionary
             """
 
-            return len(
-                [
-                    True
-                    for i in parents.values()
-                    if not i["bypass"] and i["t"].is_alive()
-                ]
-            )
+            count = 0
+            for value in parents.values():
+                while value:
+                    _kwargs, _command, _ = value.popleft()
+                    self.q_return.put(
+                        (
+                            None,
+                            None,
+                            False,
+                            "Omitted due to sentinel from {}".format(
+                                job["job_id"]
+                            ),
+                            _kwargs["job"],
+                            _command,
+                            0,
+                            None,
+                        )
+                    )
+                    count += 1
+            self.log.info("Purged %s items from the work queues", count)
 
-        if not lock:
-            lock = self.driver.get_lock()
+        def _dispatch(item):
+            """Put a job into its parent queue.
+
+            :param item: Job item containing kwargs, command, and info.
+            :type item: Tuple
+            """
 
+            component_kwargs, command, _ = item
+            job = component_kwargs["job"]
+            self.log.debug("Received job_id [ %s ]", job["job_id"])
+            name, bypass = self._parent_queue_name(job=job)
+            with scheduler_lock:
+                # NOTE(cloudnull): If the command is queuesentinel purge all
+                #                  queued items. This is on the ONE component
+                #                  where we intercept and react outside of
+                #                  the component structure.
+                if command.lower() == "queuesentinel":
+                    _purge(job=job)
+
+                if name not in parents:
+                    parents[name] = collections.deque()
+                    self.log.debug("Parent queue [ %s ] created.", name)
+
+                parents[name].append(item)
+                _schedule(name=name, bypass=bypass)
+
+        if self.component_process_pool and not self.process_pool:
+            self.process_pool = self.get_process_pool()
+
+        for i in range(self.cpu_count):
+            threading.Thread(
+                target=_worker,
+                name="q_worker_{}".format(i),
+                daemon=True,
+            ).start()
+
+        # NOTE(cloudnull): Recover work from legacy durable parent queues.
         parent_tracker_recover = iodict.DurableQueue(
             path=os.path.join(self.args.cache_path, "parent_tracker"),
             lock=lock,
         )
-        parent_tracker = collections.OrderedDict()
-        for item in parent_tracker_recover.getter():
-            k, v = item
-            q = self.driver.get_queue(name=k)
-            parent_tracker[k] = dict(t=None, q=q, bypass=v)
-            parent_tracker[k]["t"] = self.driver.thread_processor(
-                target=self.q_processor,
-                kwargs=dict(
-                    queue=parent_tracker[k]["q"],
-                    lock=lock,
-                ),
-                name=k,
-                daemon=True,
-            )
+        for name, _ in parent_tracker_recover.getter():
+            for item in self.driver.get_queue(name=name).getter():
+                _dispatch(item=item)
 
-        while not q_processes.empty() or parent_tracker:
+        while not self.driver.event.is_set():
             try:
-                (
-                    component_kwargs,
-                    command,
-                    info,
-                ) = q_processes.get_nowait()
+                item = q_processes.get(timeout=1)
+            except queue.Empty:
+                continue
             except ValueError as e:
                 self.log.critical("Queue object value error [ %s ]", str(e))
-            except Exception:
-                sleep_interval = 0.1
             else:
-                sleep_interval = 0.001
-                lower_command = command.lower()
-                job = component_kwargs["job"]
-                self.log.debug("Received job_id [ %s ]", job["job_id"])
-                # NOTE(cloudnull): If the command is queuesentinel purge all
-                #                  queued items. This is on the ONE component
-                #                  where we intercept and react outside of
-                #                  the component structure.
-                if lower_command == "queuesentinel":
-                    count = 0
-                    for value in list(parent_tracker.values()):
-                        count = 0
-                        for item in value["q"].getter():
-                            _kwargs, _command, _ = item
-                            self.q_return.put(
-                                (
-                                    None,
-                                    None,
-                                    False,
-                                    "Omitted due to sentinel from {}".format(
-                                        job["job_id"]
-                                    ),
-                                    _kwargs["job"],
-                                    _command,
-                                    0,
-                                    None,
-                                )
-                            )
-                            count += 1
-                    self.log.info(
-                        "Purged %s items from the work queues", count
-                    )
+                _dispatch(item=item)
 
-                if job.get("parent_async_bypass") is True:
-                    _q_name = "q_bypass_{}".format(
-                        job.get("parent_id", job["job_id"])
-                    )
-                elif job.get("parent_async") is True:
-                    _q_name = "q_async_{}".format(
-                        job.get("parent_id", job["job_id"])
-                    )
-                else:
-                    _q_name = "q_general"
-
-                if _q_name not in parent_tracker:
-                    parent_tracker.setdefault(
-                        _q_name,
-                        dict(
-                            t=None,
-                            q=self.driver.get_queue(name=_q_name),
-                            bypass=job.get("parent_async_bypass", False),
-                        ),
-                    )
-                    parent_tracker[_q_name][
-                        "t"
-                    ] = self.driver.thread_processor(
-                        target=self.q_processor,
-                        kwargs=dict(
-                            queue=parent_tracker[_q_name]["q"],
-                            lock=lock,
-                        ),
-                        name=_q_name,
-                        daemon=True,
-                    )
-                    self.log.info("Parent queue [ %s ] created.", _q_name)
+        for _ in range(self.cpu_count):
+            lane.put(None)
 
-                parent_tracker[_q_name]["q"].put(
-                    (component_kwargs, command, info)
-                )
+        if self.process_pool:
+            self.process_pool.shutdown(wait=False)
+            self.process_pool = None
 
-            for t in _get_pending_bypass_threads(parents=parent_tracker):
-                self.log.info("Starting bypass process [ %s ]", t)
-                parent_tracker[t]["t"].start()
+        # NOTE(cloudnull): Return all pending work to the process queue,
+        #                  unread items are gathered first so parent
+        #                  ordering is retained when the work is restored.
+        with scheduler_lock:
+            unread = list(q_processes.getter())
+            for value in parents.values():
+                while value:
+                    q_processes.put(value.popleft())
 
-            while _get_thread_count(parents=parent_tracker) <= self.cpu_count:
-                for t in _get_pending_threads(parents=parent_tracker):
-                    self.log.info("Starting process [ %s ]", t)
-                    parent_tracker[t]["t"].start()
-                else:
-                    break
-
-            for key, value in list(parent_tracker.items()):
-                if value["t"].is_alive() or value["t"].ident is None:
-                    continue
-                else:
-                    timestamp = time.time()
-                    timeout = timestamp - value.get("timeout", timestamp) > 5
-                    if value["q"].empty() and timeout:
-                        self.terminate_process(process=value["t"])
-                        parent_tracker.pop(key)
-                        self.log.info("Pruned parent [ %s ]", key)
-                    elif not value["q"].empty():
-                        self.log.warning(
-                            "Parent thread was terminated but the queue [ %s ]"
-                            " had items in it, respawning",
-                            key,
-                        )
-                        parent_tracker[key].pop("timeout", None)
-                        parent_tracker[key][
-                            "t"
-                        ] = self.driver.thread_processor(
-                            target=self.q_processor,
-                            kwargs=dict(
-                                queue=parent_tracker[key]["q"],
-                                lock=lock,
-                            ),
-                            name=key,
-                            daemon=True,
-                        )
-                    elif "timeout" not in parent_tracker[key]:
-                        self.log.info("Starting to prune parent [ %s ]", key)
-                        parent_tracker[key]["timeout"] = timestamp
-
-            if self.driver.event.is_set():
-                for k, v in parent_tracker.items():
-                    v["q"].flush()
-                    parent_tracker_recover.put((k, v["bypass"]))
-                return
-
-            time.sleep(sleep_interval)
+            for item in unread:
+                q_processes.put(item)
 
     def job_q_component_run(self, component_kwargs, command, info, lock):
         """Execute a component operation.
@@ -359,6 +496,26 @@ class Client(interface.ProcessInterface):
             setattr(component, "command", command)
             setattr(component, "info", info)
             setattr(component, "driver", self.driver)
+            output_limit = job.get("output_limit", self.output_limit)
+            setattr(component, "output_limit", output_limit)
+            setattr(component, "output_spill_path", self.output_spill_path)
+            # NOTE(cloudnull): Output streaming is only available to
+            #                  components executed within the client.
+            if self.output_stream_interval and not (
+                self.process_pool and component.process_safe
+            ):
+                setattr(
+                    component,
+                    "output_callback",
+                    functools.partial(
+                        self._output_stream, job=job, command=command
+                    ),
+                )
+                setattr(
+                    component,
+                    "output_stream_interval",
+                    self.output_stream_interval,
+                )
 
             locked = False
             if component.requires_lock:
@@ -384,9 +541,42 @@ class Client(interface.ProcessInterface):
 
             _starttime = time.time()
             try:
-                stdout, stderr, outcome, info = component.client(
-                    cache=self.cache, job=job
+                if self.process_pool and component.process_safe:
+                    (
+                        stdout,
+                        stderr,
+                        outcome,
+                        info,
+                        component.block_on_tasks,
+                    ) = self.process_pool.submit(
+                        _process_component_run,
+                        command=command,
+                        info=info,
+                        job=job,
+                        output_limit=component.output_limit,
+                        output_spill_path=component.output_spill_path,
+                    ).result()
+                else:
+                    stdout, stderr, outcome, info = component.client(
+                        cache=self.cache, job=job
+                    )
+            except concurrent.futures.process.BrokenProcessPool as e:
+                stderr = "Job [ {} ] Process pool failure: {}".format(
+                    job_id, str(e)
+                )
+                self.log.critical(
+                    "%s. Falling back to threaded component execution.",
+                    stderr,
                 )
+                # NOTE(cloudnull): Shutdown the broken pool without waiting
+                #                  so its management thread and remaining
+                #                  workers are released.
+                process_pool, self.process_pool = self.process_pool, None
+                if process_pool:
+                    process_pool.shutdown(wait=False)
+                stdout = None
+                outcome = False
+                info = traceback.format_exc()
             except Exception as e:
                 stderr = "Job [ {} ] Component Failure: {}".format(
                     job_id, str(e)
@@ -459,22 +649,22 @@ class Client(interface.ProcessInterface):
                     len(component.block_on_tasks),
                 )
                 self.log.debug("Job call backs: %s ", component.block_on_tasks)
-                block_on_task_success = False
-                while True:
-                    if self.cache.get(block_on_task_data["job_sha3_224"]) in [
-                        self.driver.job_end,
-                        self.driver.job_failed,
-                    ]:
-                        block_on_task_success = True
-                        break
-                    else:
-                        self.log.debug(
-                            "waiting for callback job from [ %s ] to"
-                            " complete. %s",
-                            job["job_id"],
-                            block_on_task_data,
-                        )
-                        time.sleep(1)
+                self.log.debug(
+                    "waiting for callback job from [ %s ] to complete. %s",
+                    job["job_id"],
+                    block_on_task_data,
+                )
+                try:
+                    self.cache.wait_for(
+                        key=block_on_task_data["job_sha3_224"],
+                        predicate=lambda status: status
+                        in [self.driver.job_end, self.driver.job_failed],
+                        timeout=job.get("timeout", 600),
+                    )
+                except TimeoutError:
+                    block_on_task_success = False
+                else:
+                    block_on_task_success = True
 
                 if block_on_task_success:
                     self.log.debug(
@@ -579,7 +769,7 @@ class Client(interface.ProcessInterface):
         ).strftime("%Y-%m-%d %H:%M:%S")
 
         if "new_tasks" in job:
-            conn.data = json.dumps(job)
+            conn.data = utils.encode_payload(job, encoding=self.encoding)
         else:
             minimal_data = {
                 "execution_time": job["execution_time"],
@@ -589,7 +779,9 @@ class Client(interface.ProcessInterface):
             if component_timestamp:
                 minimal_data["component_exec_timestamp"] = component_timestamp
 
-            conn.data = json.dumps(minimal_data)
+            conn.data = utils.encode_payload(
+                minimal_data, encoding=self.encoding
+            )
 
         if job["parent_id"]:
             self.base_component.set_cache(
@@ -604,6 +796,23 @@ class Client(interface.ProcessInterface):
             value=state,
         )
 
+    def _output_stream(self, job, command, stdout, stderr):
+        """Queue incremental output for a running job.
+
+        :param job: Job definition
+        :type job: Dictionary
+        :param command: Command used to run a given job.
+        :type command: String
+        :param stdout: Standard output received since the last update.
+        :type stdout: String
+        :param stderr: Standard error received since the last update.
+        :type stderr: String
+        """
+
+        self.q_return.put(
+            (stdout, stderr, OUTPUT_DELTA, None, job, command, 0, None)
+        )
+
     def job_q_results(self):
         """Job results queue processor.
 
@@ -625,7 +834,28 @@ class Client(interface.ProcessInterface):
                 execution_time,
                 block_on_tasks,
             ) = item
+            if outcome == OUTPUT_DELTA:
+                with utils.ClientStatus(
+                    job_id=job["job_id"],
+                    command=command,
+                    ctx=self,
+                ) as c:
+                    c.job_state = self.driver.job_processing
+                    c.info = "task output"
+                    c.stdout = stdout
+                    c.stderr = stderr
+                    c.data = utils.encode_payload(
+                        {"output_delta": True}, encoding=self.encoding
+                    )
+                continue
+
             self.log.debug("Found task results for [ %s ].", job["job_id"])
+            # NOTE(cloudnull): An outcome of None is a processing update, all
+            #                  other outcomes release an in-flight slot.
+            if outcome is not None:
+                with self.inflight_lock:
+                    self.inflight_jobs = max(self.inflight_jobs - 1, 0)
+
             with utils.ClientStatus(
                 job_id=job["job_id"],
                 command=command,
@@ -728,6 +958,15 @@ class Client(interface.ProcessInterface):
                     agent_uptime=agent_uptime,
                     version=version,
                     driver=self.args.driver,
+                    max_inflight_jobs=self.max_inflight_jobs,
+                    slots=self.available_slots,
+                    compression=utils.COMPRESSION,
+                    encoding=(
+                        utils.ENCODING
+                        if self.payload_encoding == utils.ENCODING
+                        and utils.msgpack
+                        else None
+                    ),
                 )
                 heartbeat_time = time.time() + 30
 
@@ -738,15 +977,22 @@ class Client(interface.ProcessInterface):
                 poller_interval, poller_time = 1, time.time()
                 (
                     _,
-                    _,
+                    control,
                     command,
                     data,
                     info,
                     _,
                     _,
                 ) = self.driver.job_recv()
+                if control == self.driver.compress_notice:
+                    self.compression = self.compression_threshold > 0
                 self.handle_job(command=command, data=data, info=info)
 
+            if self.result_batch and (
+                self.result_batch.check() or self.result_batch.pending
+            ):
+                poller_interval, poller_time = 1, time.time()
+
             poller_interval = utils.return_poller_interval(
                 poller_time=poller_time,
                 poller_interval=poller_interval,
@@ -754,9 +1000,26 @@ class Client(interface.ProcessInterface):
             )
 
             if self.driver.event.is_set():
+                if self.result_batch:
+                    self.result_batch.flush()
                 self.driver.job_close()
                 break
 
+    @property
+    def available_slots(self):
+        """Return the number of available in-flight job slots.
+
+        When no in-flight job limit is defined None is returned.
+
+        :returns: Integer|None
+        """
+
+        if not self.max_inflight_jobs:
+            return None
+
+        with self.inflight_lock:
+            return max(self.max_inflight_jobs - self.inflight_jobs, 0)
+
     def handle_job(
         self,
         command,
@@ -773,7 +1036,10 @@ class Client(interface.ProcessInterface):
         :type info: Dictionary
         """
 
-        job = json.loads(data)
+        data = utils.decompress_frame(data)
+        if utils.get_payload_encoding(data) == utils.ENCODING:
+            self.encoding = utils.ENCODING
+        job = utils.decode_payload(data)
         job["job_id"] = job_id = job.get("job_id", utils.get_uuid())
         job["job_sha3_224"] = job_sha3_224 = job.get(
             "job_sha3_224", utils.object_sha3_224(job)
@@ -789,6 +1055,8 @@ class Client(interface.ProcessInterface):
             job_id,
             job_sha3_224,
         )
+        with self.inflight_lock:
+            self.inflight_jobs += 1
 
         with utils.ClientStatus(
             job_id=job_id,
@@ -853,9 +1121,17 @@ class Client(interface.ProcessInterface):
                 False,
             ),
         ]
+        # NOTE(cloudnull): When the component process pool is enabled the
+        #                  cache lock is shared with the pool workers.
+        if self.component_process_pool:
+            context = multiprocessing.get_context(_PROCESS_CONTEXT)
+            self.cache_lock = context.Lock()
+        else:
+            self.cache_lock = self.driver.get_lock()
         self.cache = iodict.Cache(
             path=os.path.join(self.args.cache_path, "client"),
-            lock=self.driver.get_lock(),
+            lock=self.cache_lock,
+            memory=True,
         )
         self.run_threads(threads=threads, stop_event=self.driver.event)
         self.driver.shutdown()
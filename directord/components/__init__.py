@@ -13,19 +13,170 @@
 #   under the License.
 
 import argparse
+import codecs
+import copy
+import functools
 import os
+import selectors
+import signal
 import subprocess
+import tempfile
+import threading
 import time
 
-import jinja2
-from jinja2 import StrictUndefined
-
 import yaml
 
 from directord import logger
 from directord import utils
 
 
+@functools.lru_cache(maxsize=None)
+def blueprint_environment():
+    """Return the shared blueprint environment.
+
+    The environment is created on first use so that jinja2 is only imported
+    by processes which render blueprints.
+
+    :returns: Object
+    """
+
+    import jinja2
+
+    return jinja2.Environment(
+        loader=jinja2.BaseLoader(),
+        keep_trailing_newline=True,
+        undefined=jinja2.StrictUndefined,
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _blueprint_template(content):
+    """Return a compiled blueprint template.
+
+    Compiled templates are stored in a bounded LRU keyed by the template
+    content so that the parse and compile cost is only paid once for every
+    unique template within a process.
+
+    :param content: A string item that will be interpreted and blueprinted.
+    :type content: String
+    :returns: Object
+    """
+
+    return blueprint_environment().from_string(content)
+
+
+class OutputBuffer:
+    """Bounded output capture.
+
+    Output is stored in a head buffer and a tail ring buffer which together
+    hold at most `limit` bytes. When the limit is exceeded the middle of the
+    output is dropped and, if a spill path is defined, the complete output is
+    written to a spill file within the given path.
+    """
+
+    def __init__(self, limit=0, spill_path=None, suffix=".out"):
+        """Initialize the output buffer.
+
+        :param limit: Maximum number of bytes kept in memory. 0 disables
+                      the limit.
+        :type limit: Integer
+        :param spill_path: Directory used to store the complete output
+                           once the limit is exceeded.
+        :type spill_path: String
+        :param suffix: Spill file suffix.
+        :type suffix: String
+        """
+
+        self.limit = limit or 0
+        self.spill_path = spill_path
+        self.suffix = suffix
+        self.spill_file = None
+        self.total = 0
+        self.head = bytearray()
+        self.tail = bytearray()
+        self._head_limit = self.limit // 2
+        self._tail_limit = self.limit - self._head_limit
+
+    @property
+    def truncated(self):
+        """Return True when output has been dropped from memory.
+
+        :returns: Boolean
+        """
+
+        return bool(self.limit) and self.total > self.limit
+
+    def _spill(self, data):
+        """Write data to the spill file, opening it when required.
+
+        :param data: Output data.
+        :type data: Bytes
+        """
+
+        if not self.spill_file:
+            os.makedirs(self.spill_path, exist_ok=True)
+            self.spill_file = tempfile.NamedTemporaryFile(
+                dir=self.spill_path,
+                prefix="directord-",
+                suffix=self.suffix,
+                delete=False,
+            )
+            self.spill_file.write(self.head)
+            self.spill_file.write(self.tail)
+        self.spill_file.write(data)
+
+    def write(self, data):
+        """Write data into the buffer.
+
+        :param data: Output data.
+        :type data: Bytes
+        """
+
+        if not data:
+            return
+
+        self.total += len(data)
+        if not self.limit:
+            self.head.extend(data)
+            return
+
+        if self.spill_path and (self.spill_file or self.truncated):
+            self._spill(data=data)
+
+        head_space = self._head_limit - len(self.head)
+        if head_space > 0:
+            self.head.extend(data[:head_space])
+            data = data[head_space:]
+
+        self.tail.extend(data)
+        if len(self.tail) > self._tail_limit:
+            del self.tail[: len(self.tail) - self._tail_limit]
+
+    def close(self):
+        """Close the spill file."""
+
+        if self.spill_file:
+            self.spill_file.close()
+
+    def getvalue(self):
+        """Return the captured output.
+
+        When output has been truncated a marker is placed between the head
+        and the tail of the output.
+
+        :returns: Bytes
+        """
+
+        if not self.truncated:
+            return bytes(self.head + self.tail)
+
+        marker = "\n[ ... {} bytes truncated".format(self.total - self.limit)
+        if self.spill_file:
+            marker += ", full output in {}".format(self.spill_file.name)
+        marker += " ... ]\n"
+        return bytes(self.head) + marker.encode() + bytes(self.tail)
+
+
 class ComponentBase:
     """Component base class."""
 
@@ -35,6 +186,11 @@ class ComponentBase:
     verb = None
     block_on_tasks = None
     queue_sentinel = False
+    output_limit = 0
+    output_spill_path = None
+    output_callback = None
+    output_stream_interval = 0
+    timeout = None
 
     def __init__(self, desc=None):
         """Initialize the component base class.
@@ -44,19 +200,159 @@ class ComponentBase:
 
         > Set the `self.cacheable` object True|False according to how the
           component should be treated in terms of on system cache.
+
+        > Set the `self.process_safe` object True when the component client
+          only interacts with the cache, job, and driver identity. Process
+          safe components can be executed within the client process pool.
         """
 
         self.desc = desc
         self.log = logger.getLogger(name="directord")
-        self.blueprint = jinja2.Environment(
-            loader=jinja2.BaseLoader(),
-            keep_trailing_newline=True,
-            undefined=StrictUndefined,
-        )
         self.known_args = None
         self.unknown_args = None
         self.cacheable = True  # Enables|Disables component caching
         self.requires_lock = False  # Enables|Disables component locking
+        # Enables|Disables component execution within the process pool
+        self.process_safe = False
+        self.processes = set()  # Running processes spawned by the component
+        self.cancelled = threading.Event()  # Set when the component is killed
+
+    @property
+    def blueprint(self):
+        """Return the shared blueprint environment.
+
+        :returns: Object
+        """
+
+        return blueprint_environment()
+
+    def kill_processes(self, grace=5):
+        """Kill the process groups of all running processes.
+
+        Commands are started within a new session, the process group is sent
+        a SIGTERM and, after the grace period, a SIGKILL which ensures that
+        all children are stopped.
+
+        :param grace: Seconds to wait for a process to exit after SIGTERM.
+        :type grace: Integer
+        """
+
+        for process in list(self.processes):
+            self.log.warning(
+                "Killing process group [ %s ] for command [ %s ]",
+                process.pid,
+                process.args,
+            )
+            for sig in [signal.SIGTERM, signal.SIGKILL]:
+                try:
+                    os.killpg(process.pid, sig)
+                except (ProcessLookupError, PermissionError):
+                    break
+
+                try:
+                    process.wait(timeout=grace)
+                except subprocess.TimeoutExpired:
+                    pass
+
+            self.processes.discard(process)
+
+    @property
+    def run_command_options(self):
+        """Return the run command options set for the component.
+
+        :returns: Dictionary
+        """
+
+        return dict(
+            output_limit=self.output_limit,
+            output_spill_path=self.output_spill_path,
+            output_callback=self.output_callback,
+            output_stream_interval=self.output_stream_interval,
+            processes=self.processes,
+            start_new_session=bool(self.timeout),
+            cancelled=self.cancelled,
+        )
+
+    @staticmethod
+    def _output_delta(deltas, output_callback):
+        """Send pending output deltas to the output callback.
+
+        :param deltas: Pending output buffers and decoders, by stream name.
+        :type deltas: Dictionary
+        :param output_callback: Callback receiving stdout and stderr.
+        :type output_callback: Function
+        """
+
+        output = dict()
+        for name, (buffer, decoder) in deltas.items():
+            output[name] = decoder.decode(buffer.getvalue())
+            deltas[name] = (OutputBuffer(limit=buffer.limit), decoder)
+
+        if any(output.values()):
+            output_callback(**output)
+
+    @staticmethod
+    def _stream_process(
+        process,
+        stdout,
+        stderr,
+        output_limit=0,
+        output_callback=None,
+        output_stream_interval=0,
+    ):
+        """Read process output incrementally until both pipes are closed.
+
+        When an output callback is defined, output received since the last
+        update is sent to the callback every `output_stream_interval`
+        seconds. Pending output is bounded by the output limit.
+
+        :param process: Process object
+        :type process: Object
+        :param stdout: Buffer receiving standard output.
+        :type stdout: Object
+        :param stderr: Buffer receiving standard error.
+        :type stderr: Object
+        :param output_limit: Maximum number of bytes of pending output.
+        :type output_limit: Integer
+        :param output_callback: Callback receiving stdout and stderr.
+        :type output_callback: Function
+        :param output_stream_interval: Seconds between output updates.
+        :type output_stream_interval: Integer
+        """
+
+        streams = {process.stdout: "stdout", process.stderr: "stderr"}
+        deltas = dict()
+        interval = None
+        if output_callback:
+            interval = output_stream_interval
+            for name in streams.values():
+                deltas[name] = (
+                    OutputBuffer(limit=output_limit),
+                    codecs.getincrementaldecoder("utf-8")(errors="replace"),
+                )
+
+        last_update = time.time()
+        with selectors.DefaultSelector() as selector:
+            selector.register(process.stdout, selectors.EVENT_READ, stdout)
+            selector.register(process.stderr, selectors.EVENT_READ, stderr)
+            while selector.get_map():
+                for key, _ in selector.select(timeout=interval):
+                    data = os.read(key.fd, 65536)
+                    if data:
+                        key.data.write(data)
+                        if deltas:
+                            deltas[streams[key.fileobj]][0].write(data)
+                    else:
+                        selector.unregister(key.fileobj)
+                        key.fileobj.close()
+
+                if deltas and time.time() - last_update >= interval:
+                    ComponentBase._output_delta(
+                        deltas=deltas, output_callback=output_callback
+                    )
+                    last_update = time.time()
+
+        process.wait()
 
     @staticmethod
     def run_command(
@@ -66,6 +362,13 @@ class ComponentBase:
         execute="/bin/sh",
         return_codes=None,
         no_block=False,
+        output_limit=0,
+        output_spill_path=None,
+        output_callback=None,
+        output_stream_interval=0,
+        processes=None,
+        start_new_session=False,
+        cancelled=None,
     ):
         """Run a shell command.
 
@@ -86,15 +389,49 @@ class ComponentBase:
         have in order to ensure success. This can be a list of return
         codes if multiple return codes are acceptable.
 
+        * `output_limit` sets the maximum number of bytes captured for
+        both stdout and stderr. When set, output is streamed into a
+        bounded buffer which keeps the head and tail of the output.
+
+        * `output_spill_path` stores the complete output of a truncated
+        command within the given directory.
+
+        * `output_callback` streams output, incremental updates are sent
+        to the callback every `output_stream_interval` seconds while the
+        command runs.
+
+        * `processes` is a set which tracks the running process, allowing
+        the process to be killed while the command runs.
+
+        * `start_new_session` runs the command within a new session so
+        that its process group can be killed when a timeout is reached.
+        Commands run with `no_block` are always started within a new
+        session so they are detached from the component.
+
+        * `cancelled` is an event which, once set, stops new commands from
+        being started. Cancelled commands return immediately as failed.
+
+        Components pass their options using `run_command_options`.
+
         :param command: String
         :param shell: Boolean
         :param env: Dictionary
         :param execute: String
         :param return_codes: Integer|List
         :param no_block: Boolean
+        :param output_limit: Integer
+        :param output_spill_path: String
+        :param output_callback: Function
+        :param output_stream_interval: Integer
+        :param processes: Set
+        :param start_new_session: Boolean
+        :param cancelled: Object
         :returns: Tuple
         """
 
+        if cancelled is not None and cancelled.is_set():
+            return None, "Command cancelled", False
+
         if env:
             _env = dict(os.environ)
             _env.update(env)
@@ -117,17 +454,92 @@ class ComponentBase:
             executable=execute,
             env=env,
             shell=shell,
-            start_new_session=no_block,
+            start_new_session=start_new_session or no_block,
         )
         if no_block:
             return None, None, True
 
-        output, error = process.communicate()
+        if processes is not None:
+            processes.add(process)
+            # NOTE(cloudnull): The component is cancelled before its
+            #                  processes are killed, a process tracked after
+            #                  the kill has started is killed here.
+            if cancelled is not None and cancelled.is_set():
+                processes.discard(process)
+                if start_new_session:
+                    os.killpg(process.pid, signal.SIGKILL)
+                else:
+                    process.kill()
+                process.communicate()
+                return None, "Command cancelled", False
+
+        try:
+            output, error = ComponentBase._process_output(
+                process=process,
+                output_limit=output_limit,
+                output_spill_path=output_spill_path,
+                output_callback=output_callback,
+                output_stream_interval=output_stream_interval,
+            )
+        finally:
+            if processes is not None:
+                processes.discard(process)
+
         if process.returncode not in return_codes:
             return output, error, False
 
         return output, error, True
 
+    @staticmethod
+    def _process_output(
+        process,
+        output_limit=0,
+        output_spill_path=None,
+        output_callback=None,
+        output_stream_interval=0,
+    ):
+        """Wait for a process and return its output.
+
+        :param process: Process object
+        :type process: Object
+        :param output_limit: Maximum number of bytes captured.
+        :type output_limit: Integer
+        :param output_spill_path: Directory used to store truncated output.
+        :type output_spill_path: String
+        :param output_callback: Callback receiving stdout and stderr.
+        :type output_callback: Function
+        :param output_stream_interval: Seconds between output updates.
+        :type output_stream_interval: Integer
+        :returns: Tuple
+        """
+
+        if output_limit or output_callback:
+            stdout_buffer = OutputBuffer(
+                limit=output_limit,
+                spill_path=output_spill_path,
+                suffix=".stdout",
+            )
+            stderr_buffer = OutputBuffer(
+                limit=output_limit,
+                spill_path=output_spill_path,
+                suffix=".stderr",
+            )
+            try:
+                ComponentBase._stream_process(
+                    process=process,
+                    stdout=stdout_buffer,
+                    stderr=stderr_buffer,
+                    output_limit=output_limit,
+                    output_callback=output_callback,
+                    output_stream_interval=output_stream_interval,
+                )
+            finally:
+                stdout_buffer.close()
+                stderr_buffer.close()
+            return stdout_buffer.getvalue(), stderr_buffer.getvalue()
+        else:
+            return process.communicate()
+
     def options_converter(self, documentation):
         """Convert an options YAML to Arguments.
 
@@ -253,6 +665,15 @@ class ComponentBase:
             action="store_true",
             help="Force a given task to run with a lock.",
         )
+        self.parser.add_argument(
+            "--output-limit",
+            type=int,
+            help=(
+                "Set the maximum number of bytes captured for the stdout and"
+                " stderr of a given command. Output beyond the limit is"
+                " truncated, keeping the head and tail of the output."
+            ),
+        )
         self.parser.add_argument(
             "--stdout-arg",
             help="Stores the stdout of a given command as a cached argument.",
@@ -287,7 +708,10 @@ class ComponentBase:
         """
 
         if value_update:
-            orig = cache.get(key, default=dict())
+            # NOTE(cloudnull): Cached values may be shared from the cache
+            #                  memory layer, merge into a copy so readers
+            #                  never observe a partially updated object.
+            orig = copy.deepcopy(cache.get(key, default=dict()))
             value = utils.merge_dict(orig, value, extend=extend)
 
         cache_set = cache.setdefault(key, value)
@@ -344,7 +768,7 @@ class ComponentBase:
                 return False, "No arguments were defined for blueprinting"
 
         try:
-            _contents = self.blueprint.from_string(content)
+            _contents = _blueprint_template(content)
             rendered_content = _contents.render(**values)
         except Exception as e:
             error = str(e)
@@ -372,6 +796,8 @@ class ComponentBase:
         self.exec_parser(
             parser=self.parser, exec_array=exec_array, arg_vars=arg_vars
         )
+        if self.known_args.output_limit is not None:
+            data["output_limit"] = self.known_args.output_limit
         if self.known_args.stdout_arg:
             data["stdout_arg"] = self.known_args.stdout_arg
         if self.known_args.stderr_arg:
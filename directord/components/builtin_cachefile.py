@@ -32,6 +32,7 @@ class Component(components.ComponentBase):
         super().__init__(desc="Process cachefile commands")
         self.cacheable = False
         self.requires_lock = True
+        self.process_safe = True
 
     def args(self):
         """Set default arguments for a component."""
@@ -186,7 +186,7 @@ class Component(components.ComponentBase):
                         info,
                         _,
                         _,
-                    ) = driver.backend_recv()
+                    ) = driver.backend_recv(raw=True)
                     if control in [driver.job_processing, driver.transfer_end]:
                         data = base64.b64decode(data)
                         chunk_size = len(data)
@@ -25,6 +25,7 @@ class Component(components.ComponentBase):
 
         super().__init__(desc="Manage packages with dnf")
         self.requires_lock = True
+        self.process_safe = True
 
     def args(self):
         """Set default arguments for a component."""
@@ -113,7 +114,9 @@ class Component(components.ComponentBase):
             cmd = "dnf clean all"
             job_stdout.append(b"=== dnf clean ===\n")
             stdout, stderr, outcome = self.run_command(
-                command=cmd, env=cache.get("envs")
+                command=cmd,
+                env=cache.get("envs"),
+                **self.run_command_options,
             )
             job_stdout.append(stdout)
             job_stderr.append(stderr)
@@ -121,7 +124,9 @@ class Component(components.ComponentBase):
             cmd = "dnf makecache"
             job_stdout.append(b"=== dnf makecache ===\n")
             stdout, stderr, outcome = self.run_command(
-                command=cmd, env=cache.get("envs")
+                command=cmd,
+                env=cache.get("envs"),
+                **self.run_command_options,
             )
             job_stdout.append(stdout)
             job_stderr.append(stderr)
@@ -149,7 +154,9 @@ class Component(components.ComponentBase):
             cmd = "dnf -q -y{} remove {}".format(exclude, " ".join(to_remove))
             job_stdout.append(b"=== dnf remove ===\n")
             stdout, stderr, outcome = self.run_command(
-                command=cmd, env=cache.get("envs")
+                command=cmd,
+                env=cache.get("envs"),
+                **self.run_command_options,
             )
             job_stdout.append(stdout)
             job_stderr.append(stderr)
@@ -160,7 +167,9 @@ class Component(components.ComponentBase):
             )
             job_stdout.append(b"=== dnf install ===\n")
             stdout, stderr, outcome = self.run_command(
-                command=cmd, env=cache.get("envs")
+                command=cmd,
+                env=cache.get("envs"),
+                **self.run_command_options,
             )
             job_stdout.append(stdout)
             job_stderr.append(stderr)
@@ -171,7 +180,9 @@ class Component(components.ComponentBase):
             )
             job_stdout.append(b"=== dnf update ===\n")
             stdout, stderr, outcome = self.run_command(
-                command=cmd, env=cache.get("envs")
+                command=cmd,
+                env=cache.get("envs"),
+                **self.run_command_options,
             )
             job_stdout.append(stdout)
             job_stderr.append(stderr)
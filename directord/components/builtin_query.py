@@ -31,6 +31,7 @@ class Component(components.ComponentBase):
         super().__init__(desc="Process cachefile commands")
         self.cacheable = False
         self.requires_lock = True
+        self.process_safe = True
 
     def args(self):
         """Set default arguments for a component."""
@@ -24,6 +24,7 @@ class Component(components.ComponentBase):
         """Initialize the component cache class."""
 
         super().__init__(desc="Process run commands")
+        self.process_safe = True
 
     def args(self):
         """Set default arguments for a component."""
@@ -89,6 +90,7 @@ class Component(components.ComponentBase):
             command=command,
             env=cache.get("envs"),
             no_block=job.get("no_block"),
+            **self.run_command_options,
         )
 
         return stdout, stderr, outcome, command
@@ -25,6 +25,7 @@ class Component(components.ComponentBase):
 
         super().__init__(desc="Manage services with systemd")
         self.requires_lock = True
+        self.process_safe = True
 
     def args(self):
         """Set default arguments for a component."""
@@ -139,7 +140,9 @@ class Component(components.ComponentBase):
 
         if job.get("daemon_reload") is True:
             stdout, stderr, outcome = self.run_command(
-                command="systemctl daemon-reload", env=cache.get("envs")
+                command="systemctl daemon-reload",
+                env=cache.get("envs"),
+                **self.run_command_options,
             )
             job_stdout.append(stdout)
             job_stderr.append(stderr)
@@ -156,7 +159,9 @@ class Component(components.ComponentBase):
         if mask:
             cmd = "systemctl {} {}".format(mask, " ".join(services))
             stdout, stderr, outcome = self.run_command(
-                command=cmd, env=cache.get("envs")
+                command=cmd,
+                env=cache.get("envs"),
+                **self.run_command_options,
             )
             job_stdout.append(stdout)
             job_stderr.append(stderr)
@@ -173,7 +178,9 @@ class Component(components.ComponentBase):
         if state:
             cmd = "systemctl {} {}".format(state, " ".join(services))
             stdout, stderr, outcome = self.run_command(
-                command=cmd, env=cache.get("envs")
+                command=cmd,
+                env=cache.get("envs"),
+                **self.run_command_options,
             )
             job_stdout.append(stdout)
             job_stderr.append(stderr)
@@ -189,7 +196,9 @@ class Component(components.ComponentBase):
 
         cmd = "systemctl {} {}".format(running, " ".join(services))
         stdout, stderr, outcome = self.run_command(
-            command=cmd, env=cache.get("envs")
+            command=cmd,
+            env=cache.get("envs"),
+            **self.run_command_options,
         )
         job_stdout.append(stdout)
         job_stderr.append(stderr)
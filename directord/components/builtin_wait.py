@@ -27,6 +27,7 @@ class Component(components.ComponentBase):
 
         super().__init__(desc="Wait until a condition is met")
         self.requires_lock = False
+        self.process_safe = True
 
     def args(self):
         """Set default arguments for a component."""
@@ -171,7 +172,9 @@ class Component(components.ComponentBase):
         stderr = b""
         outcome = False
         count = 0
-        while not outcome and count < (retry + 1):
+        while (
+            not outcome and count < (retry + 1) and not self.cancelled.is_set()
+        ):
             count = count + 1
             try:
                 r = requests.get(url, verify=verify)
@@ -206,17 +209,21 @@ class Component(components.ComponentBase):
         :type retry_wait: Integer
         :returns: tuple
         """
-        job_stdout = []
-        job_stderr = []
+        job_stdout = components.OutputBuffer(limit=self.output_limit)
+        job_stderr = components.OutputBuffer(limit=self.output_limit)
         outcome = False
         count = 0
-        while not outcome and count < (retry + 1):
+        while (
+            not outcome and count < (retry + 1) and not self.cancelled.is_set()
+        ):
             count = count + 1
-            stdout, stderr, outcome = self.run_command(command=cmd, env=env)
-            job_stdout.append(stdout)
-            job_stderr.append(stderr)
+            stdout, stderr, outcome = self.run_command(
+                command=cmd, env=env, **self.run_command_options
+            )
+            job_stdout.write(stdout)
+            job_stderr.write(stderr)
             if not outcome and retry_wait > 0:
                 self.log.debug("Command failed, retrying with wait...")
                 time.sleep(retry_wait)
 
-        return b"".join(job_stdout), b"".join(job_stderr), outcome
+        return job_stdout.getvalue(), job_stderr.getvalue(), outcome
@@ -28,6 +28,7 @@ class Component(components.ComponentBase):
         """Initialize the component cache class."""
 
         super().__init__(desc="Process workdir commands")
+        self.process_safe = True
 
     def args(self):
         """Set default arguments for a component."""
@@ -12,10 +12,17 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 
-import asyncio
+import concurrent.futures
+import os
+import threading
 
 from directord import utils
 
+# Maximum number of components executed with a timeout at the same time.
+TIMEOUT_EXECUTOR_WORKERS = max(32, (os.cpu_count() or 1) * 4)
+_TIMEOUT_EXECUTOR = None
+_TIMEOUT_EXECUTOR_LOCK = threading.Lock()
+
 
 def cacheargs(func):
     """Cache stdout and stderr."""
@@ -29,13 +36,16 @@ def cacheargs(func):
 
         if stdout_arg or stderr_arg:
             self.block_on_tasks = list()
+            # NOTE(cloudnull): Bounded output may be cut in the middle of a
+            #                  multi-byte character, invalid bytes are
+            #                  replaced instead of failing the job.
             clean_info = (
-                stdout.decode()
+                stdout.decode(errors="replace")
                 if stdout and isinstance(stdout, bytes)
                 else stdout or ""
             )
             clean_info_err = (
-                stderr.decode()
+                stderr.decode(errors="replace")
                 if stderr and isinstance(stderr, bytes)
                 else stderr or ""
             )
@@ -83,23 +93,36 @@ def retry(func):
     return wrapper_func
 
 
+def _get_timeout_executor():
+    """Return the executor used to run components with a timeout.
+
+    The executor is shared by all components within a process and is
+    bounded so that hung components can not create threads indefinitely.
+
+    :returns: Object
+    """
+
+    global _TIMEOUT_EXECUTOR
+
+    with _TIMEOUT_EXECUTOR_LOCK:
+        if _TIMEOUT_EXECUTOR is None:
+            _TIMEOUT_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+                max_workers=TIMEOUT_EXECUTOR_WORKERS,
+                thread_name_prefix="directord-timeout",
+            )
+        return _TIMEOUT_EXECUTOR
+
+
 def timeout(func):
-    """Timeout coroutine."""
+    """Timeout executor.
 
-    def wrapper_func(*args, **kwargs):
-        async def _main(*args, **kwargs):
-            future = loop.run_in_executor(None, lambda: func(*args, **kwargs))
-            try:
-                return await asyncio.wait_for(future, timeout=user_timeout)
-            except asyncio.TimeoutError:
-                self.log.warning(
-                    "Job [ %s ] timeout after %s.",
-                    kwargs["job"].get("job_id"),
-                    user_timeout,
-                )
-                future.cancel()
-                return None, "Timeout encountered", False, None
+    The component client is run within a bounded executor. When the timeout
+    is reached, the component is cancelled and all process groups spawned by
+    the component are killed so that the executor thread, and the worker
+    running the job, are released.
+    """
 
+    def wrapper_func(*args, **kwargs):
         self = args[0]
         user_timeout = float(kwargs["job"].get("timeout", 600))
         self.log.debug(
@@ -107,14 +130,25 @@ def timeout(func):
             kwargs["job"].get("job_id"),
             user_timeout,
         )
+        # NOTE(cloudnull): Commands run with a timeout are started within a
+        #                  new session so their process group can be killed.
+        self.timeout = user_timeout
+        self.cancelled.clear()
+        future = _get_timeout_executor().submit(func, *args, **kwargs)
         try:
-            loop = asyncio.get_running_loop()
-        except (AttributeError, RuntimeError):
-            try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-
-        return loop.run_until_complete(_main(*args, **kwargs))
+            return future.result(timeout=user_timeout)
+        except concurrent.futures.TimeoutError:
+            self.log.warning(
+                "Job [ %s ] timeout after %s.",
+                kwargs["job"].get("job_id"),
+                user_timeout,
+            )
+            if not future.cancel():
+                # NOTE(cloudnull): The component is cancelled before its
+                #                  processes are killed so that it will not
+                #                  start any new commands.
+                self.cancelled.set()
+                self.kill_processes()
+            return None, "Timeout encountered", False, None
 
     return wrapper_func
@@ -0,0 +1,368 @@
+#   Copyright Peznauts <kevin@cloudnull.com>. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+
+import os
+
+from directord import utils
+
+# NOTE(cloudnull): Driver arguments are declared statically so that every
+#                  mode accepts them without importing the driver libraries.
+#                  Drivers not found here may still provide a `parse_args`
+#                  function which is loaded for modes running a driver.
+
+
+def zeromq(parser, parser_server, parser_client):
+    """Add arguments for the ZeroMQ driver to the parser.
+
+    :param parser: Parser
+    :type parser: Object
+    :param parser_server: SubParser object
+    :type parser_server: Object
+    :param parser_client: SubParser object
+    :type parser_client: Object
+    :returns: Object
+    """
+
+    group = parser.add_argument_group("ZeroMQ driver options")
+    group.add_argument(
+        "--zmq-highwater-mark",
+        type=int,
+        default=int(os.getenv("DIRECTORD_ZMQ_HIGHWATER_MARK", 1024)),
+        metavar="INTEGER",
+        help=("Set the ZeroMQ highwater mark. Default %(default)s."),
+    )
+    server_group = parser_server.add_argument_group(
+        "ZeroMQ Server driver options"
+    )
+    server_group.add_argument(
+        "--zmq-generate-keys",
+        action="store_true",
+        help="Generate encryption keys for Curve authentication.",
+    )
+    server_group.add_argument(
+        "--zmq-bind-address",
+        help=(
+            "ZeroMQ IP Address to bind a Directord Server."
+            " Default: %(default)s"
+        ),
+        metavar="STRING",
+        default=os.getenv("DIRECTORD_ZMQ_BIND_ADDRESS", "*"),
+    )
+    client_group = parser_client.add_argument_group(
+        "ZeroMQ Client driver options"
+    )
+    client_group.add_argument(
+        "--zmq-server-address",
+        help=(
+            "ZeroMQ Domain or IP address of the Directord server."
+            " Default: %(default)s"
+        ),
+        metavar="STRING",
+        default=os.getenv("DIRECTORD_ZMQ_SERVER_ADDRESS", "127.0.0.1"),
+    )
+    auth_group = group.add_mutually_exclusive_group()
+    auth_group.add_argument(
+        "--zmq-shared-key",
+        help="Shared key used for server client authentication.",
+        metavar="STRING",
+        default=os.getenv("DIRECTORD_ZMQ_SHARED_KEY", None),
+    )
+    auth_group.add_argument(
+        "--zmq-curve-encryption",
+        action="store_true",
+        help=(
+            "Server and client will connect using Curve authentication"
+            " and encryption. Enabling this option assumes keys have been"
+            " generated. see `--zmq-generate-keys` under `server` for more."
+        ),
+    )
+
+    return parser
+
+
+def grpcd(parser, parser_server, parser_client):
+    """Add arguments for the gRPC driver to the parser.
+
+    :param parser: Parser
+    :type parser: Object
+    :param parser_server: SubParser object
+    :type parser_server: Object
+    :param parser_client: SubParser object
+    :type parser_client: Object
+    :returns: Object
+    """
+
+    group = parser.add_argument_group("gRPC driver options")
+    group.add_argument(
+        "--grpc-port",
+        type=int,
+        default=os.getenv("DIRECTORD_GRPC_PORT", 5558),
+        metavar="INTEGER",
+        help=("gRPC Port. Default %(default)s."),
+    )
+    group.add_argument(
+        "--grpc-server-address",
+        help=(
+            "gRPC Domain or IP address of the Directord server."
+            " Default: %(default)s"
+        ),
+        metavar="STRING",
+        default=os.getenv("DIRECTORD_GRPC_SERVER_ADDRESS", "127.0.0.1"),
+    )
+    group.add_argument(
+        "--grpc-disable-compression",
+        metavar="BOOLEAN",
+        default=bool(
+            utils.strtobool(
+                os.getenv("DIRECTORD_GRPC_DISABLE_COMPRESSION", "False")
+            )
+        ),
+        help=("Disable compression between client and server."),
+        type=bool,
+    )
+    group.add_argument(
+        "--grpc-batch-size",
+        type=int,
+        default=int(os.getenv("DIRECTORD_GRPC_BATCH_SIZE", 1)),
+        metavar="INTEGER",
+        help=(
+            "Maximum number of jobs or messages moved by a single gRPC call."
+            " When queues have depth, records are sent and received in"
+            " batches. A value of 1 disables batching. Default: %(default)s"
+        ),
+    )
+    group.add_argument(
+        "--grpc-streaming",
+        metavar="BOOLEAN",
+        default=bool(
+            utils.strtobool(os.getenv("DIRECTORD_GRPC_STREAMING", "False"))
+        ),
+        help=(
+            "Receive jobs and messages using server streaming"
+            " subscriptions instead of polling. Every subscription holds a"
+            " gRPC server worker, so `--grpc-server-workers` must be sized"
+            " for the number of connected clients. Default: %(default)s"
+        ),
+        type=bool,
+    )
+
+    server_group = parser_server.add_argument_group(
+        "gRPC Server driver options"
+    )
+    server_group.add_argument(
+        "--grpc-bind-address",
+        help=(
+            "gRPC IP Address to bind a Directord Server."
+            " Default: %(default)s"
+        ),
+        metavar="STRING",
+        default=os.getenv("DIRECTORD_GRPC_BIND_ADDRESS", "0.0.0.0"),
+    )
+    server_group.add_argument(
+        "--grpc-server-workers",
+        type=int,
+        default=os.getenv("DIRECTORD_GRPC_SERVER_WORKERS", 4),
+        metavar="INTEGER",
+        help=("Number of gRPC server workers. Default: %(default)s"),
+    )
+    server_group.add_argument(
+        "--grpc-queue-max-depth",
+        type=int,
+        default=int(os.getenv("DIRECTORD_GRPC_QUEUE_MAX_DEPTH", 0)),
+        metavar="INTEGER",
+        help=(
+            "Maximum number of undelivered items held for a single target."
+            " A value of 0 disables the limit. Default: %(default)s"
+        ),
+    )
+    server_group.add_argument(
+        "--grpc-queue-max-bytes",
+        type=int,
+        default=int(os.getenv("DIRECTORD_GRPC_QUEUE_MAX_BYTES", 0)),
+        metavar="INTEGER",
+        help=(
+            "Maximum number of undelivered bytes held for a single target."
+            " A value of 0 disables the limit. Default: %(default)s"
+        ),
+    )
+    server_group.add_argument(
+        "--grpc-queue-overflow",
+        default=os.getenv("DIRECTORD_GRPC_QUEUE_OVERFLOW", "reject"),
+        choices=["reject", "drop-oldest"],
+        help=("Policy used when a target queue is full. Default: %(default)s"),
+    )
+    server_group.add_argument(
+        "--grpc-queue-ttl",
+        type=float,
+        default=float(os.getenv("DIRECTORD_GRPC_QUEUE_TTL", 0)),
+        metavar="FLOAT",
+        help=(
+            "Time, in seconds, undelivered items are held before they are"
+            " discarded. A value of 0 holds items forever."
+            " Default: %(default)s"
+        ),
+    )
+    server_group.add_argument(
+        "--grpc-queue-path",
+        default=os.getenv("DIRECTORD_GRPC_QUEUE_PATH", None),
+        metavar="STRING",
+        help=(
+            "Path used to persist undelivered items when the server stops."
+            " Persisted items are restored on start. When unset, items are"
+            " only held in memory. Default: %(default)s"
+        ),
+    )
+    auth_group = parser.add_argument_group("gRPC driver auth options")
+    auth_group.add_argument(
+        "--grpc-ssl",
+        help=("Enable gRPC driver SSL encryption. Default: %(default)s"),
+        metavar="BOOLEAN",
+        default=bool(
+            utils.strtobool(os.getenv("DIRECTORD_GRPC_SSL", "False"))
+        ),
+        type=bool,
+    )
+    auth_group.add_argument(
+        "--grpc-ssl-ca",
+        help=("gRPC driver SSL CA file path. Default: %(default)s"),
+        metavar="STRING",
+        default=str(
+            os.getenv(
+                "DIRECTORD_GRPC_SSL_CA",
+                "/etc/pki/ca-trust/source/anchors/cm-local-ca.pem",
+            )
+        ),
+        type=str,
+    )
+    auth_group.add_argument(
+        "--grpc-ssl-cert",
+        help=(
+            "gRPC driver SSL certificate file path. " "Default: %(default)s"
+        ),
+        metavar="STRING",
+        default=str(
+            os.getenv(
+                "DIRECTORD_GRPC_SSL_CERT",
+                "/etc/directord/grpc/ssl/directord.crt",
+            )
+        ),
+        type=str,
+    )
+    auth_group.add_argument(
+        "--grpc-ssl-key",
+        help=("gRPC driver SSL key file path. Default: %(default)s"),
+        metavar="STRING",
+        default=str(
+            os.getenv(
+                "DIRECTORD_GRPC_SSL_KEY",
+                "/etc/directord/grpc/ssl/directord.key",
+            )
+        ),
+        type=str,
+    )
+    auth_group.add_argument(
+        "--grpc-ssl-client-auth",
+        help=("Require ssl client auth. Default: %(default)s"),
+        metavar="BOOLEAN",
+        default=bool(
+            utils.strtobool(
+                os.getenv("DIRECTORD_GRPC_SSL_CLIENT_AUTH", "False")
+            )
+        ),
+        type=bool,
+    )
+
+    return parser
+
+
+def messaging(parser, parser_server, parser_client):
+    """Add arguments for the messaging driver to the parser.
+
+    :param parser: Parser
+    :type parser: Object
+    :param parser_server: SubParser object
+    :type parser_server: Object
+    :param parser_client: SubParser object
+    :type parser_client: Object
+    :returns: Object
+    """
+
+    messaging_group = parser.add_argument_group("Messaging driver options")
+    messaging_group.add_argument(
+        "--messaging-ssl",
+        help=("Enable messaging driver SSL encryption. Default: %(default)s"),
+        metavar="BOOLEAN",
+        default=bool(
+            utils.strtobool(os.getenv("DIRECTORD_MESSAGING_SSL", "True"))
+        ),
+        type=bool,
+    )
+    messaging_group.add_argument(
+        "--messaging-ssl-ca",
+        help=("Messaging driver SSL CA file path. Default: %(default)s"),
+        metavar="STRING",
+        default=str(
+            os.getenv(
+                "DIRECTORD_MESSAGING_SSL_CA",
+                "/etc/pki/ca-trust/source/anchors/cm-local-ca.pem",
+            )
+        ),
+        type=str,
+    )
+    messaging_group.add_argument(
+        "--messaging-ssl-cert",
+        help=(
+            "Messaging driver SSL certificate file path. "
+            "Default: %(default)s"
+        ),
+        metavar="STRING",
+        default=str(
+            os.getenv(
+                "DIRECTORD_MESSAGING_SSL_CERT",
+                "/etc/directord/messaging/ssl/directord.crt",
+            )
+        ),
+        type=str,
+    )
+    messaging_group.add_argument(
+        "--messaging-ssl-key",
+        help=("Messaging driver SSL key file path. Default: %(default)s"),
+        metavar="STRING",
+        default=str(
+            os.getenv(
+                "DIRECTORD_MESSAGING_SSL_KEY",
+                "/etc/directord/messaging/ssl/directord.key",
+            )
+        ),
+        type=str,
+    )
+    messaging_group.add_argument(
+        "--messaging-address",
+        help=(
+            "IP address or hostname of messaging server (router/broker)."
+            " Default: %(default)s"
+        ),
+        metavar="STRING",
+        default=str(os.getenv("DIRECTORD_MESSAGING_ADDRESS", "127.0.0.1")),
+        type=str,
+    )
+
+    return parser
+
+
+DRIVER_ARGS = (
+    ("zeromq", zeromq),
+    ("grpcd", grpcd),
+    ("messaging", messaging),
+)
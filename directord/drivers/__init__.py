@@ -12,11 +12,19 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 
+import asyncio
+import contextlib
+import copy
+import functools
+import json
 import os
 import queue
 import socket
 import time
 import threading
+import uuid
+
+import tenacity
 
 from directord import iodict
 from directord import logger
@@ -49,6 +57,367 @@ class ExceptionThreadProcessor(threading.Thread):
             self.exception = e
 
 
+def before_sleep_log(log, log_level):
+    """Return a retry callback which logs and counts send retries.
+
+    The first positional argument of the retried method is expected to be
+    the driver, when the driver has metrics the retry is recorded.
+
+    :param log: Logger object.
+    :type log: Object
+    :param log_level: Log level used for the retry message.
+    :type log_level: Integer
+    :returns: Function
+    """
+
+    sleep_log = tenacity.before_sleep_log(log, log_level)
+
+    def _before_sleep(retry_state):
+        if retry_state.args:
+            metrics = getattr(retry_state.args[0], "metrics", None)
+            if isinstance(metrics, DriverMetrics):
+                metrics.record_retry()
+        sleep_log(retry_state)
+
+    return _before_sleep
+
+
+class DriverMetrics:
+    """Transport metrics collector.
+
+    Messages and bytes are counted per channel, direction, and control
+    type. Poll waits and sends are timed per channel. A single collector
+    is shared by all threads using a driver.
+
+    Processes forked from the collector owner start with empty counters.
+    When a store is shared, every process publishes its counters into the
+    store, at most once per `publish_interval`, and a snapshot combines
+    the counters of all processes.
+    """
+
+    control_names = {
+        v: k
+        for k, v in vars(models.BaseModel).items()
+        if not k.startswith("_") and isinstance(v, str)
+    }
+    publish_interval = 1
+
+    def __init__(self):
+        """Initialize the collector."""
+
+        self.lock = threading.Lock()
+        self.store = None
+        self.pid = os.getpid()
+        self.key = uuid.uuid4().hex
+        self.reset()
+
+    def reset(self):
+        """Reset all counters."""
+
+        with self.lock:
+            self.started = time.time()
+            self.published = 0
+            self.transfer = {"sent": dict(), "received": dict()}
+            self.poll = dict()
+            self.send_time = dict()
+            self.send_failures = 0
+            self.send_retries = 0
+
+    def share(self, store):
+        """Publish counters into a store shared by other processes.
+
+        :param store: Dictionary like object, such as a managed dict.
+        :type store: Object
+        """
+
+        self.store = store
+
+    @contextlib.contextmanager
+    def _update(self):
+        """Hold the collector lock while counters are updated.
+
+        Counters inherited by a forked process are reset before they are
+        updated, updated counters are published when a store is shared.
+        """
+
+        if self.pid != os.getpid():
+            self.lock = threading.Lock()
+            self.pid = os.getpid()
+            self.key = uuid.uuid4().hex
+            self.reset()
+
+        with self.lock:
+            yield
+
+        self.publish()
+
+    def _counters(self):
+        """Return a copy of the counters.
+
+        The object lock must be held by the caller.
+
+        :returns: Dictionary
+        """
+
+        return copy.deepcopy(
+            {
+                "started": self.started,
+                "transfer": self.transfer,
+                "poll": self.poll,
+                "send_time": self.send_time,
+                "send_failures": self.send_failures,
+                "send_retries": self.send_retries,
+            }
+        )
+
+    def publish(self, force=False):
+        """Publish counters into the shared store.
+
+        :param force: Publish even when the publish interval has not passed.
+        :type force: Boolean
+        """
+
+        if self.store is None:
+            return
+
+        now = time.time()
+        with self.lock:
+            if not force and now < self.published + self.publish_interval:
+                return
+            self.published = now
+            counters = self._counters()
+
+        try:
+            self.store[self.key] = counters
+        except (OSError, EOFError):
+            pass
+
+    @staticmethod
+    def _merge(counters):
+        """Return the combined counters of many collectors.
+
+        :param counters: Counters returned by `_counters`.
+        :type counters: List
+        :returns: Dictionary
+        """
+
+        merged = {
+            "started": min(i["started"] for i in counters),
+            "transfer": {"sent": dict(), "received": dict()},
+            "poll": dict(),
+            "send_time": dict(),
+            "send_failures": sum(i["send_failures"] for i in counters),
+            "send_retries": sum(i["send_retries"] for i in counters),
+        }
+        for item in counters:
+            for direction, channels in item["transfer"].items():
+                for channel, controls in channels.items():
+                    for name, values in controls.items():
+                        totals = (
+                            merged["transfer"][direction]
+                            .setdefault(channel, dict())
+                            .setdefault(name, {"messages": 0, "bytes": 0})
+                        )
+                        totals["messages"] += values["messages"]
+                        totals["bytes"] += values["bytes"]
+            for timer_type in ["poll", "send_time"]:
+                for channel, values in item[timer_type].items():
+                    timer = merged[timer_type].setdefault(
+                        channel, {"count": 0, "total": 0.0, "max": 0.0}
+                    )
+                    timer["count"] += values["count"]
+                    timer["total"] += values["total"]
+                    timer["max"] = max(timer["max"], values["max"])
+                    if "ready" in values:
+                        timer.setdefault("ready", 0)
+                        timer["ready"] += values["ready"]
+        return merged
+
+    @classmethod
+    def control_name(cls, control):
+        """Return the name of a control character.
+
+        :param control: ASCII control charaters.
+        :type control: String|Bytes
+        :returns: String
+        """
+
+        if isinstance(control, (bytes, bytearray, memoryview)):
+            control = bytes(control).decode(errors="replace")
+
+        if not control:
+            return cls.control_names[models.BaseModel.nullbyte]
+
+        return cls.control_names.get(control, "unknown")
+
+    @staticmethod
+    def message_size(parts):
+        """Return the size of a message.
+
+        :param parts: Message parts.
+        :type parts: List
+        :returns: Integer
+        """
+
+        size = 0
+        for part in parts:
+            if part is None:
+                continue
+            elif isinstance(part, memoryview):
+                size += part.nbytes
+            else:
+                size += len(part)
+        return size
+
+    @staticmethod
+    def _timer_update(timers, channel, duration):
+        """Update a channel timer.
+
+        :param timers: Timer storage.
+        :type timers: Dictionary
+        :param channel: Channel name, job or backend.
+        :type channel: String
+        :param duration: Time in seconds.
+        :type duration: Float
+        :returns: Dictionary
+        """
+
+        timer = timers.setdefault(
+            channel, {"count": 0, "total": 0.0, "max": 0.0}
+        )
+        timer["count"] += 1
+        timer["total"] += duration
+        if duration > timer["max"]:
+            timer["max"] = duration
+        return timer
+
+    def _record(self, direction, channel, control, parts):
+        """Record a transferred message.
+
+        :param direction: Transfer direction, sent or received.
+        :type direction: String
+        :param channel: Channel name, job or backend.
+        :type channel: String
+        :param control: ASCII control charaters.
+        :type control: String|Bytes
+        :param parts: Message parts.
+        :type parts: List
+        """
+
+        name = self.control_name(control)
+        size = self.message_size(parts)
+        with self._update():
+            counters = (
+                self.transfer[direction]
+                .setdefault(channel, dict())
+                .setdefault(name, {"messages": 0, "bytes": 0})
+            )
+            counters["messages"] += 1
+            counters["bytes"] += size
+
+    def record_send(self, channel, control, parts, duration=None):
+        """Record a sent message.
+
+        :param channel: Channel name, job or backend.
+        :type channel: String
+        :param control: ASCII control charaters.
+        :type control: String|Bytes
+        :param parts: Message parts.
+        :type parts: List
+        :param duration: Time in seconds spent sending.
+        :type duration: Float
+        """
+
+        self._record(
+            direction="sent", channel=channel, control=control, parts=parts
+        )
+        if duration is not None:
+            with self._update():
+                self._timer_update(self.send_time, channel, duration)
+
+    def record_recv(self, channel, control, parts):
+        """Record a received message.
+
+        :param channel: Channel name, job or backend.
+        :type channel: String
+        :param control: ASCII control charaters.
+        :type control: String|Bytes
+        :param parts: Message parts.
+        :type parts: List
+        """
+
+        self._record(
+            direction="received", channel=channel, control=control, parts=parts
+        )
+
+    def record_failure(self):
+        """Record a failed send."""
+
+        with self._update():
+            self.send_failures += 1
+
+    def record_retry(self):
+        """Record a retried send."""
+
+        with self._update():
+            self.send_retries += 1
+
+    def record_poll(self, channel, duration, ready):
+        """Record a poll wait.
+
+        :param channel: Channel name, job or backend.
+        :type channel: String
+        :param duration: Time in seconds spent waiting.
+        :type duration: Float
+        :param ready: Work was ready when the poll returned.
+        :type ready: Boolean
+        """
+
+        with self._update():
+            timer = self._timer_update(self.poll, channel, duration)
+            timer["ready"] = timer.get("ready", 0) + int(bool(ready))
+
+    def snapshot(self):
+        """Return a copy of all counters.
+
+        When a store is shared, the counters published by other processes
+        are included.
+
+        :returns: Dictionary
+        """
+
+        with self.lock:
+            counters = [self._counters()]
+
+        if self.store is not None:
+            try:
+                counters.extend(
+                    v for k, v in self.store.items() if k != self.key
+                )
+            except (OSError, EOFError):
+                pass
+
+        merged = self._merge(counters)
+        uptime = time.time() - merged["started"]
+        transfer = merged["transfer"]
+        for direction in transfer.values():
+            for controls in direction.values():
+                for values in controls.values():
+                    values["rate"] = round(
+                        values["messages"] / max(uptime, 1), 4
+                    )
+
+        return {
+            "uptime": round(uptime, 4),
+            "sent": transfer["sent"],
+            "received": transfer["received"],
+            "send_failures": merged["send_failures"],
+            "send_retries": merged["send_retries"],
+            "send_time": merged["send_time"],
+            "poll": merged["poll"],
+        }
+
+
 class _FlushQueue(queue.Queue, iodict.FlushQueue):
     """Flush queue capability helper class."""
 
@@ -92,12 +461,32 @@ class BaseDriver(models.BaseModel):
             self.machine_id = self.get_machine_id()
 
         self.interface = interface
+        self.metrics = DriverMetrics()
 
     def shutdown(self):
         """Shutdown the driver."""
 
         pass
 
+    def get_queue_depths(self):
+        """Return the depth of local queues held by the driver.
+
+        :returns: Dictionary
+        """
+
+        return dict()
+
+    def get_metrics(self):
+        """Return driver transport metrics.
+
+        :returns: Dictionary
+        """
+
+        metrics = self.metrics.snapshot()
+        metrics["driver"] = self.__module__.split(".")[-1]
+        metrics["queues"] = self.get_queue_depths()
+        return metrics
+
     @staticmethod
     def get_lock():
         """Returns a thread lock."""
@@ -162,7 +551,7 @@ class BaseDriver(models.BaseModel):
 
         pass
 
-    def backend_recv(self, nonblocking=False):
+    def backend_recv(self, nonblocking=False, raw=False):
         """Receive a message.
 
         The message specification for server is as follows.
@@ -200,6 +589,9 @@ class BaseDriver(models.BaseModel):
         :type socket: Object
         :param nonblocking: Enable non-blocking receve.
         :type nonblocking: Boolean
+        :param raw: Drivers which support it return the data, stderr, and
+                    stdout parts as bytes-like objects instead of strings.
+        :type raw: Boolean
         """
 
         pass
@@ -304,8 +696,77 @@ class BaseDriver(models.BaseModel):
         else:
             return self.identity
 
+    def heartbeat_data(
+        self,
+        job_id,
+        host_uptime=None,
+        agent_uptime=None,
+        version=None,
+        driver=None,
+        max_inflight_jobs=None,
+        slots=None,
+        compression=None,
+        encoding=None,
+    ):
+        """Return JSON encoded heartbeat data.
+
+        Flow control information is only added when the sender has an
+        in-flight job limit, the slots timestamp records when the available
+        slots were counted. Compression and encoding information is only
+        added when the sender can decode compressed or msgpack data.
+
+        :param job_id: Heartbeat job ID
+        :type job_id: String
+        :param host_uptime: Sender uptime
+        :type host_uptime: String
+        :param agent_uptime: Sender agent uptime
+        :type agent_uptime: String
+        :param version: Sender directord version
+        :type version: String
+        :param driver: Driver information
+        :type driver: String
+        :param max_inflight_jobs: Maximum number of in-flight jobs.
+        :type max_inflight_jobs: Integer
+        :param slots: Number of available in-flight job slots.
+        :type slots: Integer
+        :param compression: Compression algorithm the sender can decode.
+        :type compression: String
+        :param encoding: Payload encoding the sender can decode.
+        :type encoding: String
+        :returns: String
+        """
+
+        data = {
+            "job_id": job_id,
+            "version": version,
+            "host_uptime": host_uptime,
+            "agent_uptime": agent_uptime,
+            "machine_id": self.machine_id,
+            "driver": driver,
+        }
+        if max_inflight_jobs:
+            data["max_inflight_jobs"] = max_inflight_jobs
+            data["slots"] = slots
+            data["slots_timestamp"] = time.time()
+
+        if compression:
+            data["compression"] = compression
+
+        if encoding:
+            data["encoding"] = encoding
+
+        return json.dumps(data)
+
     def heartbeat_send(
-        self, host_uptime=None, agent_uptime=None, version=None, driver=None
+        self,
+        host_uptime=None,
+        agent_uptime=None,
+        version=None,
+        driver=None,
+        max_inflight_jobs=None,
+        slots=None,
+        compression=None,
+        encoding=None,
     ):
         """Send a heartbeat.
 
@@ -317,6 +778,14 @@ class BaseDriver(models.BaseModel):
         :type version: String
         :param version: Driver information
         :type version: String
+        :param max_inflight_jobs: Maximum number of in-flight jobs.
+        :type max_inflight_jobs: Integer
+        :param slots: Number of available in-flight job slots.
+        :type slots: Integer
+        :param compression: Compression algorithm the sender can decode.
+        :type compression: String
+        :param encoding: Payload encoding the sender can decode.
+        :type encoding: String
         """
 
         pass
@@ -352,7 +821,7 @@ class BaseDriver(models.BaseModel):
 
         pass
 
-    def job_recv(self, nonblocking=False):
+    def job_recv(self, nonblocking=False, raw=False):
         """Receive a message.
 
         The message specification for server is as follows.
@@ -390,6 +859,9 @@ class BaseDriver(models.BaseModel):
         :type socket: Object
         :param nonblocking: Enable non-blocking receve.
         :type nonblocking: Boolean
+        :param raw: Drivers which support it return the data, stderr, and
+                    stdout parts as bytes-like objects instead of strings.
+        :type raw: Boolean
         """
 
         pass
@@ -453,3 +925,106 @@ class BaseDriver(models.BaseModel):
         """
 
         pass
+
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking driver method without blocking the event loop.
+
+        The method is run within the default executor of the running loop.
+
+        :param func: Blocking method.
+        :type func: Function
+        :returns: Object
+        """
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(func, *args, **kwargs)
+        )
+
+    async def backend_check_async(self, interval=1, constant=1000):
+        """Return True if the backend contains work ready.
+
+        Drivers without a native asyncio implementation run the blocking
+        check within an executor.
+
+        :param interval: Exponential Interval used to determine the polling
+                         duration for a given socket.
+        :type interval: Integer
+        :param constant: Constant time used to poll for new jobs.
+        :type constant: Integer
+        :returns: Boolean
+        """
+
+        return await self._run_blocking(
+            self.backend_check, interval=interval, constant=constant
+        )
+
+    async def backend_recv_async(self, raw=False):
+        """Receive a transfer message.
+
+        :param raw: Drivers which support it return the data, stderr, and
+                    stdout parts as bytes-like objects instead of strings.
+        :type raw: Boolean
+        :returns: Tuple
+        """
+
+        return await self._run_blocking(self.backend_recv, raw=raw)
+
+    async def backend_send_async(self, *args, **kwargs):
+        """Send a transfer message.
+
+        * All args and kwargs are passed through to the send.
+
+        :returns: Object
+        """
+
+        return await self._run_blocking(self.backend_send, *args, **kwargs)
+
+    async def heartbeat_send_async(self, **kwargs):
+        """Send a heartbeat.
+
+        * All kwargs are passed through to the heartbeat send.
+
+        :returns: Object
+        """
+
+        return await self._run_blocking(self.heartbeat_send, **kwargs)
+
+    async def job_check_async(self, interval=1, constant=1000):
+        """Return True if a job contains work ready.
+
+        Drivers without a native asyncio implementation run the blocking
+        check within an executor.
+
+        :param interval: Exponential Interval used to determine the polling
+                         duration for a given socket.
+        :type interval: Integer
+        :param constant: Constant time used to poll for new jobs.
+        :type constant: Integer
+        :returns: Boolean
+        """
+
+        return await self._run_blocking(
+            self.job_check, interval=interval, constant=constant
+        )
+
+    async def job_recv_async(self, raw=False):
+        """Receive a job message.
+
+        :param raw: Drivers which support it return the data, stderr, and
+                    stdout parts as bytes-like objects instead of strings.
+        :type raw: Boolean
+        :returns: Tuple
+        """
+
+        return await self._run_blocking(self.job_recv, raw=raw)
+
+    async def job_send_async(self, *args, **kwargs):
+        """Send a job message.
+
+        * All args and kwargs are passed through to the send.
+
+        :returns: Object
+        """
+
+        return await self._run_blocking(self.job_send, *args, **kwargs)
@@ -20,7 +20,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   package='',
   syntax='proto3',
   serialized_options=None,
-  serialized_pb=_b('\n\tmsg.proto\"(\n\x06Status\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06result\x18\x02 \x01(\x08\"\x8d\x01\n\x0bMessageData\x12\x10\n\x08identity\x18\x01 \x01(\t\x12\x0e\n\x06msg_id\x18\x02 \x01(\t\x12\x0f\n\x07\x63ontrol\x18\x03 \x01(\t\x12\x0f\n\x07\x63ommand\x18\x04 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x05 \x01(\t\x12\x0c\n\x04info\x18\x06 \x01(\t\x12\x0e\n\x06stderr\x18\x07 \x01(\t\x12\x0e\n\x06stdout\x18\x08 \x01(\t\"]\n\x0fMessageResponse\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\x08\x12\x0e\n\x06target\x18\x03 \x01(\t\x12\x1a\n\x04\x64\x61ta\x18\x04 \x01(\x0b\x32\x0c.MessageData\"3\n\x11GetMessageRequest\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06target\x18\x02 \x01(\t\"O\n\x11PutMessageRequest\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06target\x18\x02 \x01(\t\x12\x1a\n\x04\x64\x61ta\x18\x03 \x01(\x0b\x32\x0c.MessageData\"Y\n\x0bJobResponse\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\x08\x12\x0e\n\x06target\x18\x03 \x01(\t\x12\x1a\n\x04\x64\x61ta\x18\x04 \x01(\x0b\x32\x0c.MessageData\"/\n\rGetJobRequest\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06target\x18\x02 \x01(\t\"K\n\rPutJobRequest\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06target\x18\x02 \x01(\t\x12\x1a\n\x04\x64\x61ta\x18\x03 \x01(\x0b\x32\x0c.MessageData\".\n\x0c\x43heckRequest\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06target\x18\x02 \x01(\t\"A\n\rCheckResponse\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06target\x18\x02 \x01(\t\x12\x10\n\x08has_data\x18\x03 \x01(\x08\"/\n\x0c\x42\x61sicRequest\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0f\n\x07verbose\x18\x02 \x01(\x08\x32\xbb\x02\n\x0eMessageService\x12\x32\n\nGetMessage\x12\x12.GetMessageRequest\x1a\x10.MessageResponse\x12)\n\nPutMessage\x12\x12.PutMessageRequest\x1a\x07.Status\x12-\n\x0cMessageCheck\x12\r.CheckRequest\x1a\x0e.CheckResponse\x12&\n\x06GetJob\x12\x0e.GetJobRequest\x1a\x0c.JobResponse\x12!\n\x06PutJob\x12\x0e.PutJobRequest\x1a\x07.Status\x12)\n\x08JobCheck\x12\r.CheckRequest\x1a\x0e.CheckResponse\x12%\n\x0bPurgeQueues\x12\r.BasicRequest\x1a\x07.Statusb\x06proto3')
+  serialized_pb=_b('\n\tmsg.proto\"(\n\x06Status\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06result\x18\x02 \x01(\x08\"\x8d\x01\n\x0bMessageData\x12\x10\n\x08identity\x18\x01 \x01(\t\x12\x0e\n\x06msg_id\x18\x02 \x01(\t\x12\x0f\n\x07\x63ontrol\x18\x03 \x01(\t\x12\x0f\n\x07\x63ommand\x18\x04 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x05 \x01(\t\x12\x0c\n\x04info\x18\x06 \x01(\t\x12\x0e\n\x06stderr\x18\x07 \x01(\t\x12\x0e\n\x06stdout\x18\x08 \x01(\t\"]\n\x0fMessageResponse\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\x08\x12\x0e\n\x06target\x18\x03 \x01(\t\x12\x1a\n\x04\x64\x61ta\x18\x04 \x01(\x0b\x32\x0c.MessageData\"3\n\x11GetMessageRequest\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06target\x18\x02 \x01(\t\"O\n\x11PutMessageRequest\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06target\x18\x02 \x01(\t\x12\x1a\n\x04\x64\x61ta\x18\x03 \x01(\x0b\x32\x0c.MessageData\"Y\n\x0bJobResponse\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\x08\x12\x0e\n\x06target\x18\x03 \x01(\t\x12\x1a\n\x04\x64\x61ta\x18\x04 \x01(\x0b\x32\x0c.MessageData\"/\n\rGetJobRequest\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06target\x18\x02 \x01(\t\"K\n\rPutJobRequest\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06target\x18\x02 \x01(\t\x12\x1a\n\x04\x64\x61ta\x18\x03 \x01(\x0b\x32\x0c.MessageData\".\n\x0c\x43heckRequest\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06target\x18\x02 \x01(\t\"A\n\rCheckResponse\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06target\x18\x02 \x01(\t\x12\x10\n\x08has_data\x18\x03 \x01(\x08\"2\n\x10SubscribeRequest\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06target\x18\x02 \x01(\t\"@\n\x0fGetBatchRequest\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06target\x18\x02 \x01(\t\x12\r\n\x05limit\x18\x03 \x01(\x05\"K\n\rBatchResponse\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0e\n\x06target\x18\x02 \x01(\t\x12\x1a\n\x04\x64\x61ta\x18\x03 \x03(\x0b\x32\x0c.MessageData\"7\n\tBatchItem\x12\x0e\n\x06target\x18\x01 \x01(\t\x12\x1a\n\x04\x64\x61ta\x18\x02 \x01(\x0b\x32\x0c.MessageData\"<\n\x0fPutBatchRequest\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x19\n\x05items\x18\x02 \x03(\x0b\x32\n.BatchItem\"/\n\x0c\x42\x61sicRequest\x12\x0e\n\x06req_id\x18\x01 \x01(\t\x12\x0f\n\x07verbose\x18\x02 \x01(\x08\x32\xd5\x04\n\x0eMessageService\x12\x32\n\nGetMessage\x12\x12.GetMessageRequest\x1a\x10.MessageResponse\x12)\n\nPutMessage\x12\x12.PutMessageRequest\x1a\x07.Status\x12-\n\x0cMessageCheck\x12\r.CheckRequest\x1a\x0e.CheckResponse\x12&\n\x06GetJob\x12\x0e.GetJobRequest\x1a\x0c.JobResponse\x12!\n\x06PutJob\x12\x0e.PutJobRequest\x1a\x07.Status\x12)\n\x08JobCheck\x12\r.CheckRequest\x1a\x0e.CheckResponse\x12%\n\x0bPurgeQueues\x12\r.BasicRequest\x1a\x07.Status\x12\x36\n\x11SubscribeMessages\x12\x11.SubscribeRequest\x1a\x0c.MessageData0\x01\x12\x32\n\rSubscribeJobs\x12\x11.SubscribeRequest\x1a\x0c.MessageData0\x01\x12/\n\x0bGetMessages\x12\x10.GetBatchRequest\x1a\x0e.BatchResponse\x12(\n\x0bPutMessages\x12\x10.PutBatchRequest\x1a\x07.Status\x12+\n\x07GetJobs\x12\x10.GetBatchRequest\x1a\x0e.BatchResponse\x12$\n\x07PutJobs\x12\x10.PutBatchRequest\x1a\x07.Statusb\x06proto3')
 )
 
 
@@ -497,6 +497,210 @@ _CHECKRESPONSE = _descriptor.Descriptor(
 )
 
 
+_SUBSCRIBEREQUEST = _descriptor.Descriptor(
+  name='SubscribeRequest',
+  full_name='SubscribeRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='req_id', full_name='SubscribeRequest.req_id', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='target', full_name='SubscribeRequest.target', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=760,
+  serialized_end=810,
+)
+
+
+_GETBATCHREQUEST = _descriptor.Descriptor(
+  name='GetBatchRequest',
+  full_name='GetBatchRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='req_id', full_name='GetBatchRequest.req_id', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='target', full_name='GetBatchRequest.target', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='limit', full_name='GetBatchRequest.limit', index=2,
+      number=3, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=812,
+  serialized_end=876,
+)
+
+
+_BATCHRESPONSE = _descriptor.Descriptor(
+  name='BatchResponse',
+  full_name='BatchResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='req_id', full_name='BatchResponse.req_id', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='target', full_name='BatchResponse.target', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='data', full_name='BatchResponse.data', index=2,
+      number=3, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=878,
+  serialized_end=953,
+)
+
+
+_BATCHITEM = _descriptor.Descriptor(
+  name='BatchItem',
+  full_name='BatchItem',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='target', full_name='BatchItem.target', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='data', full_name='BatchItem.data', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=955,
+  serialized_end=1010,
+)
+
+
+_PUTBATCHREQUEST = _descriptor.Descriptor(
+  name='PutBatchRequest',
+  full_name='PutBatchRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='req_id', full_name='PutBatchRequest.req_id', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='items', full_name='PutBatchRequest.items', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1012,
+  serialized_end=1072,
+)
+
+
 _BASICREQUEST = _descriptor.Descriptor(
   name='BasicRequest',
   full_name='BasicRequest',
@@ -530,14 +734,17 @@ _BASICREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=760,
-  serialized_end=807,
+  serialized_start=1074,
+  serialized_end=1121,
 )
 
 _MESSAGERESPONSE.fields_by_name['data'].message_type = _MESSAGEDATA
 _PUTMESSAGEREQUEST.fields_by_name['data'].message_type = _MESSAGEDATA
 _JOBRESPONSE.fields_by_name['data'].message_type = _MESSAGEDATA
 _PUTJOBREQUEST.fields_by_name['data'].message_type = _MESSAGEDATA
+_BATCHRESPONSE.fields_by_name['data'].message_type = _MESSAGEDATA
+_BATCHITEM.fields_by_name['data'].message_type = _MESSAGEDATA
+_PUTBATCHREQUEST.fields_by_name['items'].message_type = _BATCHITEM
 DESCRIPTOR.message_types_by_name['Status'] = _STATUS
 DESCRIPTOR.message_types_by_name['MessageData'] = _MESSAGEDATA
 DESCRIPTOR.message_types_by_name['MessageResponse'] = _MESSAGERESPONSE
@@ -548,6 +755,11 @@ DESCRIPTOR.message_types_by_name['GetJobRequest'] = _GETJOBREQUEST
 DESCRIPTOR.message_types_by_name['PutJobRequest'] = _PUTJOBREQUEST
 DESCRIPTOR.message_types_by_name['CheckRequest'] = _CHECKREQUEST
 DESCRIPTOR.message_types_by_name['CheckResponse'] = _CHECKRESPONSE
+DESCRIPTOR.message_types_by_name['SubscribeRequest'] = _SUBSCRIBEREQUEST
+DESCRIPTOR.message_types_by_name['GetBatchRequest'] = _GETBATCHREQUEST
+DESCRIPTOR.message_types_by_name['BatchResponse'] = _BATCHRESPONSE
+DESCRIPTOR.message_types_by_name['BatchItem'] = _BATCHITEM
+DESCRIPTOR.message_types_by_name['PutBatchRequest'] = _PUTBATCHREQUEST
 DESCRIPTOR.message_types_by_name['BasicRequest'] = _BASICREQUEST
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
@@ -621,6 +833,41 @@ CheckResponse = _reflection.GeneratedProtocolMessageType('CheckResponse', (_mess
   })
 _sym_db.RegisterMessage(CheckResponse)
 
+SubscribeRequest = _reflection.GeneratedProtocolMessageType('SubscribeRequest', (_message.Message,), {
+  'DESCRIPTOR' : _SUBSCRIBEREQUEST,
+  '__module__' : 'msg_pb2'
+  # @@protoc_insertion_point(class_scope:SubscribeRequest)
+  })
+_sym_db.RegisterMessage(SubscribeRequest)
+
+GetBatchRequest = _reflection.GeneratedProtocolMessageType('GetBatchRequest', (_message.Message,), {
+  'DESCRIPTOR' : _GETBATCHREQUEST,
+  '__module__' : 'msg_pb2'
+  # @@protoc_insertion_point(class_scope:GetBatchRequest)
+  })
+_sym_db.RegisterMessage(GetBatchRequest)
+
+BatchResponse = _reflection.GeneratedProtocolMessageType('BatchResponse', (_message.Message,), {
+  'DESCRIPTOR' : _BATCHRESPONSE,
+  '__module__' : 'msg_pb2'
+  # @@protoc_insertion_point(class_scope:BatchResponse)
+  })
+_sym_db.RegisterMessage(BatchResponse)
+
+BatchItem = _reflection.GeneratedProtocolMessageType('BatchItem', (_message.Message,), {
+  'DESCRIPTOR' : _BATCHITEM,
+  '__module__' : 'msg_pb2'
+  # @@protoc_insertion_point(class_scope:BatchItem)
+  })
+_sym_db.RegisterMessage(BatchItem)
+
+PutBatchRequest = _reflection.GeneratedProtocolMessageType('PutBatchRequest', (_message.Message,), {
+  'DESCRIPTOR' : _PUTBATCHREQUEST,
+  '__module__' : 'msg_pb2'
+  # @@protoc_insertion_point(class_scope:PutBatchRequest)
+  })
+_sym_db.RegisterMessage(PutBatchRequest)
+
 BasicRequest = _reflection.GeneratedProtocolMessageType('BasicRequest', (_message.Message,), {
   'DESCRIPTOR' : _BASICREQUEST,
   '__module__' : 'msg_pb2'
@@ -636,8 +883,8 @@ _MESSAGESERVICE = _descriptor.ServiceDescriptor(
   file=DESCRIPTOR,
   index=0,
   serialized_options=None,
-  serialized_start=810,
-  serialized_end=1125,
+  serialized_start=1124,
+  serialized_end=1721,
   methods=[
   _descriptor.MethodDescriptor(
     name='GetMessage',
@@ -702,6 +949,60 @@ _MESSAGESERVICE = _descriptor.ServiceDescriptor(
     output_type=_STATUS,
     serialized_options=None,
   ),
+  _descriptor.MethodDescriptor(
+    name='SubscribeMessages',
+    full_name='MessageService.SubscribeMessages',
+    index=7,
+    containing_service=None,
+    input_type=_SUBSCRIBEREQUEST,
+    output_type=_MESSAGEDATA,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='SubscribeJobs',
+    full_name='MessageService.SubscribeJobs',
+    index=8,
+    containing_service=None,
+    input_type=_SUBSCRIBEREQUEST,
+    output_type=_MESSAGEDATA,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='GetMessages',
+    full_name='MessageService.GetMessages',
+    index=9,
+    containing_service=None,
+    input_type=_GETBATCHREQUEST,
+    output_type=_BATCHRESPONSE,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='PutMessages',
+    full_name='MessageService.PutMessages',
+    index=10,
+    containing_service=None,
+    input_type=_PUTBATCHREQUEST,
+    output_type=_STATUS,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='GetJobs',
+    full_name='MessageService.GetJobs',
+    index=11,
+    containing_service=None,
+    input_type=_GETBATCHREQUEST,
+    output_type=_BATCHRESPONSE,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='PutJobs',
+    full_name='MessageService.PutJobs',
+    index=12,
+    containing_service=None,
+    input_type=_PUTBATCHREQUEST,
+    output_type=_STATUS,
+    serialized_options=None,
+  ),
 ])
 _sym_db.RegisterServiceDescriptor(_MESSAGESERVICE)
 
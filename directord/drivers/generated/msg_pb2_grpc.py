@@ -49,6 +49,36 @@ class MessageServiceStub(object):
         request_serializer=msg__pb2.BasicRequest.SerializeToString,
         response_deserializer=msg__pb2.Status.FromString,
         )
+    self.SubscribeMessages = channel.unary_stream(
+        '/MessageService/SubscribeMessages',
+        request_serializer=msg__pb2.SubscribeRequest.SerializeToString,
+        response_deserializer=msg__pb2.MessageData.FromString,
+        )
+    self.SubscribeJobs = channel.unary_stream(
+        '/MessageService/SubscribeJobs',
+        request_serializer=msg__pb2.SubscribeRequest.SerializeToString,
+        response_deserializer=msg__pb2.MessageData.FromString,
+        )
+    self.GetMessages = channel.unary_unary(
+        '/MessageService/GetMessages',
+        request_serializer=msg__pb2.GetBatchRequest.SerializeToString,
+        response_deserializer=msg__pb2.BatchResponse.FromString,
+        )
+    self.PutMessages = channel.unary_unary(
+        '/MessageService/PutMessages',
+        request_serializer=msg__pb2.PutBatchRequest.SerializeToString,
+        response_deserializer=msg__pb2.Status.FromString,
+        )
+    self.GetJobs = channel.unary_unary(
+        '/MessageService/GetJobs',
+        request_serializer=msg__pb2.GetBatchRequest.SerializeToString,
+        response_deserializer=msg__pb2.BatchResponse.FromString,
+        )
+    self.PutJobs = channel.unary_unary(
+        '/MessageService/PutJobs',
+        request_serializer=msg__pb2.PutBatchRequest.SerializeToString,
+        response_deserializer=msg__pb2.Status.FromString,
+        )
 
 
 class MessageServiceServicer(object):
@@ -104,6 +134,48 @@ class MessageServiceServicer(object):
     context.set_details('Method not implemented!')
     raise NotImplementedError('Method not implemented!')
 
+  def SubscribeMessages(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def SubscribeJobs(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def GetMessages(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def PutMessages(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def GetJobs(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def PutJobs(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
 
 def add_MessageServiceServicer_to_server(servicer, server):
   rpc_method_handlers = {
@@ -142,6 +214,36 @@ def add_MessageServiceServicer_to_server(servicer, server):
           request_deserializer=msg__pb2.BasicRequest.FromString,
           response_serializer=msg__pb2.Status.SerializeToString,
       ),
+      'SubscribeMessages': grpc.unary_stream_rpc_method_handler(
+          servicer.SubscribeMessages,
+          request_deserializer=msg__pb2.SubscribeRequest.FromString,
+          response_serializer=msg__pb2.MessageData.SerializeToString,
+      ),
+      'SubscribeJobs': grpc.unary_stream_rpc_method_handler(
+          servicer.SubscribeJobs,
+          request_deserializer=msg__pb2.SubscribeRequest.FromString,
+          response_serializer=msg__pb2.MessageData.SerializeToString,
+      ),
+      'GetMessages': grpc.unary_unary_rpc_method_handler(
+          servicer.GetMessages,
+          request_deserializer=msg__pb2.GetBatchRequest.FromString,
+          response_serializer=msg__pb2.BatchResponse.SerializeToString,
+      ),
+      'PutMessages': grpc.unary_unary_rpc_method_handler(
+          servicer.PutMessages,
+          request_deserializer=msg__pb2.PutBatchRequest.FromString,
+          response_serializer=msg__pb2.Status.SerializeToString,
+      ),
+      'GetJobs': grpc.unary_unary_rpc_method_handler(
+          servicer.GetJobs,
+          request_deserializer=msg__pb2.GetBatchRequest.FromString,
+          response_serializer=msg__pb2.BatchResponse.SerializeToString,
+      ),
+      'PutJobs': grpc.unary_unary_rpc_method_handler(
+          servicer.PutJobs,
+          request_deserializer=msg__pb2.PutBatchRequest.FromString,
+          response_serializer=msg__pb2.Status.SerializeToString,
+      ),
   }
   generic_handler = grpc.method_handlers_generic_handler(
       'MessageService', rpc_method_handlers)
@@ -12,9 +12,9 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 
+import asyncio
+import collections
 from concurrent import futures
-from distutils.util import strtobool
-import json
 import os
 import queue
 import random
@@ -25,6 +25,11 @@ import uuid
 try:
     import grpc
 
+    try:
+        from grpc import aio as grpc_aio
+    except ImportError:
+        grpc_aio = None
+
     try:
         # Use dynmaic code generation which is available in
         # grpc-tools >= 1.32.0
@@ -43,127 +48,86 @@ try:
 except (ImportError, ModuleNotFoundError):
     DRIVER_AVAILABLE = False
     grpc_MessageServiceServicer = object
-    pass
+    grpc_aio = None
 
 from directord import drivers
+from directord import iodict
 from directord import utils
 
 
-def parse_args(parser, parser_server, parser_client):
-    """Add arguments for this driver to the parser.
+class TargetQueue(queue.Queue, iodict.FlushQueue):
+    """Queue for a single target.
 
-    :param parser: Parser
-    :type parser: Object
-    :param parser_server: SubParser object
-    :type parser_server: Object
-    :param parser_client: SubParser object
-    :type parser_client: Object
-    :returns: Object
+    Items are stored as tuples of put time, size, and data.
     """
 
-    group = parser.add_argument_group("gRPC driver options")
-    group.add_argument(
-        "--grpc-port",
-        type=int,
-        default=os.getenv("DIRECTORD_GRPC_PORT", 5558),
-        metavar="INTEGER",
-        help=("gRPC Port. Default %(default)s."),
-    )
-    group.add_argument(
-        "--grpc-server-address",
-        help=(
-            "gRPC Domain or IP address of the Directord server."
-            " Default: %(default)s"
-        ),
-        metavar="STRING",
-        default=os.getenv("DIRECTORD_GRPC_SERVER_ADDRESS", "127.0.0.1"),
-    )
-    group.add_argument(
-        "--grpc-disable-compression",
-        metavar="BOOLEAN",
-        default=bool(
-            strtobool(os.getenv("DIRECTORD_GRPC_DISABLE_COMPRESSION", "False"))
-        ),
-        help=("Disable compression between client and server."),
-        type=bool,
-    )
-
-    server_group = parser_server.add_argument_group(
-        "gRPC Server driver options"
-    )
-    server_group.add_argument(
-        "--grpc-bind-address",
-        help=(
-            "gRPC IP Address to bind a Directord Server."
-            " Default: %(default)s"
-        ),
-        metavar="STRING",
-        default=os.getenv("DIRECTORD_GRPC_BIND_ADDRESS", "0.0.0.0"),
-    )
-    server_group.add_argument(
-        "--grpc-server-workers",
-        type=int,
-        default=os.getenv("DIRECTORD_GRPC_SERVER_WORKERS", 4),
-        metavar="INTEGER",
-        help=("Number of gRPC server workers. Default: %(default)s"),
-    )
-    auth_group = parser.add_argument_group("gRPC driver auth options")
-    auth_group.add_argument(
-        "--grpc-ssl",
-        help=("Enable gRPC driver SSL encryption. Default: %(default)s"),
-        metavar="BOOLEAN",
-        default=bool(strtobool(os.getenv("DIRECTORD_GRPC_SSL", "False"))),
-        type=bool,
-    )
-    auth_group.add_argument(
-        "--grpc-ssl-ca",
-        help=("gRPC driver SSL CA file path. Default: %(default)s"),
-        metavar="STRING",
-        default=str(
-            os.getenv(
-                "DIRECTORD_GRPC_SSL_CA",
-                "/etc/pki/ca-trust/source/anchors/cm-local-ca.pem",
-            )
-        ),
-        type=str,
-    )
-    auth_group.add_argument(
-        "--grpc-ssl-cert",
-        help=(
-            "gRPC driver SSL certificate file path. " "Default: %(default)s"
-        ),
-        metavar="STRING",
-        default=str(
-            os.getenv(
-                "DIRECTORD_GRPC_SSL_CERT",
-                "/etc/directord/grpc/ssl/directord.crt",
-            )
-        ),
-        type=str,
-    )
-    auth_group.add_argument(
-        "--grpc-ssl-key",
-        help=("gRPC driver SSL key file path. Default: %(default)s"),
-        metavar="STRING",
-        default=str(
-            os.getenv(
-                "DIRECTORD_GRPC_SSL_KEY",
-                "/etc/directord/grpc/ssl/directord.key",
-            )
-        ),
-        type=str,
-    )
-    auth_group.add_argument(
-        "--grpc-ssl-client-auth",
-        help=("Require ssl client auth. Default: %(default)s"),
-        metavar="BOOLEAN",
-        default=bool(
-            strtobool(os.getenv("DIRECTORD_GRPC_SSL_CLIENT_AUTH", "False"))
-        ),
-        type=bool,
-    )
-
-    return parser
+    def __init__(self, path=None):
+        """Init."""
+        super().__init__()
+        self.path = path
+        self.lock = None
+        self.semaphore = None
+        self.created = time.time()
+        self.bytes = 0
+        self.puts = 0
+        self.gets = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.expired = 0
+
+    def oldest(self):
+        """Return the put time of the oldest item.
+
+        :returns: float|None
+        """
+        with self.mutex:
+            if self.queue:
+                return self.queue[0][0]
+
+    def put_front(self, item):
+        """Put an item at the head of the queue.
+
+        :param item: Queue item.
+        :type item: Tuple
+        """
+        with self.not_empty:
+            self.queue.appendleft(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def pop_expired(self, expire_time):
+        """Remove and return all items put before the expire time.
+
+        :param expire_time: Expire time.
+        :type expire_time: float
+        :returns: List
+        """
+        expired = list()
+        with self.mutex:
+            while self.queue and self.queue[0][0] <= expire_time:
+                expired.append(self._get())
+        return expired
+
+    def get_stats(self):
+        """Return target queue stats.
+
+        :returns: Dictionary
+        """
+        now = time.time()
+        oldest = self.oldest()
+        uptime = max(now - self.created, 1)
+        return {
+            "depth": self.qsize(),
+            "bytes": self.bytes,
+            "age": now - oldest if oldest else 0,
+            "puts": self.puts,
+            "gets": self.gets,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "expired": self.expired,
+            "put_rate": self.puts / uptime,
+            "get_rate": self.gets / uptime,
+        }
 
 
 class QueueBase:
@@ -179,6 +143,11 @@ class QueueBase:
         """Setup queue data."""
         self._data_queue = {}
         self._lock = threading.Lock()
+        self.max_depth = 0
+        self.max_bytes = 0
+        self.overflow = "reject"
+        self.ttl = 0
+        self.path = None
 
     @classmethod
     def instance(cls):
@@ -192,16 +161,170 @@ class QueueBase:
         """Get object lock."""
         return self._lock
 
+    def configure(
+        self, max_depth=0, max_bytes=0, overflow="reject", ttl=0, path=None
+    ):
+        """Configure queue limits and persistence.
+
+        When a path is set, targets persisted by a previous flush are
+        restored.
+
+        :param max_depth: Maximum number of items per target, 0 is unlimited.
+        :type max_depth: integer
+        :param max_bytes: Maximum number of bytes per target, 0 is unlimited.
+        :type max_bytes: integer
+        :param overflow: Overflow policy, reject or drop-oldest.
+        :type overflow: string
+        :param ttl: Time, in seconds, undelivered items are kept, 0 is
+                    forever.
+        :type ttl: float
+        :param path: Persistence path.
+        :type path: string
+        """
+        with self.get_lock():
+            self.max_depth = max_depth
+            self.max_bytes = max_bytes
+            self.overflow = overflow
+            self.ttl = ttl
+            self.path = path
+            if path and os.path.isdir(path):
+                for target in os.listdir(path):
+                    self._get_queue(target)
+
+    def _get_queue(self, target):
+        """Return the queue for a target, creating it when needed.
+
+        The object lock must be held by the caller.
+
+        :param target: queue target
+        :type target: string
+        :returns: TargetQueue
+        """
+        if target not in self._data_queue:
+            path = None
+            if self.path:
+                path = os.path.join(self.path, target)
+            target_queue = self._data_queue[target] = TargetQueue(path=path)
+            if path:
+                target_queue.ingest()
+                target_queue.bytes = sum(i[1] for i in target_queue.queue)
+        return self._data_queue[target]
+
+    @staticmethod
+    def _get_size(data):
+        """Return the size of queue data.
+
+        :param data: Object. queue data
+        :returns: integer
+        """
+        try:
+            return data.ByteSize()
+        except AttributeError:
+            return len(str(data))
+
+    def _expire(self, target_queue):
+        """Remove expired items from a target queue.
+
+        The object lock must be held by the caller.
+
+        :param target_queue: Target queue.
+        :type target_queue: TargetQueue
+        """
+        if not self.ttl:
+            return
+        for _, size, _ in target_queue.pop_expired(time.time() - self.ttl):
+            target_queue.bytes -= size
+            target_queue.expired += 1
+
+    def _full(self, target_queue, size):
+        """Return True when an item does not fit within the target queue.
+
+        :param target_queue: Target queue.
+        :type target_queue: TargetQueue
+        :param size: Item size.
+        :type size: integer
+        :returns: boolean
+        """
+        if self.max_depth and target_queue.qsize() >= self.max_depth:
+            return True
+        if self.max_bytes and target_queue.bytes + size > self.max_bytes:
+            return True
+        return False
+
+    def _pop(self, target_queue, timeout=0):
+        """Return the next unexpired item from a target queue.
+
+        :param target_queue: Target queue.
+        :type target_queue: TargetQueue
+        :param timeout: Maximum time, in seconds, to wait. 0 does not wait
+                        and None waits forever.
+        :type timeout: float
+        :returns: Object
+        """
+        if timeout:
+            end_time = time.time() + timeout
+        while True:
+            try:
+                if timeout == 0:
+                    put_time, size, data = target_queue.get_nowait()
+                elif timeout is None:
+                    put_time, size, data = target_queue.get()
+                else:
+                    put_time, size, data = target_queue.get(
+                        timeout=max(end_time - time.time(), 0)
+                    )
+            except queue.Empty:
+                return None
+            with self.get_lock():
+                target_queue.bytes -= size
+                if self.ttl and put_time <= time.time() - self.ttl:
+                    target_queue.expired += 1
+                    continue
+                target_queue.gets += 1
+            return data
+
     def add_queue(self, target, data):
         """Add data to target queue.
 
+        When the target queue is full, the data is rejected, or with the
+        drop-oldest overflow policy, the oldest items are dropped.
+
         :param target: String. queue target
         :param data: Object. queue data
+        :returns: boolean
         """
+        size = self._get_size(data)
         with self.get_lock():
-            if target not in self._data_queue:
-                self._data_queue[target] = queue.Queue()
-        self._data_queue[target].put(data)
+            target_queue = self._get_queue(target)
+            self._expire(target_queue)
+            while self._full(target_queue, size):
+                if self.overflow != "drop-oldest" or target_queue.empty():
+                    target_queue.rejected += 1
+                    return False
+                _, dropped_size, _ = target_queue.get_nowait()
+                target_queue.bytes -= dropped_size
+                target_queue.dropped += 1
+            target_queue.put((time.time(), size, data))
+            target_queue.bytes += size
+            target_queue.puts += 1
+        return True
+
+    def return_queue(self, target, data):
+        """Return data to the top of target queue.
+
+        Returned data keeps its place ahead of any data queued since it
+        was taken and is not subject to the queue limits.
+
+        :param target: String. queue target
+        :param data: Object. queue data
+        """
+        size = self._get_size(data)
+        with self.get_lock():
+            target_queue = self._get_queue(target)
+            put_time = min(target_queue.oldest() or time.time(), time.time())
+            target_queue.put_front((put_time, size, data))
+            target_queue.bytes += size
+            target_queue.gets -= 1
 
     def get_from_queue(self, target):
         """Get data from top of queue.
@@ -214,12 +337,51 @@ class QueueBase:
         """
 
         with self.get_lock():
-            if (
-                target not in self._data_queue
-                or self._data_queue[target].empty()
-            ):
+            if target not in self._data_queue:
                 return None
-        return self._data_queue[target].get()
+            target_queue = self._data_queue[target]
+        return self._pop(target_queue)
+
+    def get_many_from_queue(self, target, limit):
+        """Get data from top of queue.
+
+        This returns up to limit data items from the queue.
+
+        :param target: queue target
+        :type target: string
+        :param limit: Maximum number of items returned.
+        :type limit: integer
+        :returns: List
+        """
+
+        with self.get_lock():
+            if target not in self._data_queue:
+                return list()
+            target_queue = self._data_queue[target]
+        items = list()
+        while len(items) < limit:
+            data = self._pop(target_queue)
+            if data is None:
+                break
+            items.append(data)
+        return items
+
+    def wait_from_queue(self, target, timeout=None):
+        """Wait for data from the top of queue.
+
+        This returns a single data item from the queue, or None when no
+        data arrived within the timeout.
+
+        :param target: queue target
+        :type target: string
+        :param timeout: Maximum time, in seconds, to wait.
+        :type timeout: float
+        :returns: Object
+        """
+
+        with self.get_lock():
+            target_queue = self._get_queue(target)
+        return self._pop(target_queue, timeout=timeout)
 
     def check_queue(self, target):
         """Check if target has data in queue.
@@ -231,15 +393,34 @@ class QueueBase:
         with self.get_lock():
             if target not in self._data_queue:
                 return False
-        return not self._data_queue[target].empty()
+            target_queue = self._data_queue[target]
+            self._expire(target_queue)
+        return not target_queue.empty()
 
     def get_stats(self):
-        """Return queue stats."""
+        """Return queue stats.
+
+        Stats include the depth, bytes, age of the oldest item, and
+        throughput counters of every target queue.
+        """
         stats = {}
         with self.get_lock():
+            for target_queue in self._data_queue.values():
+                self._expire(target_queue)
             stats["targets"] = list(self._data_queue)
+            stats["queues"] = {
+                k: v.get_stats() for k, v in self._data_queue.items()
+            }
         return stats
 
+    def flush(self):
+        """Persist all pending data when a persistence path is set."""
+        with self.get_lock():
+            if not self.path:
+                return
+            for target_queue in self._data_queue.values():
+                target_queue.flush()
+
     def purge_queue(self):
         """Empty queue."""
         with self.get_lock():
@@ -334,10 +515,17 @@ class MessageServiceServicer(grpc_MessageServiceServicer):
 
         # self.log.debug("%s | -> PutMessage Request: %s", req_id, request)
         q = MessageQueue.instance()
-        q.add_queue(target, msg)
-        self.log.debug("%s | + We added message to queue (%s)", req_id, target)
+        result = q.add_queue(target, msg)
+        if result:
+            self.log.debug(
+                "%s | + We added message to queue (%s)", req_id, target
+            )
+        else:
+            self.log.warning(
+                "%s | ! Queue full, message rejected (%s)", req_id, target
+            )
 
-        status = msg_pb2.Status(req_id=req_id, result=True)
+        status = msg_pb2.Status(req_id=req_id, result=result)
         # self.log.debug("%s | <- PutMessage Response: %s", req_id, status)
         return status
 
@@ -356,13 +544,100 @@ class MessageServiceServicer(grpc_MessageServiceServicer):
 
         # self.log.debug("%s | -> PutJob Request: %s", req_id, request)
         q = JobQueue.instance()
-        q.add_queue(target, msg)
-        self.log.debug("%s | + We added job to queue (%s)", req_id, target)
+        result = q.add_queue(target, msg)
+        if result:
+            self.log.debug("%s | + We added job to queue (%s)", req_id, target)
+        else:
+            self.log.warning(
+                "%s | ! Queue full, job rejected (%s)", req_id, target
+            )
 
-        status = msg_pb2.Status(req_id=req_id, result=True)
+        status = msg_pb2.Status(req_id=req_id, result=result)
         # self.log.debug("%s | <- PutJob Response: %s", req_id, status)
         return status
 
+    def GetMessages(self, request, context):
+        """Gets a batch of messages.
+
+        gRPC calls this method when clients call the GetMessages rpc (method).
+        :param request: The incoming request.
+        :type request: GetBatchRequest
+        :param context: The gRPC connection context.
+        :returns: BatchResponse
+        """
+        return msg_pb2.BatchResponse(
+            req_id=request.req_id,
+            target=request.target,
+            data=MessageQueue.instance().get_many_from_queue(
+                request.target, max(request.limit, 1)
+            ),
+        )
+
+    def GetJobs(self, request, context):
+        """Gets a batch of jobs.
+
+        gRPC calls this method when clients call the GetJobs rpc (method).
+        :param request: The incoming request.
+        :type request: GetBatchRequest
+        :param context: The gRPC connection context.
+        :returns: BatchResponse
+        """
+        return msg_pb2.BatchResponse(
+            req_id=request.req_id,
+            target=request.target,
+            data=JobQueue.instance().get_many_from_queue(
+                request.target, max(request.limit, 1)
+            ),
+        )
+
+    def PutMessages(self, request, context):
+        """Put a batch of messages.
+
+        gRPC calls this method when clients call the PutMessages rpc (method).
+        :param request: The incoming request.
+        :type request: PutBatchRequest
+        :param context: The gRPC connection context.
+        :returns: Status
+        """
+        q = MessageQueue.instance()
+        added = sum(q.add_queue(i.target, i.data) for i in request.items)
+        self.log.debug(
+            "%s | + We added %s messages to queue", request.req_id, added
+        )
+        if added < len(request.items):
+            self.log.warning(
+                "%s | ! Queue full, %s messages rejected",
+                request.req_id,
+                len(request.items) - added,
+            )
+        return msg_pb2.Status(
+            req_id=request.req_id, result=added == len(request.items)
+        )
+
+    def PutJobs(self, request, context):
+        """Put a batch of jobs.
+
+        gRPC calls this method when clients call the PutJobs rpc (method).
+        :param request: The incoming request.
+        :type request: PutBatchRequest
+        :param context: The gRPC connection context.
+        :returns: Status
+        """
+        q = JobQueue.instance()
+        added = sum(q.add_queue(i.target, i.data) for i in request.items)
+        self.log.debug(
+            "%s | + We added %s jobs to queue", request.req_id, added
+        )
+        if added < len(request.items):
+            self.log.warning(
+                "%s | ! Queue full, %s jobs rejected",
+                request.req_id,
+                len(request.items) - added,
+            )
+        return msg_pb2.Status(
+            req_id=request.req_id, result=added == len(request.items)
+        )
+
     def MessageCheck(self, request, context):
         """Check if messages in queue."""
         # self.log.debug(
@@ -384,6 +659,55 @@ class MessageServiceServicer(grpc_MessageServiceServicer):
             has_data=JobQueue.instance().check_queue(request.target),
         )
 
+    def _subscribe(self, q, request, context):
+        """Yield queued data for a target while the subscriber is active.
+
+        :param q: Queue instance.
+        :type q: QueueBase
+        :param request: The incoming request.
+        :type request: SubscribeRequest
+        :param context: The gRPC connection context.
+        :returns: Generator
+        """
+        target = request.target
+        req_id = request.req_id
+        self.log.debug("%s | + Subscription started (%s)", req_id, target)
+        while context.is_active():
+            data = q.wait_from_queue(target, timeout=1)
+            if not data:
+                continue
+            elif not context.is_active():
+                # NOTE(cloudnull): Return data to the top of the queue when
+                #                  the subscriber went away while waiting.
+                q.return_queue(target, data)
+                break
+            yield data
+        self.log.debug("%s | - Subscription ended (%s)", req_id, target)
+
+    def SubscribeMessages(self, request, context):
+        """Stream messages to a subscriber.
+
+        gRPC calls this method when clients call the SubscribeMessages rpc
+        (method).
+        :param request: The incoming request.
+        :type request: SubscribeRequest
+        :param context: The gRPC connection context.
+        :returns: Generator
+        """
+        return self._subscribe(MessageQueue.instance(), request, context)
+
+    def SubscribeJobs(self, request, context):
+        """Stream jobs to a subscriber.
+
+        gRPC calls this method when clients call the SubscribeJobs rpc
+        (method).
+        :param request: The incoming request.
+        :type request: SubscribeRequest
+        :param context: The gRPC connection context.
+        :returns: Generator
+        """
+        return self._subscribe(JobQueue.instance(), request, context)
+
     def PurgeQueues(self, request, context):
         """Nuke queues."""
         self.log.warning(
@@ -397,6 +721,51 @@ class MessageServiceServicer(grpc_MessageServiceServicer):
         return status
 
 
+class Subscription:
+    """Local buffer fed by a server streaming subscription."""
+
+    def __init__(self):
+        """Init."""
+        self._items = collections.deque()
+        self._condition = threading.Condition()
+
+    def put(self, data):
+        """Add data to the buffer.
+
+        :param data: Object. subscription data
+        """
+        with self._condition:
+            self._items.append(data)
+            self._condition.notify()
+
+    def wait(self, timeout=None):
+        """Return True once data is available.
+
+        :param timeout: Maximum time, in seconds, to wait.
+        :type timeout: float
+        :returns: boolean
+        """
+        with self._condition:
+            return bool(
+                self._condition.wait_for(lambda: self._items, timeout=timeout)
+            )
+
+    def get(self, block=True):
+        """Get data from the buffer.
+
+        :param block: Block until data is available, when disabled
+                      queue.Empty is raised if no data is available.
+        :type block: boolean
+        :returns: Object
+        """
+        with self._condition:
+            if block:
+                self._condition.wait_for(lambda: self._items)
+            elif not self._items:
+                raise queue.Empty
+            return self._items.popleft()
+
+
 class MessageServiceClient:
     """Service Client."""
 
@@ -406,10 +775,16 @@ class MessageServiceClient:
     server_port = None
     channel = None
     stub = None
+    aio_channel = None
+    aio_stub = None
+    _aio_loop = None
     compression = None
     ssl_ca = None
     ssl_cert = None
     ssl_key = None
+    _subscriptions = None
+    _subscription_calls = None
+    batch_size = 1
 
     def __init__(self):
         """Init."""
@@ -426,6 +801,7 @@ class MessageServiceClient:
         ssl_ca=None,
         ssl_cert=None,
         ssl_key=None,
+        batch_size=1,
     ):
         """Get client instance."""
         if cls._instance is None:
@@ -439,6 +815,7 @@ class MessageServiceClient:
                 ssl_ca,
                 ssl_cert,
                 ssl_key,
+                batch_size,
             )
         return cls._instance
 
@@ -451,6 +828,7 @@ class MessageServiceClient:
         ssl_ca=None,
         ssl_cert=None,
         ssl_key=None,
+        batch_size=1,
     ):
         """Initializer.
 
@@ -462,25 +840,35 @@ class MessageServiceClient:
         self.secure = secure
         self.channel = None
         self.stub = None
+        self.aio_channel = None
+        self.aio_stub = None
+        self._aio_loop = None
         self.compression = compression
         self.ssl_ca = ssl_ca
         self.ssl_cert = ssl_cert
         self.ssl_key = ssl_key
+        self._subscriptions = dict()
+        self._subscription_calls = dict()
+        self._subscription_lock = threading.Lock()
+        self.batch_size = batch_size
+        self._batch_buffers = collections.defaultdict(collections.deque)
+        self._batch_pending = collections.defaultdict(collections.deque)
+        self._batch_sending = set()
+        self._batch_lock = threading.Lock()
         self.connect()
 
-    def connect(self):
-        """Connect to channel."""
-        wait_for_channel = threading.Event()
+    def _channel_args(self):
+        """Return the channel credentials and compression type.
 
-        def wait_for_connection(connectivity):
-            self.log.debug("grpc wait_for_connection: %s", connectivity)
-            if connectivity in [grpc.ChannelConnectivity.READY]:
-                wait_for_channel.set()
+        Credentials are None when SSL is disabled.
 
+        :returns: Tuple
+        """
         compression_type = grpc.Compression.Gzip
         if not self.compression:
             compression_type = grpc.Compression.NoCompression
 
+        credentials = None
         if self.secure:
             ssl_cert = None
             ssl_key = None
@@ -511,6 +899,19 @@ class MessageServiceClient:
             credentials = grpc.ssl_channel_credentials(
                 ca_cert, ssl_key, ssl_cert
             )
+        return credentials, compression_type
+
+    def connect(self):
+        """Connect to channel."""
+        wait_for_channel = threading.Event()
+
+        def wait_for_connection(connectivity):
+            self.log.debug("grpc wait_for_connection: %s", connectivity)
+            if connectivity in [grpc.ChannelConnectivity.READY]:
+                wait_for_channel.set()
+
+        credentials, compression_type = self._channel_args()
+        if credentials:
             self.log.info("grpc client IS using SSL")
             self.channel = grpc.secure_channel(
                 f"{self.server_address}:{self.server_port}",
@@ -530,12 +931,72 @@ class MessageServiceClient:
         wait_for_channel.wait()
         self.log.debug("Channel ready...")
 
+    def aio_connect(self):
+        """Connect to an asyncio channel.
+
+        The asyncio channel is bound to the running event loop, it is
+        created on first use and recreated when used from another loop.
+        """
+        credentials, compression_type = self._channel_args()
+        address = f"{self.server_address}:{self.server_port}"
+        if credentials:
+            self.aio_channel = grpc_aio.secure_channel(
+                address, credentials, compression=compression_type
+            )
+        else:
+            self.aio_channel = grpc_aio.insecure_channel(
+                address, compression=compression_type
+            )
+        self.aio_stub = msg_pb2_grpc.MessageServiceStub(self.aio_channel)
+        self._aio_loop = asyncio.get_running_loop()
+
+    async def aio_request(self, method, request):
+        """Send a request over the asyncio channel.
+
+        :param method: The rpc method name.
+        :param request: The rpc request message.
+        :returns: Object
+        """
+        if not self.stub:
+            raise Exception("Request after close")
+        loop = asyncio.get_running_loop()
+        if not self.aio_stub or self._aio_loop is not loop:
+            self.aio_connect()
+
+        try:
+            return await getattr(self.aio_stub, method)(request)
+        except grpc.RpcError as err:
+            self.log.error(
+                "%s | %s: %s, %s, %s",
+                request.req_id,
+                method,
+                err.code().name,
+                err.code().value,
+                err.details(),
+            )  # pylint: disable=no-member
+            raise
+
+    async def aio_close(self):
+        """Close the asyncio channel."""
+        if self.aio_channel:
+            await self.aio_channel.close()
+        self.aio_channel = None
+        self.aio_stub = None
+        self._aio_loop = None
+
     def close(self):
         """Close channels."""
+        if self._subscription_calls:
+            for call in list(self._subscription_calls.values()):
+                call.cancel()
         if self.channel:
             self.channel.close()
             self.channel = None
         self.stub = None
+        # NOTE(cloudnull): The asyncio channel can only be closed from its
+        #                  event loop, use aio_close to close it gracefully.
+        self.aio_channel = None
+        self.aio_stub = None
 
     def get_message(self, target):
         """Gets a message for a target.
@@ -546,6 +1007,9 @@ class MessageServiceClient:
         if not self.stub:
             raise Exception("Message request after close")
 
+        if self.batch_size > 1:
+            return target, self._get_batch("GetMessages", target)
+
         request = msg_pb2.GetMessageRequest(
             req_id=str(uuid.uuid1()), target=target
         )
@@ -585,6 +1049,9 @@ class MessageServiceClient:
         if not self.stub:
             raise Exception("Job request after close")
 
+        if self.batch_size > 1:
+            return target, self._get_batch("GetJobs", target)
+
         request = msg_pb2.GetJobRequest(
             req_id=str(uuid.uuid1()), target=target
         )
@@ -611,6 +1078,139 @@ class MessageServiceClient:
             self.log.error(err)
             raise
 
+    def _batch_buffered(self, method, target):
+        """Return True when fetched records are buffered for a target.
+
+        :param method: The batch rpc, GetJobs or GetMessages.
+        :param target: The resource target of a record.
+        :returns: Boolean
+        """
+        if self.batch_size < 2:
+            return False
+        with self._batch_lock:
+            return bool(self._batch_buffers.get((method, target)))
+
+    def _get_batch(self, method, target):
+        """Get a record for a target.
+
+        Records are served from the local buffer. When the buffer is empty
+        a batch of up to `batch_size` records is fetched from the server.
+        None is returned when the server has no records for the target.
+
+        :param method: The batch rpc, GetJobs or GetMessages.
+        :param target: The resource target of a record.
+        :returns: Object|None
+        """
+        key = (method, target)
+        with self._batch_lock:
+            if self._batch_buffers[key]:
+                return self._batch_buffers[key].popleft()
+
+        request = msg_pb2.GetBatchRequest(
+            req_id=str(uuid.uuid1()), target=target, limit=self.batch_size
+        )
+        try:
+            response = getattr(self.stub, method)(request)
+        except grpc.RpcError as err:
+            self.log.error(
+                "%s | %s: %s, %s, %s",
+                request.req_id,
+                method,
+                err.code().name,
+                err.code().value,
+                err.details(),
+            )  # pylint: disable=no-member
+            self.log.error(err)
+            raise
+
+        self.log.debug(
+            "%s | %s: %s records fetched.",
+            request.req_id,
+            method,
+            len(response.data),
+        )
+        with self._batch_lock:
+            self._batch_buffers[key].extend(response.data)
+            if self._batch_buffers[key]:
+                return self._batch_buffers[key].popleft()
+
+    def _put_batch(self, method, target, data):
+        """Put a record in queue.
+
+        Records are held in a pending queue. When no send is in progress
+        the caller sends all pending records, `batch_size` records per call;
+        otherwise the record is sent by the send in progress. Every record
+        carries a future which is resolved with the result of the call that
+        sent it, so all callers get the result of their own record.
+
+        :param method: The batch rpc, PutJobs or PutMessages.
+        :param target: The resource target of a record.
+        :param data: The record.
+        :returns: Boolean
+        """
+        future = futures.Future()
+        with self._batch_lock:
+            self._batch_pending[method].append(
+                (msg_pb2.BatchItem(target=target, data=data), future)
+            )
+            sending = method in self._batch_sending
+            self._batch_sending.add(method)
+
+        if sending:
+            return future.result()
+
+        batch = list()
+        try:
+            while True:
+                with self._batch_lock:
+                    pending = self._batch_pending[method]
+                    batch = [
+                        pending.popleft()
+                        for _ in range(min(len(pending), self.batch_size))
+                    ]
+                    if not batch:
+                        self._batch_sending.discard(method)
+                        break
+
+                request = msg_pb2.PutBatchRequest(
+                    req_id=str(uuid.uuid1()), items=[i for i, _ in batch]
+                )
+                try:
+                    response = getattr(self.stub, method)(request)
+                    self.log.debug(
+                        "%s | %s: %s records submitted",
+                        request.req_id,
+                        method,
+                        len(batch),
+                    )
+                    result = response.result
+                except grpc.RpcError as err:
+                    self.log.error(
+                        "%s | %s: %s, %s, %s",
+                        request.req_id,
+                        method,
+                        err.code().name,
+                        err.code().value,
+                        err.details(),
+                    )  # pylint: disable=no-member
+                    self.log.error(err)
+                    result = False
+                for _, batch_future in batch:
+                    batch_future.set_result(result)
+        except Exception as e:
+            # NOTE(cloudnull): Fail every record which has not been sent,
+            #                  nothing else would send them or resolve
+            #                  their futures.
+            with self._batch_lock:
+                self._batch_sending.discard(method)
+                pending = self._batch_pending.pop(method, [])
+            for _, batch_future in batch + list(pending):
+                if not batch_future.done():
+                    batch_future.set_exception(e)
+            raise
+
+        return future.result()
+
     def put_message(
         self,
         target,
@@ -647,6 +1247,9 @@ class MessageServiceClient:
             stderr=stderr,
             stdout=stdout,
         )
+        if self.batch_size > 1:
+            return self._put_batch("PutMessages", target, message)
+
         request = msg_pb2.PutMessageRequest(
             req_id=str(uuid.uuid1()), target=target, data=message
         )
@@ -710,6 +1313,9 @@ class MessageServiceClient:
             stderr=stderr,
             stdout=stdout,
         )
+        if self.batch_size > 1:
+            return self._put_batch("PutJobs", target, job)
+
         request = msg_pb2.PutJobRequest(
             req_id=str(uuid.uuid1()), target=target, data=job
         )
@@ -739,6 +1345,8 @@ class MessageServiceClient:
         """Check if messages are in queue."""
         if not self.stub:
             raise Exception("Job request after close")
+        if self._batch_buffered("GetMessages", target):
+            return True
         request = msg_pb2.CheckRequest(req_id=str(uuid.uuid1()), target=target)
         try:
             response = self.stub.MessageCheck(request)
@@ -759,6 +1367,8 @@ class MessageServiceClient:
         """Check if jobs are in queue."""
         if not self.stub:
             raise Exception("Job request after close")
+        if self._batch_buffered("GetJobs", target):
+            return True
         request = msg_pb2.CheckRequest(req_id=str(uuid.uuid1()), target=target)
         try:
             response = self.stub.JobCheck(request)
@@ -775,6 +1385,61 @@ class MessageServiceClient:
             self.log.error(err)
         return False
 
+    def subscribe(self, method, target):
+        """Return the subscription buffer for a target.
+
+        The subscription is started on first use and fed by a thread which
+        reconnects if the stream fails.
+
+        :param method: The subscription rpc, SubscribeJobs or
+                       SubscribeMessages.
+        :param target: The resource target of the subscription.
+        :returns: Subscription
+        """
+        with self._subscription_lock:
+            key = (method, target)
+            if key not in self._subscriptions:
+                self._subscriptions[key] = Subscription()
+                threading.Thread(
+                    target=self._subscription_run,
+                    args=(method, target, self._subscriptions[key]),
+                    name="{}-{}".format(method, target),
+                    daemon=True,
+                ).start()
+            return self._subscriptions[key]
+
+    def _subscription_run(self, method, target, subscription):
+        """Feed a subscription buffer from a server stream.
+
+        :param method: The subscription rpc.
+        :param target: The resource target of the subscription.
+        :param subscription: Subscription buffer.
+        """
+        while self.stub:
+            request = msg_pb2.SubscribeRequest(
+                req_id=str(uuid.uuid1()), target=target
+            )
+            try:
+                call = getattr(self.stub, method)(request)
+                with self._subscription_lock:
+                    self._subscription_calls[(method, target)] = call
+                for data in call:
+                    subscription.put(data)
+            except grpc.RpcError as err:
+                if err.code() == grpc.StatusCode.CANCELLED:
+                    break
+                self.log.error(
+                    "%s | %s: %s, %s, %s",
+                    request.req_id,
+                    method,
+                    err.code().name,
+                    err.code().value,
+                    err.details(),
+                )  # pylint: disable=no-member
+            except AttributeError:
+                break
+            time.sleep(1)
+
     def purge_queues(self):
         """Empty queues."""
         if not self.stub:
@@ -909,6 +1574,8 @@ class MessageServiceServer:
             self.log.info("Stopping Message Service Server")
             self._server.stop(grace=grace)
         self._server = None
+        MessageQueue.instance().flush()
+        JobQueue.instance().flush()
 
 
 class Driver(drivers.BaseDriver):
@@ -940,6 +1607,7 @@ class Driver(drivers.BaseDriver):
         self.encrypted_traffic_data = encrypted_traffic_data
 
         self.mode = getattr(self.args, "mode", None)
+        self.streaming = getattr(self.args, "grpc_streaming", False)
         self.grpc_port = self.args.grpc_port
         self.server_address = self.args.grpc_server_address
         if self.mode == "server":
@@ -967,20 +1635,59 @@ class Driver(drivers.BaseDriver):
             encrypted_traffic_data=self.encrypted_traffic_data,
             interface=self.interface,
         )
+        drv.metrics = self.metrics
         # init backend(s)
         drv.job_init()
         return drv
 
-    def backend_recv(self, nonblocking=False):
-        """Receive a transfer message.
+    def _check(self, channel, interval=1, constant=1000):
+        """Return True if a channel contains work ready.
 
-        :param nonblocking: Enable non-blocking receve.
-        :type nonblocking: Boolean
-        :returns: Tuple
+        :param channel: Channel name, job or backend.
+        :type channel: String
+        :param interval: Exponential Interval used to determine the polling
+                         duration for a given socket.
+        :type interval: Integer
+        :param constant: Constant time used to poll for new jobs.
+        :type constant: Integer
+        :returns: Boolean
         """
-        while not self.backend_check():
-            self.log.debug("No messages ready, waiting...")
-        target, data = self._client.get_message(self.identity)
+
+        if channel == "backend":
+            method, check = "SubscribeMessages", self._client.message_check
+        else:
+            method, check = "SubscribeJobs", self._client.job_check
+
+        start = time.monotonic()
+        if self.streaming:
+            ready = self._client.subscribe(method, self.identity).wait(
+                timeout=max(interval * (constant * 0.001), 0.5)
+            )
+        elif check(self.identity):
+            ready = True
+        else:
+            # limit checks to 5 per second and add some jitter
+            self.timeout = (
+                max(interval * (constant * 0.001), 0.5)
+                + random.randrange(0, 1000) / 10000
+            )
+            time.sleep(self.timeout)
+            ready = False
+        self.metrics.record_poll(
+            channel=channel, duration=time.monotonic() - start, ready=ready
+        )
+        return ready
+
+    def _message_list(self, channel, data):
+        """Return a received message as a list of parts.
+
+        :param channel: Channel name, job or backend.
+        :type channel: String
+        :param data: Message data.
+        :type data: Object
+        :returns: List
+        """
+
         return_msg = [
             data.msg_id,
             data.control,
@@ -992,11 +1699,84 @@ class Driver(drivers.BaseDriver):
         ]
         if self.mode == "server":
             return_msg.insert(0, data.identity)
+        self.metrics.record_recv(
+            channel=channel, control=data.control, parts=return_msg
+        )
         return return_msg
 
+    def _record_send(self, channel, identity, start, message):
+        """Record a sent message.
+
+        :param channel: Channel name, job or backend.
+        :type channel: String
+        :param identity: Sender identity.
+        :type identity: String
+        :param start: Monotonic time the send started.
+        :type start: Float
+        :param message: Message parts.
+        :type message: Dictionary
+        """
+
+        self.metrics.record_send(
+            channel=channel,
+            control=message.get("control"),
+            parts=[identity]
+            + [
+                message.get(i)
+                for i in [
+                    "msg_id",
+                    "control",
+                    "command",
+                    "data",
+                    "info",
+                    "stderr",
+                    "stdout",
+                ]
+            ],
+            duration=time.monotonic() - start,
+        )
+
+    def backend_recv(self, nonblocking=False, raw=False):
+        """Receive a transfer message.
+
+        :param nonblocking: Enable non-blocking receve, when streaming
+                            queue.Empty is raised if no message is ready.
+        :type nonblocking: Boolean
+        :param raw: Unused, message parts are always strings.
+        :type raw: Boolean
+        :returns: Tuple
+        """
+        if self.streaming:
+            data = self._client.subscribe(
+                "SubscribeMessages", self.identity
+            ).get(block=not nonblocking)
+        else:
+            # NOTE(cloudnull): A check can be followed by an empty fetch
+            #                  when another receiver took the message.
+            data = None
+            while data is None:
+                while not self.backend_check():
+                    self.log.debug("No messages ready, waiting...")
+                target, data = self._client.get_message(self.identity)
+        return self._message_list(channel="backend", data=data)
+
     def _grpc_init(self):
         """Initialize server and client."""
         if self.mode == "server" and not self._server:
+            for name, q in [
+                ("messages", MessageQueue.instance()),
+                ("jobs", JobQueue.instance()),
+            ]:
+                path = self.args.grpc_queue_path
+                if path:
+                    path = os.path.join(path, name)
+                q.configure(
+                    max_depth=self.args.grpc_queue_max_depth,
+                    max_bytes=self.args.grpc_queue_max_bytes,
+                    overflow=self.args.grpc_queue_overflow,
+                    ttl=self.args.grpc_queue_ttl,
+                    path=path,
+                )
             self._server = MessageServiceServer.instance(
                 self.log,
                 self.bind_address,
@@ -1020,6 +1800,7 @@ class Driver(drivers.BaseDriver):
                 self.args.grpc_ssl_ca,
                 self.args.grpc_ssl_cert,
                 self.args.grpc_ssl_key,
+                self.args.grpc_batch_size,
             )
             self.log.info(
                 "Started Message Service client (%s:%s)",
@@ -1062,15 +1843,9 @@ class Driver(drivers.BaseDriver):
         :type constant: Integer
         :returns: Object
         """
-        if self._client.message_check(self.identity):
-            return True
-        # limit checks to 5 per second and add some jitter
-        self.timeout = (
-            max(interval * (constant * 0.001), 0.5)
-            + random.randrange(0, 1000) / 10000
+        return self._check(
+            channel="backend", interval=interval, constant=constant
         )
-        time.sleep(self.timeout)
-        return False
 
     def backend_send(self, *args, **kwargs):
         """Send a job message.
@@ -1084,6 +1859,7 @@ class Driver(drivers.BaseDriver):
         target = kwargs.get(
             "target", kwargs.get("identity", self._server_identity)
         )
+        start = time.monotonic()
         try:
             self._client.put_message(
                 target=target,
@@ -1097,12 +1873,24 @@ class Driver(drivers.BaseDriver):
                 stdout=kwargs.get("stdout"),
             )
         except Exception as e:
+            self.metrics.record_failure()
             self.log.error("Error putting message, %s", e)
             raise
+        self._record_send(
+            channel="backend", identity=identity, start=start, message=kwargs
+        )
         return True
 
     def heartbeat_send(
-        self, host_uptime=None, agent_uptime=None, version=None, driver=None
+        self,
+        host_uptime=None,
+        agent_uptime=None,
+        version=None,
+        driver=None,
+        max_inflight_jobs=None,
+        slots=None,
+        compression=None,
+        encoding=None,
     ):
         """Send a heartbeat.
 
@@ -1114,6 +1902,14 @@ class Driver(drivers.BaseDriver):
         :type version: String
         :param version: Driver information
         :type version: String
+        :param max_inflight_jobs: Maximum number of in-flight jobs.
+        :type max_inflight_jobs: Integer
+        :param slots: Number of available in-flight job slots.
+        :type slots: Integer
+        :param compression: Compression algorithm the sender can decode.
+        :type compression: String
+        :param encoding: Payload encoding the sender can decode.
+        :type encoding: String
         """
 
         job_id = utils.get_uuid()
@@ -1128,15 +1924,16 @@ class Driver(drivers.BaseDriver):
             identity=self.identity,
             control=self.heartbeat_notice,
             msg_id=job_id,
-            data=json.dumps(
-                {
-                    "job_id": job_id,
-                    "version": version,
-                    "host_uptime": host_uptime,
-                    "agent_uptime": agent_uptime,
-                    "machine_id": self.machine_id,
-                    "driver": driver,
-                }
+            data=self.heartbeat_data(
+                job_id=job_id,
+                host_uptime=host_uptime,
+                agent_uptime=agent_uptime,
+                version=version,
+                driver=driver,
+                max_inflight_jobs=max_inflight_jobs,
+                slots=slots,
+                compression=compression,
+                encoding=encoding,
             ),
         )
 
@@ -1152,6 +1949,7 @@ class Driver(drivers.BaseDriver):
         target = kwargs.get(
             "target", kwargs.get("identity", self._server_identity)
         )
+        start = time.monotonic()
         try:
             self._client.put_job(
                 target=target,
@@ -1165,33 +1963,38 @@ class Driver(drivers.BaseDriver):
                 stdout=kwargs.get("stdout"),
             )
         except Exception as e:
+            self.metrics.record_failure()
             self.log.error("Error putting message, %s", e)
             raise
+        self._record_send(
+            channel="job", identity=identity, start=start, message=kwargs
+        )
         return True
 
-    def job_recv(self, nonblocking=False):
+    def job_recv(self, nonblocking=False, raw=False):
         """Receive a transfer message.
 
-        :param nonblocking: Enable non-blocking receve.
+        :param nonblocking: Enable non-blocking receve, when streaming
+                            queue.Empty is raised if no job is ready.
         :type nonblocking: Boolean
+        :param raw: Unused, message parts are always strings.
+        :type raw: Boolean
         :returns: Tuple
         """
 
-        while not self.job_check():
-            self.log.debug("No jobs ready, waiting...")
-        target, data = self._client.get_job(self.identity)
-        return_msg = [
-            data.msg_id,
-            data.control,
-            data.command,
-            data.data or "{}",  # data is expected to be jsonable
-            data.info,
-            data.stderr,
-            data.stdout,
-        ]
-        if self.mode == "server":
-            return_msg.insert(0, data.identity)
-        return return_msg
+        if self.streaming:
+            data = self._client.subscribe("SubscribeJobs", self.identity).get(
+                block=not nonblocking
+            )
+        else:
+            # NOTE(cloudnull): A check can be followed by an empty fetch
+            #                  when another receiver took the job.
+            data = None
+            while data is None:
+                while not self.job_check():
+                    self.log.debug("No jobs ready, waiting...")
+                target, data = self._client.get_job(self.identity)
+        return self._message_list(channel="job", data=data)
 
     def job_init(self):
         """Initialize the job socket.
@@ -1213,6 +2016,253 @@ class Driver(drivers.BaseDriver):
             )
             raise
 
+    async def _check_async(self, channel, interval=1, constant=1000):
+        """Return True if a channel contains work ready.
+
+        :param channel: Channel name, job or backend.
+        :type channel: String
+        :param interval: Exponential Interval used to determine the polling
+                         duration for a given socket.
+        :type interval: Integer
+        :param constant: Constant time used to poll for new jobs.
+        :type constant: Integer
+        :returns: Boolean
+        """
+
+        if channel == "backend":
+            method = "MessageCheck"
+        else:
+            method = "JobCheck"
+
+        start = time.monotonic()
+        request = msg_pb2.CheckRequest(
+            req_id=str(uuid.uuid1()), target=self.identity
+        )
+        try:
+            response = await self._client.aio_request(method, request)
+        except grpc.RpcError:
+            ready = False
+        else:
+            ready = response.has_data
+
+        if not ready:
+            # limit checks to 5 per second and add some jitter
+            self.timeout = (
+                max(interval * (constant * 0.001), 0.5)
+                + random.randrange(0, 1000) / 10000
+            )
+            await asyncio.sleep(self.timeout)
+        self.metrics.record_poll(
+            channel=channel, duration=time.monotonic() - start, ready=ready
+        )
+        return ready
+
+    async def _recv_async(self, channel):
+        """Receive a message.
+
+        The receive waits until a message has been fetched for the driver
+        identity.
+
+        :param channel: Channel name, job or backend.
+        :type channel: String
+        :returns: List
+        """
+
+        if channel == "backend":
+            method, request_type = "GetMessage", msg_pb2.GetMessageRequest
+        else:
+            method, request_type = "GetJob", msg_pb2.GetJobRequest
+
+        while True:
+            if not await self._check_async(channel=channel):
+                continue
+
+            response = await self._client.aio_request(
+                method,
+                request_type(req_id=str(uuid.uuid1()), target=self.identity),
+            )
+            if response.status:
+                return self._message_list(channel=channel, data=response.data)
+
+    async def _send_async(self, channel, **kwargs):
+        """Send a message.
+
+        :param channel: Channel name, job or backend.
+        :type channel: String
+        :param kwargs: Message parts.
+        :type kwargs: Dictionary
+        :returns: Boolean
+        """
+
+        if channel == "backend":
+            method, request_type = "PutMessage", msg_pb2.PutMessageRequest
+        else:
+            method, request_type = "PutJob", msg_pb2.PutJobRequest
+
+        # target defaults to server if identity not specified
+        identity = kwargs.get("identity", self.identity)
+        target = kwargs.get(
+            "target", kwargs.get("identity", self._server_identity)
+        )
+        message = msg_pb2.MessageData(
+            identity=identity,
+            msg_id=kwargs.get("msg_id"),
+            control=kwargs.get("control"),
+            command=kwargs.get("command"),
+            data=kwargs.get("data"),
+            info=kwargs.get("info"),
+            stderr=kwargs.get("stderr"),
+            stdout=kwargs.get("stdout"),
+        )
+        start = time.monotonic()
+        try:
+            await self._client.aio_request(
+                method,
+                request_type(
+                    req_id=str(uuid.uuid1()), target=target, data=message
+                ),
+            )
+        except Exception as e:
+            self.metrics.record_failure()
+            self.log.error("Error putting message, %s", e)
+            raise
+        self._record_send(
+            channel=channel, identity=identity, start=start, message=kwargs
+        )
+        return True
+
+    async def backend_check_async(self, interval=1, constant=1000):
+        """Return True if the backend contains work ready.
+
+        :param interval: Exponential Interval used to determine the polling
+                         duration for a given socket.
+        :type interval: Integer
+        :param constant: Constant time used to poll for new jobs.
+        :type constant: Integer
+        :returns: Boolean
+        """
+
+        if grpc_aio is None:
+            return await super().backend_check_async(
+                interval=interval, constant=constant
+            )
+
+        return await self._check_async(
+            channel="backend", interval=interval, constant=constant
+        )
+
+    async def backend_recv_async(self, raw=False):
+        """Receive a transfer message.
+
+        :param raw: Unused, message parts are always strings.
+        :type raw: Boolean
+        :returns: List
+        """
+
+        if grpc_aio is None:
+            return await super().backend_recv_async(raw=raw)
+
+        return await self._recv_async(channel="backend")
+
+    async def backend_send_async(self, **kwargs):
+        """Send a transfer message.
+
+        * All kwargs are passed through to the message.
+
+        :returns: Boolean
+        """
+
+        if grpc_aio is None:
+            return await super().backend_send_async(**kwargs)
+
+        return await self._send_async(channel="backend", **kwargs)
+
+    async def heartbeat_send_async(self, **kwargs):
+        """Send a heartbeat.
+
+        * All kwargs are passed through to the heartbeat data.
+
+        :returns: Boolean
+        """
+
+        job_id = utils.get_uuid()
+        self.log.info(
+            "Job [ %s ] sending heartbeat from [ %s ] to server",
+            job_id,
+            self.identity,
+        )
+
+        return await self.job_send_async(
+            target=self._server_identity,
+            identity=self.identity,
+            control=self.heartbeat_notice,
+            msg_id=job_id,
+            data=self.heartbeat_data(job_id=job_id, **kwargs),
+        )
+
+    async def job_check_async(self, interval=1, constant=1000):
+        """Return True if a job contains work ready.
+
+        :param interval: Exponential Interval used to determine the polling
+                         duration for a given socket.
+        :type interval: Integer
+        :param constant: Constant time used to poll for new jobs.
+        :type constant: Integer
+        :returns: Boolean
+        """
+
+        if grpc_aio is None:
+            return await super().job_check_async(
+                interval=interval, constant=constant
+            )
+
+        return await self._check_async(
+            channel="job", interval=interval, constant=constant
+        )
+
+    async def job_recv_async(self, raw=False):
+        """Receive a job message.
+
+        :param raw: Unused, message parts are always strings.
+        :type raw: Boolean
+        :returns: List
+        """
+
+        if grpc_aio is None:
+            return await super().job_recv_async(raw=raw)
+
+        return await self._recv_async(channel="job")
+
+    async def job_send_async(self, **kwargs):
+        """Send a job message.
+
+        * All kwargs are passed through to the message.
+
+        :returns: Boolean
+        """
+
+        if grpc_aio is None:
+            return await super().job_send_async(**kwargs)
+
+        return await self._send_async(channel="job", **kwargs)
+
+    def get_queue_depths(self):
+        """Return the depth of local queues held by the driver.
+
+        Only the server holds queues, the stats of every target queue are
+        returned.
+
+        :returns: Dictionary
+        """
+
+        if self.mode != "server":
+            return dict()
+
+        return {
+            "backend": MessageQueue.instance().get_stats()["queues"],
+            "job": JobQueue.instance().get_stats()["queues"],
+        }
+
     def job_close(self):
         """Close the job socket."""
         self.log.debug(
@@ -1232,12 +2282,14 @@ class Driver(drivers.BaseDriver):
         :type constant: Integer
         :returns: Object
         """
-        if self._client.job_check(self.identity):
-            return True
-        # limit checks to 5 per second and add some jitter
-        self.timeout = (
-            max(interval * (constant * 0.001), 0.5)
-            + random.randrange(0, 1000) / 10000
-        )
-        time.sleep(self.timeout)
-        return False
+        return self._check(channel="job", interval=interval, constant=constant)
+
+    def shutdown(self):
+        """Shutdown the driver.
+
+        In server mode the message service is stopped, which persists
+        undelivered items when a queue path is set.
+        """
+
+        if self._server:
+            self._server.stop()
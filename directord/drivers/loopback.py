@@ -0,0 +1,407 @@
+#   Copyright Peznauts <kevin@cloudnull.com>. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+
+import queue
+import threading
+import time
+
+from directord import drivers
+from directord import utils
+
+DRIVER_AVAILABLE = True
+
+
+def parse_args(parser, parser_server, parser_client):
+    """Add arguments for this driver to the parser.
+
+    The loopback driver connects a server and its clients running within
+    the same process, it has no options.
+
+    :param parser: Parser
+    :type parser: Object
+    :param parser_server: SubParser object
+    :type parser_server: Object
+    :param parser_client: SubParser object
+    :type parser_client: Object
+    :returns: Object
+    """
+
+    return parser
+
+
+class Exchange:
+    """In process message exchange.
+
+    The exchange holds one queue for every channel and target pair. All
+    drivers within a process share the same exchange.
+    """
+
+    _instance = None
+
+    def __init__(self):
+        """Init."""
+        raise RuntimeError("Use instance()")
+
+    def _setup(self):
+        """Setup exchange data."""
+        self._queues = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        """Get exchange instance."""
+        if cls._instance is None:
+            cls._instance = cls.__new__(cls)
+            cls._instance._setup()
+        return cls._instance
+
+    def get_queue(self, channel, target):
+        """Return the queue for a channel and target.
+
+        :param channel: Channel name, job or backend.
+        :type channel: String
+        :param target: Target identity.
+        :type target: String
+        :returns: Object
+        """
+
+        key = (channel, target)
+        with self._lock:
+            if key not in self._queues:
+                self._queues[key] = queue.Queue()
+            return self._queues[key]
+
+    def get_stats(self):
+        """Return exchange stats.
+
+        :returns: Dictionary
+        """
+
+        with self._lock:
+            return {
+                "{}/{}".format(*k): v.qsize() for k, v in self._queues.items()
+            }
+
+    def purge(self):
+        """Remove all queues from the exchange."""
+
+        with self._lock:
+            self._queues = {}
+
+
+class Driver(drivers.BaseDriver):
+    """Loopback driver.
+
+    Messages are exchanged through in process queues, this driver can only
+    connect a server to clients which run within the same process. It is
+    used to exercise the server and client logic without transport
+    overhead.
+    """
+
+    def __init__(
+        self,
+        args,
+        encrypted_traffic_data=None,
+        interface=None,
+    ):
+        """Initialize the Driver.
+
+        :param args: Arguments parsed by argparse.
+        :type args: Object
+        :param encrypted_traffic: Enable|Disable encrypted traffic.
+        :type encrypted_traffic: Boolean
+        :param interface: The interface instance (client/server)
+        :type interface: Object
+        """
+
+        # NOTE(cloudnull): Traffic never leaves the process.
+        super(Driver, self).__init__(
+            args=args,
+            encrypted_traffic_data=False,
+            interface=interface,
+        )
+        self.mode = getattr(args, "mode", None)
+        self._server_identity = "DIRECTORD_SERVER"
+        if self.mode == "server":
+            self.identity = self._server_identity
+
+        self.exchange = Exchange.instance()
+        self.timeout = 1
+
+    def _check(self, channel, interval=1, constant=1000):
+        """Return True if a channel contains work ready.
+
+        The check blocks until an item is put into the queue or the polling
+        duration expires.
+
+        :param channel: Channel name, job or backend.
+        :type channel: String
+        :param interval: Exponential Interval used to determine the polling
+                         duration for a given socket.
+        :type interval: Integer
+        :param constant: Constant time used to poll for new jobs.
+        :type constant: Integer
+        :returns: Boolean
+        """
+
+        q = self.exchange.get_queue(channel=channel, target=self.identity)
+        self.timeout = interval * (constant * 0.001)
+        start = time.monotonic()
+        with q.not_empty:
+            ready = q.not_empty.wait_for(
+                lambda: len(q.queue) > 0, timeout=self.timeout
+            )
+        self.metrics.record_poll(
+            channel=channel, duration=time.monotonic() - start, ready=ready
+        )
+        return ready
+
+    def _recv(self, channel, nonblocking=False, raw=False):
+        """Receive a message.
+
+        :param channel: Channel name, job or backend.
+        :type channel: String
+        :param nonblocking: Enable non-blocking receve, raises queue.Empty
+                            when no message is ready.
+        :type nonblocking: Boolean
+        :param raw: Return the data, stderr, and stdout parts without
+                    decoding bytes.
+        :type raw: Boolean
+        :returns: Tuple
+        """
+
+        q = self.exchange.get_queue(channel=channel, target=self.identity)
+        item = q.get(block=not nonblocking)
+        self.metrics.record_recv(channel=channel, control=item[2], parts=item)
+        identity, *message = item
+        message = [
+            i if raw and idx in (3, 5, 6) else self._decoder(i)
+            for idx, i in enumerate(message)
+        ]
+        if self.mode == "server":
+            message.insert(0, identity)
+        return tuple(message)
+
+    @staticmethod
+    def _decoder(item):
+        """Return a message part as a string.
+
+        :param item: Message part.
+        :type item: String|Bytes
+        :returns: String
+        """
+
+        try:
+            return item.decode()
+        except AttributeError:
+            return item
+
+    def _send(
+        self,
+        channel,
+        identity=None,
+        msg_id=None,
+        control=None,
+        command=None,
+        data=None,
+        info=None,
+        stderr=None,
+        stdout=None,
+        nonblocking=False,
+    ):
+        """Send a message.
+
+        Messages without an identity are sent to the server, empty message
+        parts are replaced with a null byte.
+
+        :param channel: Channel name, job or backend.
+        :type channel: String
+        :param identity: Target where message will be sent.
+        :type identity: String
+        :param msg_id: ID information for a given message. If no ID is
+                       provided a UUID will be generated.
+        :type msg_id: String
+        :param control: ASCII control charaters.
+        :type control: String
+        :param command: Command definition for a given message.
+        :type command: String
+        :param data: Encoded data that will be transmitted.
+        :type data: String
+        :param info: Encoded information that will be transmitted.
+        :type info: String
+        :param stderr: Encoded error information from a command.
+        :type stderr: String
+        :param stdout: Encoded output information from a command.
+        :type stdout: String
+        :param nonblocking: Unused, sends never block.
+        :type nonblocking: Boolean
+        :returns: Boolean
+        """
+
+        if identity:
+            target = identity
+        else:
+            target = self._server_identity
+
+        message = [
+            self.identity,
+            msg_id or utils.get_uuid(),
+            control or self.nullbyte,
+            command or self.nullbyte,
+            data or self.nullbyte,
+            info or self.nullbyte,
+            stderr or self.nullbyte,
+            stdout or self.nullbyte,
+        ]
+        self.exchange.get_queue(channel=channel, target=target).put(message)
+        self.metrics.record_send(
+            channel=channel, control=control, parts=message
+        )
+        return True
+
+    def get_queue_depths(self):
+        """Return the depth of every queue within the exchange.
+
+        :returns: Dictionary
+        """
+
+        return self.exchange.get_stats()
+
+    def backend_check(self, interval=1, constant=1000):
+        """Return True if the backend contains work ready.
+
+        :param interval: Exponential Interval used to determine the polling
+                         duration for a given socket.
+        :type interval: Integer
+        :param constant: Constant time used to poll for new jobs.
+        :type constant: Integer
+        :returns: Boolean
+        """
+
+        return self._check(
+            channel="backend", interval=interval, constant=constant
+        )
+
+    def backend_recv(self, nonblocking=False, raw=False):
+        """Receive a transfer message.
+
+        :param nonblocking: Enable non-blocking receve.
+        :type nonblocking: Boolean
+        :param raw: Return the data, stderr, and stdout parts without
+                    decoding bytes.
+        :type raw: Boolean
+        :returns: Tuple
+        """
+
+        return self._recv(channel="backend", nonblocking=nonblocking, raw=raw)
+
+    def backend_send(self, *args, **kwargs):
+        """Send a transfer message.
+
+        * All args and kwargs are passed through to the send.
+
+        :returns: Boolean
+        """
+
+        return self._send("backend", *args, **kwargs)
+
+    def heartbeat_send(
+        self,
+        host_uptime=None,
+        agent_uptime=None,
+        version=None,
+        driver=None,
+        max_inflight_jobs=None,
+        slots=None,
+        compression=None,
+        encoding=None,
+    ):
+        """Send a heartbeat.
+
+        :param host_uptime: Sender uptime
+        :type host_uptime: String
+        :param agent_uptime: Sender agent uptime
+        :type agent_uptime: String
+        :param version: Sender directord version
+        :type version: String
+        :param version: Driver information
+        :type version: String
+        :param max_inflight_jobs: Maximum number of in-flight jobs.
+        :type max_inflight_jobs: Integer
+        :param slots: Number of available in-flight job slots.
+        :type slots: Integer
+        :param compression: Compression algorithm the sender can decode.
+        :type compression: String
+        :param encoding: Payload encoding the sender can decode.
+        :type encoding: String
+        """
+
+        job_id = utils.get_uuid()
+        self.log.info(
+            "Job [ %s ] sending heartbeat from [ %s ] to server",
+            job_id,
+            self.identity,
+        )
+
+        return self.job_send(
+            control=self.heartbeat_notice,
+            msg_id=job_id,
+            data=self.heartbeat_data(
+                job_id=job_id,
+                host_uptime=host_uptime,
+                agent_uptime=agent_uptime,
+                version=version,
+                driver=driver,
+                max_inflight_jobs=max_inflight_jobs,
+                slots=slots,
+                compression=compression,
+                encoding=encoding,
+            ),
+        )
+
+    def job_check(self, interval=1, constant=1000):
+        """Return True if a job contains work ready.
+
+        :param interval: Exponential Interval used to determine the polling
+                         duration for a given socket.
+        :type interval: Integer
+        :param constant: Constant time used to poll for new jobs.
+        :type constant: Integer
+        :returns: Boolean
+        """
+
+        return self._check(channel="job", interval=interval, constant=constant)
+
+    def job_recv(self, nonblocking=False, raw=False):
+        """Receive a job message.
+
+        :param nonblocking: Enable non-blocking receve.
+        :type nonblocking: Boolean
+        :param raw: Return the data, stderr, and stdout parts without
+                    decoding bytes.
+        :type raw: Boolean
+        :returns: Tuple
+        """
+
+        return self._recv(channel="job", nonblocking=nonblocking, raw=raw)
+
+    def job_send(self, *args, **kwargs):
+        """Send a job message.
+
+        * All args and kwargs are passed through to the send.
+
+        :returns: Boolean
+        """
+
+        return self._send("job", *args, **kwargs)
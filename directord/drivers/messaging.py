@@ -12,12 +12,10 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 
-from distutils.util import strtobool
-import json
 import logging
-import os
 import pkg_resources
 import queue
+import threading
 import time
 
 try:
@@ -44,79 +42,6 @@ from directord import logger
 from directord import utils
 
 
-def parse_args(parser, parser_server, parser_client):
-    """Add arguments for this driver to the parser.
-
-    :param parser: Parser
-    :type parser: Object
-    :param parser_server: SubParser object
-    :type parser_server: Object
-    :param parser_client: SubParser object
-    :type parser_client: Object
-    :returns: Object
-    """
-
-    messaging_group = parser.add_argument_group("Messaging driver options")
-    messaging_group.add_argument(
-        "--messaging-ssl",
-        help=("Enable messaging driver SSL encryption. Default: %(default)s"),
-        metavar="BOOLEAN",
-        default=bool(strtobool(os.getenv("DIRECTORD_MESSAGING_SSL", "True"))),
-        type=bool,
-    )
-    messaging_group.add_argument(
-        "--messaging-ssl-ca",
-        help=("Messaging driver SSL CA file path. Default: %(default)s"),
-        metavar="STRING",
-        default=str(
-            os.getenv(
-                "DIRECTORD_MESSAGING_SSL_CA",
-                "/etc/pki/ca-trust/source/anchors/cm-local-ca.pem",
-            )
-        ),
-        type=str,
-    )
-    messaging_group.add_argument(
-        "--messaging-ssl-cert",
-        help=(
-            "Messaging driver SSL certificate file path. "
-            "Default: %(default)s"
-        ),
-        metavar="STRING",
-        default=str(
-            os.getenv(
-                "DIRECTORD_MESSAGING_SSL_CERT",
-                "/etc/directord/messaging/ssl/directord.crt",
-            )
-        ),
-        type=str,
-    )
-    messaging_group.add_argument(
-        "--messaging-ssl-key",
-        help=("Messaging driver SSL key file path. Default: %(default)s"),
-        metavar="STRING",
-        default=str(
-            os.getenv(
-                "DIRECTORD_MESSAGING_SSL_KEY",
-                "/etc/directord/messaging/ssl/directord.key",
-            )
-        ),
-        type=str,
-    )
-    messaging_group.add_argument(
-        "--messaging-address",
-        help=(
-            "IP address or hostname of messaging server (router/broker)."
-            " Default: %(default)s"
-        ),
-        metavar="STRING",
-        default=str(os.getenv("DIRECTORD_MESSAGING_ADDRESS", "127.0.0.1")),
-        type=str,
-    )
-
-    return parser
-
-
 class Driver(drivers.BaseDriver):
     def __init__(
         self,
@@ -155,6 +80,8 @@ class Driver(drivers.BaseDriver):
         self.send_q = queue.Queue()
         self.process_send_q = None
         self.timeout = 1
+        self._rpc_clients = dict()
+        self._rpc_clients_lock = threading.Lock()
 
     def _rpc_conf(self):
         """Initialize the RPC configuration.
@@ -203,6 +130,9 @@ class Driver(drivers.BaseDriver):
     def _check(self, queue, interval=1, constant=1000):
         """Return True if a job contains work ready.
 
+        The check blocks until an item is put into the queue or the polling
+        duration expires, so work is returned as soon as it arrives.
+
         :param queue: Queueing object.
         :type queue: Object
         :param interval: Exponential Interval used to determine the polling
@@ -214,11 +144,49 @@ class Driver(drivers.BaseDriver):
         """
 
         self.timeout = interval * (constant * 0.001)
-        if queue.empty():
-            time.sleep(self.timeout)
-            return False
+        # NOTE(cloudnull): The not_empty condition is notified on every put,
+        #                  waiting on it does not remove the item from the
+        #                  queue.
+        start = time.monotonic()
+        with queue.not_empty:
+            ready = queue.not_empty.wait_for(
+                lambda: len(queue.queue) > 0, timeout=self.timeout
+            )
+        self.metrics.record_poll(
+            channel=self._queue_channel(queue),
+            duration=time.monotonic() - start,
+            ready=ready,
+        )
+        return ready
+
+    def _queue_channel(self, queue):
+        """Return the channel name of a local queue.
+
+        :param queue: Queueing object.
+        :type queue: Object
+        :returns: String
+        """
+
+        if queue is self.backend_q:
+            return "backend"
         else:
-            return True
+            return "job"
+
+    def _recv(self, queue):
+        """Return a message from a local queue.
+
+        :param queue: Queueing object.
+        :type queue: Object
+        :returns: List
+        """
+
+        message = queue.get()
+        self.metrics.record_recv(
+            channel=self._queue_channel(queue),
+            control=message[-6],
+            parts=message,
+        )
+        return message
 
     @expose
     def _heartbeat(self, *args, **kwargs):
@@ -403,6 +371,7 @@ class Driver(drivers.BaseDriver):
         info=None,
         stderr=None,
         stdout=None,
+        cast=False,
     ):
         """Send a job message.
 
@@ -426,6 +395,8 @@ class Driver(drivers.BaseDriver):
         :type stderr: String
         :param stdout: Job stdout output
         :type stdout: String
+        :param cast: Send without waiting for a reply.
+        :type cast: Boolean
         """
 
         if not identity:
@@ -453,8 +424,36 @@ class Driver(drivers.BaseDriver):
             info=info,
             stderr=stderr,
             stdout=stdout,
+            cast=cast,
         )
 
+    def _rpc_client(self, topic, server):
+        """Returns a cached rpc client object.
+
+        Clients are created once for every topic and server pair and reused
+        for all subsequent sends.
+
+        :param topic: Messaging topic
+        :type topic: String
+        :param server: Server name
+        :type server: String
+        :returns: Object
+        """
+
+        key = (topic, server)
+        with self._rpc_clients_lock:
+            client = self._rpc_clients.get(key)
+            if not client:
+                if server:
+                    target = oslo_messaging.Target(topic=topic, server=server)
+                else:
+                    target = oslo_messaging.Target(topic=topic)
+
+                client = self._rpc_clients[key] = oslo_messaging.RPCClient(
+                    self.transport, target, timeout=2, retry=3
+                )
+        return client
+
     def _rpc_transport(self):
         """Returns an rpc transport.
 
@@ -487,42 +486,69 @@ class Driver(drivers.BaseDriver):
     @tenacity.retry(
         retry=tenacity.retry_if_exception_type(Exception),
         wait=tenacity.wait_fixed(1),
-        before_sleep=tenacity.before_sleep_log(
+        before_sleep=drivers.before_sleep_log(
             logger.getLogger(name="directord"), logging.WARN
         ),
     )
-    def _send(self, method, topic, server="directord", **kwargs):
+    def _send(self, method, topic, server="directord", cast=False, **kwargs):
         """Send a message.
 
+        When cast is enabled the message is sent without waiting for a
+        reply, otherwise the send blocks until the receiver acknowledges it.
+        A client which fails to send is discarded so the retry uses a new
+        client.
+
         :param method: Send method type
         :type method: String
         :param topic: Messaging topic
         :type topic: String
         :param method: Server name
         :type method: String
+        :param cast: Send without waiting for a reply.
+        :type cast: Boolean
         :param kwargs: Extra named arguments
         :type kwargs: Dictionary
         :returns: Object
         """
 
-        if server:
-            target = oslo_messaging.Target(topic=topic, server=server)
-        else:
-            target = oslo_messaging.Target(topic=topic)
-
-        client = oslo_messaging.RPCClient(
-            self.transport, target, timeout=2, retry=3
-        )
+        client = self._rpc_client(topic=topic, server=server)
 
+        start = time.monotonic()
         try:
-            return client.call({}, method, **kwargs)
+            if cast:
+                sent = client.cast({}, method, **kwargs)
+            else:
+                sent = client.call({}, method, **kwargs)
         except Exception as e:
+            self.metrics.record_failure()
             self.log.warn(
                 "Failed to send message using topic [ %s ] to server [ %s ]",
                 topic,
                 server,
             )
+            with self._rpc_clients_lock:
+                self._rpc_clients.pop((topic, server), None)
             raise e
+        else:
+            self.metrics.record_send(
+                channel="backend" if method == "_backend" else "job",
+                control=kwargs.get("control"),
+                parts=[
+                    kwargs.get(i)
+                    for i in [
+                        "identity",
+                        "job_id",
+                        "control",
+                        "command",
+                        "data",
+                        "info",
+                        "stderr",
+                        "stdout",
+                    ]
+                ],
+                duration=time.monotonic() - start,
+            )
+            return sent
 
     def backend_check(self, interval=1, constant=1000):
         """Return True if the backend contains work ready.
@@ -559,10 +585,14 @@ class Driver(drivers.BaseDriver):
             " so nothing to start"
         )
 
-    def backend_recv(self):
-        """Receive a message."""
+    def backend_recv(self, raw=False):
+        """Receive a message.
+
+        :param raw: Unused, message parts are always strings.
+        :type raw: Boolean
+        """
 
-        return self.backend_q.get()
+        return self._recv(queue=self.backend_q)
 
     def backend_send(
         self,
@@ -609,7 +639,15 @@ class Driver(drivers.BaseDriver):
         )
 
     def heartbeat_send(
-        self, host_uptime=None, agent_uptime=None, version=None, driver=None
+        self,
+        host_uptime=None,
+        agent_uptime=None,
+        version=None,
+        driver=None,
+        max_inflight_jobs=None,
+        slots=None,
+        compression=None,
+        encoding=None,
     ):
         """Send a heartbeat.
 
@@ -621,6 +659,14 @@ class Driver(drivers.BaseDriver):
         :type version: String
         :param version: Driver information
         :type version: String
+        :param max_inflight_jobs: Maximum number of in-flight jobs.
+        :type max_inflight_jobs: Integer
+        :param slots: Number of available in-flight job slots.
+        :type slots: Integer
+        :param compression: Compression algorithm the sender can decode.
+        :type compression: String
+        :param encoding: Payload encoding the sender can decode.
+        :type encoding: String
         """
 
         job_id = utils.get_uuid()
@@ -632,17 +678,19 @@ class Driver(drivers.BaseDriver):
         return self._process_send(
             method="_heartbeat",
             topic="directord",
+            cast=True,
             msg_id=job_id,
             control=self.heartbeat_notice,
-            data=json.dumps(
-                {
-                    "job_id": job_id,
-                    "version": version,
-                    "host_uptime": host_uptime,
-                    "agent_uptime": agent_uptime,
-                    "machine_id": self.machine_id,
-                    "driver": driver,
-                }
+            data=self.heartbeat_data(
+                job_id=job_id,
+                host_uptime=host_uptime,
+                agent_uptime=agent_uptime,
+                version=version,
+                driver=driver,
+                max_inflight_jobs=max_inflight_jobs,
+                slots=slots,
+                compression=compression,
+                encoding=encoding,
             ),
         )
 
@@ -661,6 +709,14 @@ class Driver(drivers.BaseDriver):
             queue=self.job_q, interval=interval, constant=constant
         )
 
+    def get_queue_depths(self):
+        """Return the depth of local queues held by the driver.
+
+        :returns: Dictionary
+        """
+
+        return {"job": self.job_q.qsize(), "backend": self.backend_q.qsize()}
+
     def job_close(self):
         """Stop the server mode."""
 
@@ -676,10 +732,14 @@ class Driver(drivers.BaseDriver):
 
         self._init_rpc_servers()
 
-    def job_recv(self):
-        """Receive a message."""
+    def job_recv(self, raw=False):
+        """Receive a message.
+
+        :param raw: Unused, message parts are always strings.
+        :type raw: Boolean
+        """
 
-        return self.job_q.get()
+        return self._recv(queue=self.job_q)
 
     def job_send(
         self,
@@ -712,9 +772,12 @@ class Driver(drivers.BaseDriver):
         :type stdout: String
         """
 
+        # NOTE(cloudnull): Jobs sent to a client wait for an acknowledgement,
+        #                  status messages sent to the server are cast.
         self._process_send(
             method="_job",
             topic="directord",
+            cast=not identity,
             identity=identity,
             msg_id=msg_id,
             control=control,
@@ -12,7 +12,6 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 
-import json
 import logging
 import multiprocessing
 from multiprocessing import queues as mqs
@@ -23,6 +22,7 @@ import tenacity
 
 try:
     import zmq
+    import zmq.asyncio
     import zmq.auth as zmq_auth
     from zmq.auth.thread import ThreadAuthenticator
 
@@ -36,75 +36,6 @@ from directord import logger
 from directord import utils
 
 
-def parse_args(parser, parser_server, parser_client):
-    """Add arguments for this driver to the parser.
-
-    :param parser: Parser
-    :type parser: Object
-    :param parser_server: SubParser object
-    :type parser_server: Object
-    :param parser_client: SubParser object
-    :type parser_client: Object
-    :returns: Object
-    """
-
-    group = parser.add_argument_group("ZeroMQ driver options")
-    group.add_argument(
-        "--zmq-highwater-mark",
-        type=int,
-        default=int(os.getenv("DIRECTORD_ZMQ_HIGHWATER_MARK", 1024)),
-        metavar="INTEGER",
-        help=("Set the ZeroMQ highwater mark. Default %(default)s."),
-    )
-    server_group = parser_server.add_argument_group(
-        "ZeroMQ Server driver options"
-    )
-    server_group.add_argument(
-        "--zmq-generate-keys",
-        action="store_true",
-        help="Generate encryption keys for Curve authentication.",
-    )
-    server_group.add_argument(
-        "--zmq-bind-address",
-        help=(
-            "ZeroMQ IP Address to bind a Directord Server."
-            " Default: %(default)s"
-        ),
-        metavar="STRING",
-        default=os.getenv("DIRECTORD_ZMQ_BIND_ADDRESS", "*"),
-    )
-    client_group = parser_client.add_argument_group(
-        "ZeroMQ Client driver options"
-    )
-    client_group.add_argument(
-        "--zmq-server-address",
-        help=(
-            "ZeroMQ Domain or IP address of the Directord server."
-            " Default: %(default)s"
-        ),
-        metavar="STRING",
-        default=os.getenv("DIRECTORD_ZMQ_SERVER_ADDRESS", "127.0.0.1"),
-    )
-    auth_group = group.add_mutually_exclusive_group()
-    auth_group.add_argument(
-        "--zmq-shared-key",
-        help="Shared key used for server client authentication.",
-        metavar="STRING",
-        default=os.getenv("DIRECTORD_ZMQ_SHARED_KEY", None),
-    )
-    auth_group.add_argument(
-        "--zmq-curve-encryption",
-        action="store_true",
-        help=(
-            "Server and client will connect using Curve authentication"
-            " and encryption. Enabling this option assumes keys have been"
-            " generated. see `--zmq-generate-keys` under `server` for more."
-        ),
-    )
-
-    return parser
-
-
 class _FlushQueue(mqs.Queue, iodict.FlushQueue):
     """Flush queue capability helper class."""
 
@@ -180,6 +111,7 @@ class Driver(drivers.BaseDriver):
         )
         self.bind_job = None
         self.bind_backend = None
+        self._async_sockets = dict()
         self.hwm = getattr(self.args, "zmq_highwater_mark", 1024)
 
     def __copy__(self):
@@ -243,11 +175,28 @@ class Driver(drivers.BaseDriver):
         :returns: Object
         """
 
+        start = time.monotonic()
         socks = dict(self.poller.poll(interval * constant))
-        if socks.get(bind) == zmq.POLLIN:
-            return True
+        ready = socks.get(bind) == zmq.POLLIN
+        self.metrics.record_poll(
+            channel=self._socket_channel(bind),
+            duration=time.monotonic() - start,
+            ready=ready,
+        )
+        return ready
+
+    def _socket_channel(self, socket):
+        """Return the channel name of a socket.
+
+        :param socket: ZeroMQ socket object.
+        :type socket: Object
+        :returns: String
+        """
+
+        if socket is not None and socket is self.bind_backend:
+            return "backend"
         else:
-            return False
+            return "job"
 
     def _close(self, socket):
         if socket is None:
@@ -568,7 +517,7 @@ class Driver(drivers.BaseDriver):
         return bind
 
     @staticmethod
-    def _socket_recv(socket, nonblocking=False):
+    def _socket_recv(socket, nonblocking=False, copy=True):
         """Receive a message over a ZM0 socket.
 
         The message specification for server is as follows.
@@ -606,6 +555,9 @@ class Driver(drivers.BaseDriver):
         :type socket: Object
         :param nonblocking: Enable non-blocking receve.
         :type nonblocking: Boolean
+        :param copy: When disabled, message parts are returned as frames
+                     which reference the receive buffer.
+        :type copy: Boolean
         """
 
         if nonblocking:
@@ -613,12 +565,12 @@ class Driver(drivers.BaseDriver):
         else:
             flags = 0
 
-        return socket.recv_multipart(flags=flags)
+        return socket.recv_multipart(flags=flags, copy=copy)
 
     @tenacity.retry(
         retry=tenacity.retry_if_exception_type(Exception),
         wait=tenacity.wait_fixed(5),
-        before_sleep=tenacity.before_sleep_log(
+        before_sleep=drivers.before_sleep_log(
             logger.getLogger(name="directord"), logging.WARN
         ),
     )
@@ -692,6 +644,78 @@ class Driver(drivers.BaseDriver):
         :returns: Object
         """
 
+        message_parts = self._message_parts(
+            identity=identity,
+            msg_id=msg_id,
+            control=control,
+            command=command,
+            data=data,
+            info=info,
+            stderr=stderr,
+            stdout=stdout,
+        )
+
+        if nonblocking:
+            flags = zmq.NOBLOCK
+        else:
+            flags = 0
+
+        # NOTE(cloudnull): Sending without copy allows large parts to be
+        #                  handed to ZeroMQ by reference, parts smaller than
+        #                  the socket copy threshold are still copied.
+        start = time.monotonic()
+        try:
+            sent = socket.send_multipart(
+                message_parts, flags=flags, copy=False
+            )
+        except Exception as e:
+            self.metrics.record_failure()
+            self.log.warn("Failed to send message to [ %s ]", identity)
+            raise e
+        else:
+            self.metrics.record_send(
+                channel=self._socket_channel(socket),
+                control=control,
+                parts=message_parts,
+                duration=time.monotonic() - start,
+            )
+            return sent
+
+    def _message_parts(
+        self,
+        identity=None,
+        msg_id=None,
+        control=None,
+        command=None,
+        data=None,
+        info=None,
+        stderr=None,
+        stdout=None,
+    ):
+        """Return the byte encoded parts of a message.
+
+        Empty message parts are replaced with a null byte, if no message ID
+        is provided a UUID will be generated.
+
+        :param identity: Target where message will be sent.
+        :type identity: Bytes
+        :param msg_id: ID information for a given message.
+        :type msg_id: Bytes
+        :param control: ASCII control charaters.
+        :type control: Bytes
+        :param command: Command definition for a given message.
+        :type command: Bytes
+        :param data: Encoded data that will be transmitted.
+        :type data: Bytes
+        :param info: Encoded information that will be transmitted.
+        :type info: Bytes
+        :param stderr: Encoded error information from a command.
+        :type stderr: Bytes
+        :param stdout: Encoded output information from a command.
+        :type stdout: Bytes
+        :returns: List
+        """
+
         def _encoder(item):
             try:
                 return item.encode()
@@ -724,41 +748,110 @@ class Driver(drivers.BaseDriver):
         if identity:
             message_parts.insert(0, identity)
 
-        message_parts = [_encoder(i) for i in message_parts]
+        return [_encoder(i) for i in message_parts]
 
-        if nonblocking:
-            flags = zmq.NOBLOCK
-        else:
-            flags = 0
-
-        try:
-            return socket.send_multipart(message_parts, flags=flags)
-        except Exception as e:
-            self.log.warn("Failed to send message to [ %s ]", identity)
-            raise e
-
-    def _recv(self, socket, nonblocking=False):
+    def _recv(self, socket, nonblocking=False, raw=False):
         """Receive message.
 
+        Message parts are copied and decoded. When raw is enabled the
+        message is received without copying and the data, stderr, and
+        stdout parts are returned without being decoded.
+
         :param socket: ZeroMQ socket object.
         :type socket: Object
         :param nonblocking: Enable non-blocking receve.
         :type nonblocking: Boolean
+        :param raw: Return bulk parts without decoding.
+        :type raw: Boolean
+        :returns: Tuple
+        """
+
+        recv_obj = self._socket_recv(
+            socket=socket, nonblocking=nonblocking, copy=not raw
+        )
+        return self._message_decode(socket=socket, recv_obj=recv_obj, raw=raw)
+
+    @staticmethod
+    def _frame_part(frame, bulk=False, copy_threshold=0):
+        """Return a part of a message received without copying.
+
+        Bulk parts at or above the copy threshold are returned as read-only
+        memoryviews of the receive buffer, smaller bulk parts are copied to
+        bytes so the frame can be released. All other parts are decoded.
+
+        :param frame: Received message frame.
+        :type frame: Object
+        :param bulk: Return the part without decoding.
+        :type bulk: Boolean
+        :param copy_threshold: Size, in bytes, below which bulk parts are
+                               copied.
+        :type copy_threshold: Integer
+        :returns: String|Bytes|Memoryview
+        """
+
+        if not bulk:
+            return str(frame.buffer, "utf-8")
+        elif len(frame) < copy_threshold:
+            return frame.bytes
+        return frame.buffer
+
+    def _message_decode(self, socket, recv_obj, raw=False):
+        """Return the decoded parts of a received message.
+
+        When raw is enabled the message frames must have been received
+        without copying.
+
+        :param socket: ZeroMQ socket object the message was received on.
+        :type socket: Object
+        :param recv_obj: Received message parts or frames.
+        :type recv_obj: List
+        :param raw: Return bulk parts without decoding.
+        :type raw: Boolean
         :returns: Tuple
         """
 
-        recv_obj = self._socket_recv(socket=socket, nonblocking=nonblocking)
-        return tuple([i.decode() for i in recv_obj])
+        # NOTE(cloudnull): The data, info, stderr, and stdout parts are
+        #                  always the last four parts of a message, only
+        #                  info is decoded when raw is enabled.
+        count = len(recv_obj)
+        if raw:
+            bulk_parts = (count - 4, count - 2, count - 1)
+            copy_threshold = getattr(
+                socket, "copy_threshold", zmq.COPY_THRESHOLD
+            )
+            message = tuple(
+                [
+                    self._frame_part(
+                        frame=i,
+                        bulk=idx in bulk_parts,
+                        copy_threshold=copy_threshold,
+                    )
+                    for idx, i in enumerate(recv_obj)
+                ]
+            )
+        else:
+            message = tuple([str(i, "utf-8") for i in recv_obj])
+        self.metrics.record_recv(
+            channel=self._socket_channel(socket),
+            control=message[count - 6],
+            parts=recv_obj,
+        )
+        return message
 
-    def backend_recv(self, nonblocking=False):
+    def backend_recv(self, nonblocking=False, raw=False):
         """Receive a transfer message.
 
         :param nonblocking: Enable non-blocking receve.
         :type nonblocking: Boolean
+        :param raw: Return the data, stderr, and stdout parts as bytes-like
+                    objects.
+        :type raw: Boolean
         :returns: Tuple
         """
 
-        return self._recv(socket=self.bind_backend, nonblocking=nonblocking)
+        return self._recv(
+            socket=self.bind_backend, nonblocking=nonblocking, raw=raw
+        )
 
     def backend_init(self):
         """Initialize the backend socket.
@@ -814,7 +907,15 @@ class Driver(drivers.BaseDriver):
         return multiprocessing.Lock()
 
     def heartbeat_send(
-        self, host_uptime=None, agent_uptime=None, version=None, driver=None
+        self,
+        host_uptime=None,
+        agent_uptime=None,
+        version=None,
+        driver=None,
+        max_inflight_jobs=None,
+        slots=None,
+        compression=None,
+        encoding=None,
     ):
         """Send a heartbeat.
 
@@ -826,6 +927,14 @@ class Driver(drivers.BaseDriver):
         :type version: String
         :param version: Driver information
         :type version: String
+        :param max_inflight_jobs: Maximum number of in-flight jobs.
+        :type max_inflight_jobs: Integer
+        :param slots: Number of available in-flight job slots.
+        :type slots: Integer
+        :param compression: Compression algorithm the sender can decode.
+        :type compression: String
+        :param encoding: Payload encoding the sender can decode.
+        :type encoding: String
         """
 
         job_id = utils.get_uuid()
@@ -838,15 +947,16 @@ class Driver(drivers.BaseDriver):
         return self.job_send(
             control=self.heartbeat_notice,
             msg_id=job_id,
-            data=json.dumps(
-                {
-                    "job_id": job_id,
-                    "version": version,
-                    "host_uptime": host_uptime,
-                    "agent_uptime": agent_uptime,
-                    "machine_id": self.machine_id,
-                    "driver": driver,
-                }
+            data=self.heartbeat_data(
+                job_id=job_id,
+                host_uptime=host_uptime,
+                agent_uptime=agent_uptime,
+                version=version,
+                driver=driver,
+                max_inflight_jobs=max_inflight_jobs,
+                slots=slots,
+                compression=compression,
+                encoding=encoding,
             ),
         )
 
@@ -861,15 +971,20 @@ class Driver(drivers.BaseDriver):
         kwargs["socket"] = self.bind_job
         return self._socket_send(*args, **kwargs)
 
-    def job_recv(self, nonblocking=False):
+    def job_recv(self, nonblocking=False, raw=False):
         """Receive a transfer message.
 
         :param nonblocking: Enable non-blocking receve.
         :type nonblocking: Boolean
+        :param raw: Return the data, stderr, and stdout parts as bytes-like
+                    objects.
+        :type raw: Boolean
         :returns: Tuple
         """
 
-        return self._recv(socket=self.bind_job, nonblocking=nonblocking)
+        return self._recv(
+            socket=self.bind_job, nonblocking=nonblocking, raw=raw
+        )
 
     def job_init(self):
         """Initialize the job socket.
@@ -907,6 +1022,196 @@ class Driver(drivers.BaseDriver):
             bind=self.bind_job, interval=interval, constant=constant
         )
 
+    def _async_socket(self, socket):
+        """Return an asyncio socket which shadows a socket.
+
+        The shadow socket shares the underlying ZeroMQ socket, a socket
+        must only be used from the event loop once it is shadowed.
+
+        :param socket: ZeroMQ socket object.
+        :type socket: Object
+        :returns: Object
+        """
+
+        async_socket = self._async_sockets.get(socket)
+        if async_socket is None:
+            async_socket = zmq.asyncio.Socket.from_socket(socket)
+            self._async_sockets[socket] = async_socket
+        return async_socket
+
+    async def _bind_check_async(self, bind, interval=1, constant=1000):
+        """Return True if a bind type contains work ready.
+
+        :param bind: A given Socket bind to identify.
+        :type bind: Object
+        :param interval: Exponential Interval used to determine the polling
+                         duration for a given socket.
+        :type interval: Integer
+        :param constant: Constant time used to poll for new jobs.
+        :type constant: Integer
+        :returns: Boolean
+        """
+
+        start = time.monotonic()
+        events = await self._async_socket(bind).poll(
+            timeout=interval * constant, flags=zmq.POLLIN
+        )
+        ready = bool(events & zmq.POLLIN)
+        self.metrics.record_poll(
+            channel=self._socket_channel(bind),
+            duration=time.monotonic() - start,
+            ready=ready,
+        )
+        return ready
+
+    async def _recv_async(self, socket, raw=False):
+        """Receive message.
+
+        :param socket: ZeroMQ socket object.
+        :type socket: Object
+        :param raw: Return bulk parts without decoding.
+        :type raw: Boolean
+        :returns: Tuple
+        """
+
+        recv_obj = await self._async_socket(socket).recv_multipart(
+            copy=not raw
+        )
+        return self._message_decode(socket=socket, recv_obj=recv_obj, raw=raw)
+
+    @tenacity.retry(
+        retry=tenacity.retry_if_exception_type(Exception),
+        wait=tenacity.wait_fixed(5),
+        before_sleep=drivers.before_sleep_log(
+            logger.getLogger(name="directord"), logging.WARN
+        ),
+    )
+    async def _socket_send_async(self, socket, **kwargs):
+        """Send a message over a ZM0 socket.
+
+        * All kwargs are passed through to the message parts.
+
+        :param socket: ZeroMQ socket object.
+        :type socket: Object
+        :returns: Object
+        """
+
+        message_parts = self._message_parts(**kwargs)
+        start = time.monotonic()
+        try:
+            sent = await self._async_socket(socket).send_multipart(
+                message_parts, copy=False
+            )
+        except Exception as e:
+            self.metrics.record_failure()
+            self.log.warn(
+                "Failed to send message to [ %s ]", kwargs.get("identity")
+            )
+            raise e
+        else:
+            self.metrics.record_send(
+                channel=self._socket_channel(socket),
+                control=kwargs.get("control"),
+                parts=message_parts,
+                duration=time.monotonic() - start,
+            )
+            return sent
+
+    async def backend_check_async(self, interval=1, constant=1000):
+        """Return True if the backend contains work ready.
+
+        :param interval: Exponential Interval used to determine the polling
+                         duration for a given socket.
+        :type interval: Integer
+        :param constant: Constant time used to poll for new jobs.
+        :type constant: Integer
+        :returns: Boolean
+        """
+
+        return await self._bind_check_async(
+            bind=self.bind_backend, interval=interval, constant=constant
+        )
+
+    async def backend_recv_async(self, raw=False):
+        """Receive a transfer message.
+
+        :param raw: Return the data, stderr, and stdout parts as bytes-like
+                    objects.
+        :type raw: Boolean
+        :returns: Tuple
+        """
+
+        return await self._recv_async(socket=self.bind_backend, raw=raw)
+
+    async def backend_send_async(self, **kwargs):
+        """Send a transfer message.
+
+        * All kwargs are passed through to the socket send.
+
+        :returns: Object
+        """
+
+        return await self._socket_send_async(
+            socket=self.bind_backend, **kwargs
+        )
+
+    async def heartbeat_send_async(self, **kwargs):
+        """Send a heartbeat.
+
+        * All kwargs are passed through to the heartbeat data.
+
+        :returns: Object
+        """
+
+        job_id = utils.get_uuid()
+        self.log.info(
+            "Job [ %s ] sending heartbeat from [ %s ] to server",
+            job_id,
+            self.identity,
+        )
+
+        return await self.job_send_async(
+            control=self.heartbeat_notice,
+            msg_id=job_id,
+            data=self.heartbeat_data(job_id=job_id, **kwargs),
+        )
+
+    async def job_check_async(self, interval=1, constant=1000):
+        """Return True if a job contains work ready.
+
+        :param interval: Exponential Interval used to determine the polling
+                         duration for a given socket.
+        :type interval: Integer
+        :param constant: Constant time used to poll for new jobs.
+        :type constant: Integer
+        :returns: Boolean
+        """
+
+        return await self._bind_check_async(
+            bind=self.bind_job, interval=interval, constant=constant
+        )
+
+    async def job_recv_async(self, raw=False):
+        """Receive a job message.
+
+        :param raw: Return the data, stderr, and stdout parts as bytes-like
+                    objects.
+        :type raw: Boolean
+        :returns: Tuple
+        """
+
+        return await self._recv_async(socket=self.bind_job, raw=raw)
+
+    async def job_send_async(self, **kwargs):
+        """Send a job message.
+
+        * All kwargs are passed through to the socket send.
+
+        :returns: Object
+        """
+
+        return await self._socket_send_async(socket=self.bind_job, **kwargs)
+
     def shutdown(self):
         """Shutdown the driver."""
 
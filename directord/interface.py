@@ -29,6 +29,7 @@ class Interface(directord.Processor):
     """
 
     uuid = utils.get_uuid()
+    load_driver = True
 
     def __init__(self, args):
         """Initialize the interface class.
@@ -58,19 +59,26 @@ class Interface(directord.Processor):
         self.keys_exist = os.path.exists(
             self.public_keys_dir
         ) and os.path.exists(self.secret_keys_dir)
-        try:
-            self.driver = self._load_driver(driver=self.args.driver)
-        except AttributeError as e:
-            self.log.warning(
-                "Falling back with dummy driver due error [ %s ] in driver"
-                " [ %s ]. Check the driver CLI arguments, the configuration"
-                " file [ %s ] contents, and ensure all dependencies are"
-                " installed.",
-                str(e),
-                self.args.driver,
-                self.args.config_file,
-            )
+        # NOTE(cloudnull): Interfaces which only interact with the server
+        #                  over the local socket use the dummy driver, which
+        #                  provides the message control characters without
+        #                  importing the driver libraries.
+        if not self.load_driver:
             self.driver = self._load_driver(driver="dummy")
+        else:
+            try:
+                self.driver = self._load_driver(driver=self.args.driver)
+            except AttributeError as e:
+                self.log.warning(
+                    "Falling back with dummy driver due error [ %s ] in"
+                    " driver [ %s ]. Check the driver CLI arguments, the"
+                    " configuration file [ %s ] contents, and ensure all"
+                    " dependencies are installed.",
+                    str(e),
+                    self.args.driver,
+                    self.args.config_file,
+                )
+                self.driver = self._load_driver(driver="dummy")
 
     def _load_driver(self, driver):
         try:
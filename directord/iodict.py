@@ -18,13 +18,13 @@ import os
 import pickle
 import queue
 import struct
+import threading
 import traceback
 import time
 import typing
 
 from directord import utils
 
-
 _S = typing.TypeVar("_S")
 _T = typing.TypeVar("_T")
 _KT = typing.TypeVar("_KT")
@@ -567,6 +567,185 @@ class FlushQueue(BaseQueue):
 
 
 class Cache(IODict):
-    """Helper class to create the Cache object."""
+    """Helper class to create the Cache object.
+
+    Every write stores a unique version token with the file object. When
+    the memory layer is enabled decoded values are kept in memory and are
+    only reloaded from disk when the stored version changes, which allows
+    reads to be served from memory while writes from other processes are
+    still observed.
+
+    > Values returned from the memory layer are shared objects, changes
+      must be written back to the cache.
+
+    Threads can block on a key with `wait_for`. Writes made through the
+    same Cache object wake waiters immediately, writes from other processes
+    are observed on the next poll interval.
+    """
+
+    def __init__(self, path: str, lock: typing.Any = None, memory=False):
+        """Initialize the Cache object.
+
+        :param path: Storage path
+        :type path: String
+        :param lock: Lock type object
+        :type lock: Object
+        :param memory: Enable|Disable the in memory layer.
+        :type memory: Boolean
+        """
+        super().__init__(path=path, lock=lock)
+        self._memory = dict() if memory else None
+        self._condition = threading.Condition()
+
+    @staticmethod
+    def _get_version(path: str):
+        """Return the version of a file object.
+
+        If xattrs are not available, the file stat information is used.
+
+        :param path: File path
+        :type path: String
+        :returns: Bytes|Tuple
+        """
+        try:
+            return os.getxattr(path, "user.version")
+        except FileNotFoundError:
+            raise
+        except OSError:
+            stat = os.stat(path)
+            return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    @staticmethod
+    def _set_version(path: str):
+        """Set a new version for a file object.
+
+        :param path: File path
+        :type path: String
+        """
+        try:
+            os.setxattr(path, "user.version", utils.get_uuid().encode())
+        except OSError:
+            pass
+
+    def __delitem__(self, key: _KT):
+        """Delete an item from the datastore.
+
+        :param key: Named object.
+        :type key: Object
+        """
+        if self._memory is not None:
+            self._memory.pop(key, None)
+        super().__delitem__(key)
+        self._notify()
+
+    def __getitem__(self, key: _KT):
+        """Return the value of a given key.
+
+        If a given key is not found, get will raise a KeyError exception.
+
+        :param key: Named object.
+        :type key: Object
+        :returns: Object
+        """
+        if self._memory is None:
+            return super().__getitem__(key)
 
-    pass
+        file_object = os.path.join(self._db_path, self._encoder(key))
+        try:
+            version = self._get_version(path=file_object)
+        except FileNotFoundError:
+            self._memory.pop(key, None)
+            raise KeyError(key) from None
+
+        cached = self._memory.get(key)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        with self._lock:
+            try:
+                version = self._get_version(path=file_object)
+                with open(file_object, "rb") as f:
+                    value = pickle.load(f)
+            except FileNotFoundError:
+                self._memory.pop(key, None)
+                raise KeyError(key) from None
+
+        self._memory[key] = (version, value)
+        return value
+
+    def __setitem__(self, key: _KT, value: _VT):
+        """Set an item in the datastore.
+
+        :param key: Named object to set.
+        :type key: Object
+        :param value: Object to set.
+        :type value: Object
+        """
+        file_object = os.path.join(self._db_path, self._encoder(key))
+        with self._lock:
+            with open(file_object, "wb") as f:
+                pickle.dump(value, f)
+
+            _setxattr(path=file_object, key=key)
+            self._set_version(path=file_object)
+            if self._memory is not None:
+                self._memory[key] = (
+                    self._get_version(path=file_object),
+                    value,
+                )
+
+        self._notify()
+
+    def _notify(self):
+        """Wake all threads waiting on the cache."""
+        with self._condition:
+            self._condition.notify_all()
+
+    def wait_for(
+        self,
+        key: _KT,
+        predicate: typing.Callable = None,
+        timeout: float = None,
+        interval: float = 1,
+    ):
+        """Wait for the value of a given key and return it.
+
+        If no predicate is provided, the wait ends once the key has a truthy
+        value.
+
+        :param key: Named object.
+        :type key: Object
+        :param predicate: Callable which receives the value, or None when the
+                          key does not exist, and returns True when the wait
+                          is complete.
+        :type predicate: Function
+        :param timeout: Maximum time, in seconds, to wait. None waits
+                        forever.
+        :type timeout: Float
+        :param interval: Maximum time, in seconds, between checks. Used to
+                         observe writes from other processes.
+        :type interval: Float
+        :returns: Object
+        """
+        if predicate is None:
+            predicate = operator.truth
+
+        if timeout is not None:
+            end_time = time.time() + timeout
+
+        with self._condition:
+            while True:
+                value = self.get(key)
+                if predicate(value):
+                    return value
+
+                wait_time = interval
+                if timeout is not None:
+                    remaining = end_time - time.time()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            "Timeout waiting for [ {} ]".format(key)
+                        )
+                    wait_time = min(wait_time, remaining)
+
+                self._condition.wait(timeout=wait_time)
@@ -23,14 +23,18 @@ import yaml
 
 import directord
 
-from directord import bootstrap
-from directord import client
+from directord import driver_args
 from directord import meta
 from directord import mixin
-from directord import server
-from directord import user
 from directord import utils
 
+# NOTE(cloudnull): Driver modules are only loaded for modes which run a
+#                  driver. All other modes interact with the server over the
+#                  local socket and should not pay the cost of importing
+#                  the driver libraries. Statically declared driver
+#                  arguments are accepted by every mode.
+DRIVER_MODES = ("server", "client")
+
 
 def _find_drivers(limit_modules=None):
     """Find all drivers.
@@ -56,11 +60,15 @@ def _find_drivers(limit_modules=None):
     return drivers
 
 
-def _parse_driver_args(parser, parser_server, parser_client):
+def _parse_driver_args(
+    parser, parser_server, parser_client, load_drivers=True
+):
     """Return a driver parser.
 
-    Any driver found not to be importable will be considered un-available for
-    use and ommitted.
+    Statically declared driver arguments are always added. When drivers are
+    loaded, any other driver providing arguments is imported, and any driver
+    found not to be importable will be considered un-available for use and
+    ommitted.
 
     :param parser: Parser object
     :type parser: Object
@@ -68,10 +76,23 @@ def _parse_driver_args(parser, parser_server, parser_client):
     :type parser_server: Object
     :param parser_client: SubParser object
     :type parser_client: Object
+    :param load_drivers: Enable|Disable loading driver modules.
+    :type load_drivers: Boolean
     :returns: Object
     """
 
+    static_drivers = list()
+    for driver_name, driver_parse_args in driver_args.DRIVER_ARGS:
+        parser = driver_parse_args(parser, parser_server, parser_client)
+        static_drivers.append(driver_name)
+
+    if not load_drivers:
+        return parser
+
     for driver_importer, driver_name in _find_drivers():
+        if driver_name in static_drivers:
+            continue
+
         driver = driver_importer.find_module(driver_name).load_module(
             driver_name
         )
@@ -90,6 +111,30 @@ def _parse_driver_args(parser, parser_server, parser_client):
     return parser
 
 
+def _requires_driver_args(exec_args=None):
+    """Return True when the parsed mode requires driver modules.
+
+    The mode is resolved from the first positional argument matching a known
+    mode. When no mode is found, driver arguments are loaded so that the
+    complete help information is available.
+
+    :param exec_args: List of arguments, defaults to the system arguments.
+    :type exec_args: List
+    :returns: Boolean
+    """
+
+    modes = DRIVER_MODES + (
+        "orchestrate",
+        "exec",
+        "manage",
+        "bootstrap",
+    )
+    for item in exec_args or sys.argv[1:]:
+        if item in modes:
+            return item in DRIVER_MODES
+    return True
+
+
 def _args(exec_args=None):
     """Setup client arguments."""
 
@@ -211,6 +256,28 @@ def _args(exec_args=None):
         help="Mode sub-command help", dest="mode"
     )
     parser_server = subparsers.add_parser("server", help="Server mode help")
+    parser_server.add_argument(
+        "--compression-threshold",
+        help=(
+            "Minimum size, in bytes, of job data and output which is"
+            " compressed before being sent. Compression is only used when"
+            " the remote side has advertised support. A value of 0 disables"
+            " compression. Default: %(default)s"
+        ),
+        metavar="INT",
+        default=int(os.getenv("DIRECTORD_COMPRESSION_THRESHOLD", 0)),
+        type=int,
+    )
+    parser_server.add_argument(
+        "--payload-encoding",
+        help=(
+            "Encoding used for job data and results. Msgpack requires the"
+            " msgpack library and is only used when the remote side has"
+            " enabled it as well. Default: %(default)s"
+        ),
+        default=os.getenv("DIRECTORD_PAYLOAD_ENCODING", "json"),
+        choices=["json", "msgpack"],
+    )
     parser_client = subparsers.add_parser("client", help="Client mode help")
     parser_client.add_argument(
         "--machine-id",
@@ -219,6 +286,97 @@ def _args(exec_args=None):
         default=os.getenv("DIRECTORD_MACHINE_ID", None),
         type=str,
     )
+    parser_client.add_argument(
+        "--max-inflight-jobs",
+        help=(
+            "Maximum number of jobs the client will hold in-flight. When set,"
+            " the server will hold excess work for the client centrally"
+            " until slots are available. A value of 0 disables the limit."
+            " Default: %(default)s"
+        ),
+        metavar="INT",
+        default=int(os.getenv("DIRECTORD_MAX_INFLIGHT_JOBS", 0)),
+        type=int,
+    )
+    parser_client.add_argument(
+        "--component-process-pool",
+        help=(
+            "Number of processes used to execute process safe components."
+            " When set, CPU heavy components run outside of the client"
+            " process. A value of 0 disables the process pool."
+            " Default: %(default)s"
+        ),
+        metavar="INT",
+        default=int(os.getenv("DIRECTORD_COMPONENT_PROCESS_POOL", 0)),
+        type=int,
+    )
+    parser_client.add_argument(
+        "--output-limit",
+        help=(
+            "Maximum number of bytes captured for the stdout and stderr of"
+            " a command. Output beyond the limit is truncated, keeping the"
+            " head and tail of the output. A value of 0 disables the limit."
+            " Tasks can override the limit with `--output-limit`."
+            " Default: %(default)s"
+        ),
+        metavar="INT",
+        default=int(os.getenv("DIRECTORD_OUTPUT_LIMIT", 0)),
+        type=int,
+    )
+    parser_client.add_argument(
+        "--output-spill-path",
+        help=(
+            "Directory used to store the complete output of commands which"
+            " exceed the output limit. Default: %(default)s"
+        ),
+        metavar="STRING",
+        default=os.getenv("DIRECTORD_OUTPUT_SPILL_PATH"),
+        type=str,
+    )
+    parser_client.add_argument(
+        "--output-stream-interval",
+        help=(
+            "Interval, in seconds, used to send incremental command output"
+            " to the server while a task runs. A value of 0 disables output"
+            " streaming. Default: %(default)s"
+        ),
+        metavar="FLOAT",
+        default=float(os.getenv("DIRECTORD_OUTPUT_STREAM_INTERVAL", 0)),
+        type=float,
+    )
+    parser_client.add_argument(
+        "--compression-threshold",
+        help=(
+            "Minimum size, in bytes, of job data and output which is"
+            " compressed before being sent. Compression is only used when"
+            " the remote side has advertised support. A value of 0 disables"
+            " compression. Default: %(default)s"
+        ),
+        metavar="INT",
+        default=int(os.getenv("DIRECTORD_COMPRESSION_THRESHOLD", 0)),
+        type=int,
+    )
+    parser_client.add_argument(
+        "--payload-encoding",
+        help=(
+            "Encoding used for job data and results. Msgpack requires the"
+            " msgpack library and is only used when the remote side has"
+            " enabled it as well. Default: %(default)s"
+        ),
+        default=os.getenv("DIRECTORD_PAYLOAD_ENCODING", "json"),
+        choices=["json", "msgpack"],
+    )
+    parser_client.add_argument(
+        "--result-batch-window",
+        help=(
+            "Window, in seconds, used to coalesce job status messages into"
+            " a single batched message. A value of 0 disables batching."
+            " Default: %(default)s"
+        ),
+        metavar="FLOAT",
+        default=float(os.getenv("DIRECTORD_RESULT_BATCH_WINDOW", 0)),
+        type=float,
+    )
     parser_orchestrate = subparsers.add_parser(
         "orchestrate", help="Orchestration mode help"
     )
@@ -392,6 +550,11 @@ def _args(exec_args=None):
         action="store_true",
         help="Dump the local cache to stdout.",
     )
+    manage_group.add_argument(
+        "--driver-metrics",
+        action="store_true",
+        help="Dump the server driver transport metrics to stdout.",
+    )
     manage_group.add_argument(
         "--analyze-parent",
         help="Analyze a given parent ID.",
@@ -440,7 +603,12 @@ def _args(exec_args=None):
         type=int,
     )
 
-    parser = _parse_driver_args(parser, parser_server, parser_client)
+    parser = _parse_driver_args(
+        parser,
+        parser_server,
+        parser_client,
+        load_drivers=_requires_driver_args(exec_args=exec_args),
+    )
     if exec_args:
         args = parser.parse_args(args=exec_args)
     else:
@@ -599,8 +767,12 @@ def main():
     _mixin = mixin.Mixin(args=args)
 
     if args.mode == "server":
+        from directord import server
+
         server.Server(args=args).worker_run()
     elif args.mode == "client":
+        from directord import client
+
         client.Client(args=args).worker_run()
     elif args.mode in ["exec", "orchestrate"]:
         if args.mode == "exec":
@@ -611,35 +783,22 @@ def main():
         job_items = [i.decode() for i in return_data if i]
 
         if args.poll or args.stream or args.wait:
+            from directord import user
+
             failed = set()
             manage = user.Manage(args=args)
             run_indicator = args.wait and not args.debug
             with directord.Spinner(run=run_indicator) as indicator:
                 for item in job_items:
                     state, status, stdout, stderr, info = manage.poll_job(
-                        job_id=item
+                        job_id=item, stream=args.stream
                     )
 
                     if state is False:
                         failed.add(item)
 
                     if args.stream:
-                        for node in sorted(
-                            set(
-                                i
-                                for v in [stdout, stderr, info]
-                                for i in v.keys()
-                            )
-                        ):
-                            for k, n, v in [
-                                (node, name, d[node])
-                                for name, d in [
-                                    ("STDOUT", stdout),
-                                    ("STDERR", stderr),
-                                ]
-                                if node in d
-                            ]:
-                                print("{} -- {}\n{}".format(k, n, v))
+                        manage.stream_output(stdout=stdout, stderr=stderr)
 
                     if run_indicator:
                         indicator.pipe_b.send(status)
@@ -658,6 +817,8 @@ def main():
                 print(item)
 
     elif args.mode == "manage":
+        from directord import user
+
         manage_exec = user.Manage(args=args)
         data = manage_exec.run()
         try:
@@ -669,6 +830,10 @@ def main():
             if not data:
                 raise SystemExit("No data found")
 
+        if args.driver_metrics:
+            print(json.dumps(data, indent=4, sort_keys=True))
+            return
+
         if args.export_jobs or args.export_nodes:
             export_file = utils.dump_yaml(
                 file_path=(args.export_jobs or args.export_nodes),
@@ -712,6 +877,8 @@ def main():
                         "AGENT_UPTIME",
                         "MACHINE_ID",
                         "DRIVER",
+                        "INFLIGHT",
+                        "BACKLOG",
                     ]
                 (
                     tabulated_data,
@@ -734,6 +901,8 @@ def main():
             else:
                 return
     elif args.mode == "bootstrap":
+        from directord import bootstrap
+
         _bootstrap = bootstrap.Bootstrap(
             args.catalog,
             args.key_file,
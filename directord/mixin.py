@@ -15,8 +15,6 @@
 import json
 import os
 
-from distutils import util as dist_utils
-
 import yaml
 
 import directord
@@ -200,7 +198,7 @@ class Mixin:
             else:
                 try:
                     parent_async = bool(
-                        dist_utils.strtobool(orchestrate.get("async", "False"))
+                        utils.strtobool(orchestrate.get("async", "False"))
                     )
                 except (ValueError, AttributeError):
                     parent_async = bool(orchestrate.get("async", False))
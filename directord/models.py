@@ -27,6 +27,9 @@ class BaseModel:
     nullbyte = "\x00"  # Signals null
     transfer_start = "\x02"  # Signals transfer start
     transfer_end = "\x03"  # Signals transfer end
+    batch_notice = "\x1d"  # Signals a batch of job messages
+    compress_notice = "\x1a"  # Signals compressed data
+    encoding_notice = "\x1c"  # Signals msgpack encoded data
 
 
 class Worker:
@@ -44,6 +47,12 @@ class Worker:
         self.agent_uptime = None
         self.version = None
         self.driver = None
+        self.max_inflight_jobs = None
+        self.slots = None
+        self.compression = None
+        self.encoding = None
+        self.inflight = 0
+        self.backlog = 0
 
     @property
     def expired(self):
@@ -13,7 +13,9 @@
 #   under the License.
 
 import base64
+import collections
 import grp
+import itertools
 import json
 import os
 import socket
@@ -24,6 +26,7 @@ import directord
 
 from directord import constants
 from directord import interface
+from directord import iodict
 from directord import models
 from directord import utils
 
@@ -31,6 +34,17 @@ from directord import utils
 class Server(interface.ProcessInterface):
     """Directord server class."""
 
+    # NOTE(cloudnull): Send lanes are drained in order on every interaction
+    #                  loop. The weight is the maximum number of items
+    #                  drained from a lane per loop, None drains the lane
+    #                  until it is empty. Control and callback work is
+    #                  latency critical and will always bypass bulk work.
+    send_lanes = (
+        ("control", "send_queue_control", None),
+        ("callback", "send_queue_callback", 64),
+        ("bulk", "send_queue", 32),
+    )
+
     def __init__(self, args):
         """Initialize the Server class.
 
@@ -43,12 +57,37 @@ class Server(interface.ProcessInterface):
         super(Server, self).__init__(args=args)
         self.job_queue = self.driver.get_queue(name="job_queue")
         self.send_queue = self.driver.get_queue(name="send_queue")
+        self.send_queue_callback = self.driver.get_queue(
+            name="send_queue_callback"
+        )
+        self.send_queue_control = self.driver.get_queue(
+            name="send_queue_control"
+        )
+        # NOTE(cloudnull): In-flight credits and held work are owned by the
+        #                  interactions loop, which is the only consumer of
+        #                  the send lanes, so these objects are never shared.
+        #                  Held work is persisted within the held work store
+        #                  until it has been sent or returned to a send lane.
+        self.worker_inflight = collections.defaultdict(collections.Counter)
+        self.worker_inflight_time = collections.defaultdict(dict)
+        self.worker_backlog = collections.defaultdict(collections.deque)
+        self.worker_parked = collections.defaultdict(collections.deque)
+        self.held_work = None
+        self.compression_threshold = getattr(
+            self.args, "compression_threshold", 0
+        )
+        self.payload_encoding = getattr(self.args, "payload_encoding", "json")
+        # NOTE(cloudnull): The server loops may run within their own
+        #                  processes, driver metrics are published into a
+        #                  managed dictionary so that every process is
+        #                  included when metrics are reported.
+        manager = self.get_manager()
+        self.driver.metrics.share(store=manager.dict())
         datastore = getattr(self.args, "datastore", None)
         self.workers = dict()
         if not datastore or datastore == "memory":
             self.log.info("Connecting to internal datastore")
             directord.plugin_import(plugin=".datastores.memory")
-            manager = self.get_manager()
             self.workers = manager.document()
             self.return_jobs = manager.document()
         else:
@@ -100,12 +139,16 @@ class Server(interface.ProcessInterface):
         return_timestamp=None,
         component_exec_timestamp=None,
         recv_time=None,
+        append=False,
     ):
         """Set job status.
 
         This will update the object for job tracking, allowing the
         user to know what happened within the environment.
 
+        When append is enabled, stdout and stderr are incremental output
+        updates which are appended to the known output of a running job.
+
         :param job_status: ASCII Control Character
         :type job_status: String
         :param job_id: UUID for job
@@ -126,6 +169,8 @@ class Server(interface.ProcessInterface):
         :type component_exec_timestamp: String
         :param recv_time: Time a task return was received.
         :type recv_tim: Float
+        :param append: Enable|Disable appending output to a running job.
+        :type append: Boolean
         """
 
         try:
@@ -133,14 +178,30 @@ class Server(interface.ProcessInterface):
         except KeyError:
             return
 
+        if append and job_metadata._processing.get(identity) in [
+            self.driver.job_end,
+            self.driver.job_failed,
+        ]:
+            self.log.debug(
+                "Job [ %s ] output update for [ %s ] after completion ignored",
+                job_id,
+                identity,
+            )
+            return
+
         if job_output and job_output is not self.driver.nullbyte:
             job_metadata.INFO[identity] = job_output
 
-        if job_stdout and job_stdout is not self.driver.nullbyte:
-            job_metadata.STDOUT[identity] = job_stdout
-
-        if job_stderr and job_stderr is not self.driver.nullbyte:
-            job_metadata.STDERR[identity] = job_stderr
+        for output, item in [
+            (job_metadata.STDOUT, job_stdout),
+            (job_metadata.STDERR, job_stderr),
+        ]:
+            if not item or item is self.driver.nullbyte:
+                continue
+            elif append:
+                output[identity] = (output.get(identity) or "") + item
+            else:
+                output[identity] = item
 
         job_metadata._processing[identity] = job_status
 
@@ -318,12 +379,18 @@ class Server(interface.ProcessInterface):
                         job_item["job_id"],
                         identity,
                     )
-                    self.send_queue.put(
-                        dict(
+                    # NOTE(cloudnull): Jobs, including the queue sentinel,
+                    #                  are sent through the bulk lane. The
+                    #                  sentinel purges the work queued on
+                    #                  a client so it must remain ordered
+                    #                  behind the jobs it is meant to purge.
+                    self._send_lane_put(
+                        send_item=dict(
                             identity=identity,
                             command=job_item["verb"],
                             data=job_item,
-                        )
+                        ),
+                        lane="bulk",
                     )
 
             if self.driver.event.is_set():
@@ -485,6 +552,377 @@ class Server(interface.ProcessInterface):
                 self.driver.backend_close()
                 break
 
+    def _get_send_lane(self, lane):
+        """Return the send queue for a given lane.
+
+        :param lane: Send lane name, control, callback, or bulk.
+        :type lane: String
+        :returns: Object
+        """
+
+        for name, queue_name, _ in self.send_lanes:
+            if name == lane:
+                return getattr(self, queue_name)
+        else:
+            raise ValueError("Send lane [ {} ] is unknown".format(lane))
+
+    def _send_lane_put(self, send_item, lane="bulk"):
+        """Put a send item into a given send lane.
+
+        :param send_item: Send item containing identity, command, and data.
+        :type send_item: Dictionary
+        :param lane: Send lane name, control, callback, or bulk.
+        :type lane: String
+        """
+
+        self._get_send_lane(lane=lane).put(send_item)
+
+    def _held_work_path(self):
+        """Return the path of the held work store.
+
+        :returns: String
+        """
+
+        return os.path.join(
+            getattr(self.args, "cache_path", "/var/cache/directord"),
+            "queue",
+            "send_queue_held",
+        )
+
+    def _get_held_work(self):
+        """Return the held work store, creating it when required.
+
+        :returns: Object
+        """
+
+        if self.held_work is None:
+            self.held_work = iodict.IODict(path=self._held_work_path())
+
+        return self.held_work
+
+    def _hold_item(self, lane, send_item):
+        """Persist a held send item and return its key.
+
+        :param lane: Send lane name, control, callback, or bulk.
+        :type lane: String
+        :param send_item: Send item containing identity, command, and data.
+        :type send_item: Dictionary
+        :returns: String
+        """
+
+        key = utils.get_uuid()
+        self._get_held_work()[key] = (lane, send_item)
+        return key
+
+    def _release_held_item(self, key):
+        """Remove a held send item from the held work store.
+
+        :param key: Held item key.
+        :type key: String
+        """
+
+        try:
+            del self._get_held_work()[key]
+        except KeyError:
+            pass
+
+    def _restore_held_work(self):
+        """Return work held by a previous run to the send lanes.
+
+        :returns: Integer
+        """
+
+        if self.held_work is None and not os.path.exists(
+            self._held_work_path()
+        ):
+            return 0
+
+        count = 0
+        held_work = self._get_held_work()
+        for key in list(held_work.keys()):
+            try:
+                lane, send_item = held_work[key]
+            except KeyError:
+                continue
+            self._send_lane_put(send_item=send_item, lane=lane)
+            self._release_held_item(key=key)
+            count += 1
+
+        if count:
+            self.log.info("Restored [ %s ] held jobs", count)
+
+        return count
+
+    def _worker_has_credit(self, worker):
+        """Return True when a worker has an available in-flight credit.
+
+        Workers which have not reported an in-flight job limit always
+        have credit.
+
+        :param worker: Worker object.
+        :type worker: Object
+        :returns: Boolean
+        """
+
+        max_inflight_jobs = getattr(worker, "max_inflight_jobs", None)
+        if not max_inflight_jobs:
+            return True
+
+        inflight = self.worker_inflight.get(worker.identity)
+        if not inflight:
+            return True
+
+        return sum(inflight.values()) < max_inflight_jobs
+
+    def _release_worker_credit(self, identity, job_id):
+        """Release an in-flight credit for a given worker and job.
+
+        :param identity: Client identity
+        :type identity: String
+        :param job_id: Job Id
+        :type job_id: String
+        """
+
+        inflight = self.worker_inflight.get(identity)
+        if not inflight or job_id not in inflight:
+            return
+
+        inflight[job_id] -= 1
+        if inflight[job_id] < 1:
+            inflight.pop(job_id)
+            self.worker_inflight_time.get(identity, dict()).pop(job_id, None)
+
+        if not inflight:
+            self.worker_inflight.pop(identity, None)
+            self.worker_inflight_time.pop(identity, None)
+
+    def _reset_worker_credits(self, identity, timestamp=None):
+        """Release in-flight credits sent to a worker before a timestamp.
+
+        Workers which do not report a timestamp only have credits older
+        than the heartbeat interval released.
+
+        :param identity: Client identity
+        :type identity: String
+        :param timestamp: Time the worker reported its available slots.
+        :type timestamp: Float
+        """
+
+        if timestamp is None:
+            timestamp = time.time() - self.heartbeat_interval
+
+        inflight = self.worker_inflight.get(identity)
+        if not inflight:
+            return
+
+        sent_times = self.worker_inflight_time.get(identity, dict())
+        for job_id in list(inflight.keys()):
+            if sent_times.get(job_id, 0) < timestamp:
+                inflight.pop(job_id)
+                sent_times.pop(job_id, None)
+
+        if not inflight:
+            self.worker_inflight.pop(identity, None)
+            self.worker_inflight_time.pop(identity, None)
+
+    def _prune_worker_credits(self):
+        """Drop in-flight credits for workers which are no longer known."""
+
+        for identity in list(self.worker_inflight.keys()):
+            if self.workers.get(identity) is None:
+                self.log.debug(
+                    "Worker [ %s ] is unknown, dropping in-flight credits",
+                    identity,
+                )
+                self.worker_inflight.pop(identity, None)
+                self.worker_inflight_time.pop(identity, None)
+
+    def _send_item(self, worker, send_item, credited=False):
+        """Send an item to a worker.
+
+        :param worker: Worker object.
+        :type worker: Object
+        :param send_item: Send item containing identity, command, and data.
+        :type send_item: Dictionary
+        :param credited: Enable in-flight credit tracking for the item.
+        :type credited: Boolean
+        """
+
+        job_id = send_item["data"]["job_id"]
+        self.log.debug(
+            "Sending job [ %s ] sent to [ %s ]",
+            job_id,
+            send_item["identity"],
+        )
+        # NOTE(cloudnull): Msgpack is only used when both the server and
+        #                  the worker have enabled it.
+        if self.payload_encoding == getattr(worker, "encoding", None):
+            encoding = self.payload_encoding
+        else:
+            encoding = None
+        send_item["data"] = utils.encode_payload(
+            send_item["data"], encoding=encoding
+        )
+        # NOTE(cloudnull): Workers which can decode compressed data are
+        #                  told the server can also decode compressed data
+        #                  using the control character.
+        if getattr(worker, "compression", None) == utils.COMPRESSION:
+            send_item["control"] = self.driver.compress_notice
+            send_item["data"] = utils.compress_frame(
+                item=send_item["data"], threshold=self.compression_threshold
+            )
+        self.driver.job_send(
+            **send_item,
+        )
+        if credited and getattr(worker, "max_inflight_jobs", None):
+            identity = send_item["identity"]
+            self.worker_inflight[identity][job_id] += 1
+            self.worker_inflight_time[identity][job_id] = time.time()
+
+        # NOTE(cloudnull): If the command is reboot make the node
+        #                  inactive until the next healthcheck.
+        if send_item["command"] == "REBOOT":
+            worker.active = False
+            self.workers[send_item["identity"]] = worker
+
+    def _send_lane_items(self, lane, weight, credited=False):
+        """Send items from a send lane and return the number of items read.
+
+        Items for inactive workers are parked until the worker is marked
+        active again. When credited, items for workers without an available
+        in-flight credit are held in the worker backlog. Parked and held
+        items are persisted until they are sent or returned to a send lane.
+
+        :param lane: Send lane name, control, callback, or bulk.
+        :type lane: String
+        :param weight: Maximum number of items to read, None reads until
+                       the lane is empty.
+        :type weight: Integer
+        :param credited: Enable in-flight credit tracking for the lane.
+        :type credited: Boolean
+        :returns: Integer
+        """
+
+        count = 0
+        send_queue = self._get_send_lane(lane=lane)
+        for send_item in itertools.islice(send_queue.getter(), weight):
+            count += 1
+            identity = send_item["identity"]
+            worker = self.workers.get(identity)
+            if not worker:
+                continue
+            elif worker.active is False:
+                self.worker_parked[identity].append(
+                    (self._hold_item(lane=lane, send_item=send_item), lane)
+                )
+                continue
+            elif credited and (
+                self.worker_backlog.get(identity)
+                or not self._worker_has_credit(worker)
+            ):
+                self.worker_backlog[identity].append(
+                    self._hold_item(lane=lane, send_item=send_item)
+                )
+                continue
+
+            self._send_item(
+                worker=worker, send_item=send_item, credited=credited
+            )
+
+        return count
+
+    def _unpark_worker(self, identity):
+        """Return parked work for a given worker to the send lanes.
+
+        :param identity: Client identity
+        :type identity: String
+        :returns: Integer
+        """
+
+        parked = self.worker_parked.pop(identity, None)
+        if not parked:
+            return 0
+
+        count = len(parked)
+        self.log.info(
+            "Worker [ %s ] is active, releasing [ %s ] parked jobs",
+            identity,
+            count,
+        )
+        held_work = self._get_held_work()
+        while parked:
+            key, lane = parked.popleft()
+            try:
+                _, send_item = held_work[key]
+            except KeyError:
+                continue
+            self._send_lane_put(send_item=send_item, lane=lane)
+            self._release_held_item(key=key)
+
+        return count
+
+    def _prune_parked_work(self):
+        """Drop parked work for workers which are no longer known."""
+
+        for identity in list(self.worker_parked.keys()):
+            if self.workers.get(identity) is None:
+                parked = self.worker_parked.pop(identity)
+                self.log.warning(
+                    "Worker [ %s ] is unknown, dropping [ %s ] parked jobs",
+                    identity,
+                    len(parked),
+                )
+                for key, _ in parked:
+                    self._release_held_item(key=key)
+
+    def _release_worker_backlog(self):
+        """Send held work to workers with available credits.
+
+        :returns: Integer
+        """
+
+        released = 0
+        for identity, backlog in list(self.worker_backlog.items()):
+            worker = self.workers.get(identity)
+            if not worker:
+                self.log.warning(
+                    "Worker [ %s ] is unknown, dropping [ %s ] held jobs",
+                    identity,
+                    len(backlog),
+                )
+                for key in self.worker_backlog.pop(identity):
+                    self._release_held_item(key=key)
+                continue
+
+            held_work = self._get_held_work()
+            while (
+                backlog
+                and worker.active is not False
+                and self._worker_has_credit(worker)
+            ):
+                key = backlog.popleft()
+                try:
+                    _, send_item = held_work[key]
+                except KeyError:
+                    continue
+                self._send_item(
+                    worker=worker, send_item=send_item, credited=True
+                )
+                self._release_held_item(key=key)
+                released += 1
+
+            if not backlog:
+                self.worker_backlog.pop(identity)
+
+        return released
+
+    def _flush_held_work(self):
+        """Return all held and parked work to the send lanes."""
+
+        self.worker_backlog.clear()
+        self.worker_parked.clear()
+        self._restore_held_work()
+
     def run_interactions(self):
         """Execute the interactions loop.
 
@@ -498,6 +936,7 @@ class Server(interface.ProcessInterface):
         """
 
         self.driver.job_init()
+        self._restore_held_work()
         poller_time = time.time()
         prune_time = time.time() + 10
         poller_interval = 1
@@ -520,36 +959,22 @@ class Server(interface.ProcessInterface):
                     )
                     run_jobs_thread.start()
 
-            requeue = list()
-            for send_item in self.send_queue.getter():
-                worker = self.workers.get(send_item["identity"])
-                if not worker:
-                    continue
-                elif worker.active is False:
-                    requeue.append(send_item)
-                    continue
+            if self._release_worker_backlog():
+                poller_interval, poller_time = 1, time.time()
 
-                self.log.debug(
-                    "Sending job [ %s ] sent to [ %s ]",
-                    send_item["data"]["job_id"],
-                    send_item["identity"],
+            for lane, _, weight in self.send_lanes:
+                sent = self._send_lane_items(
+                    lane=lane,
+                    weight=weight,
+                    credited=lane == "bulk",
                 )
-                send_item["data"] = json.dumps(send_item["data"])
-                self.driver.job_send(
-                    **send_item,
-                )
-                # NOTE(cloudnull): If the command is reboot make the node
-                #                  inactive until the next healthcheck.
-                if send_item["command"] == "REBOOT":
-                    worker.active = False
-                    self.workers[send_item["identity"]] = worker
-
-            # When a node is inactive the work will be requeued.
-            for item in requeue:
-                self.send_queue.put(item)
+                # NOTE(cloudnull): When a lane has reached its weight there
+                #                  is more work to do, keep the poller hot.
+                if weight and sent >= weight:
+                    poller_interval, poller_time = 1, time.time()
 
             while self.driver.job_check(constant=poller_interval):
-                (
+                for (
                     identity,
                     msg_id,
                     control,
@@ -558,48 +983,47 @@ class Server(interface.ProcessInterface):
                     info,
                     stderr,
                     stdout,
-                ) = self.driver.job_recv()
-                if control == self.driver.heartbeat_notice:
-                    self.handle_heartbeat(identity, data)
-                else:
-                    poller_interval, poller_time = 1, time.time()
-                    self.handle_job(
-                        identity=identity,
-                        job_id=msg_id,
-                        control=control,
-                        data=data,
-                        info=info,
-                        stderr=stderr,
-                        stdout=stdout,
-                    )
-
-                if (
-                    command == "QUERY"
-                    and control == self.driver.job_processing
-                ):
-                    if msg_id not in coordination_threads:
-                        self.log.info(
-                            "Job [ %s ], QUERY command found", msg_id
-                        )
-                        t = coordination_threads[
-                            msg_id
-                        ] = self.driver.thread_processor(
-                            target=self._query_coordination,
-                            name=msg_id,
-                            daemon=True,
-                            kwargs={
-                                "job_id": msg_id,
-                            },
+                ) in self._job_records(message=self.driver.job_recv(raw=True)):
+                    if control == self.driver.heartbeat_notice:
+                        self.handle_heartbeat(identity, data)
+                    else:
+                        poller_interval, poller_time = 1, time.time()
+                        self.handle_job(
+                            identity=identity,
+                            job_id=msg_id,
+                            control=control,
+                            data=data,
+                            info=info,
+                            stderr=stderr,
+                            stdout=stdout,
                         )
-                        t.start()
-                # NOTE(cloudnull): If we get a return from a reboot command
-                #                  mark the node inactive until the next
-                #                  healthcheck.
-                elif command == "REBOOT":
-                    worker = self.workers.get(identity)
-                    if worker:
-                        worker.active = False
-                        self.workers[identity] = worker
+
+                    if (
+                        command == "QUERY"
+                        and control == self.driver.job_processing
+                    ):
+                        if msg_id not in coordination_threads:
+                            self.log.info(
+                                "Job [ %s ], QUERY command found", msg_id
+                            )
+                            t = self.driver.thread_processor(
+                                target=self._query_coordination,
+                                name=msg_id,
+                                daemon=True,
+                                kwargs={
+                                    "job_id": msg_id,
+                                },
+                            )
+                            coordination_threads[msg_id] = t
+                            t.start()
+                    # NOTE(cloudnull): If we get a return from a reboot command
+                    #                  mark the node inactive until the next
+                    #                  healthcheck.
+                    elif command == "REBOOT":
+                        worker = self.workers.get(identity)
+                        if worker:
+                            worker.active = False
+                            self.workers[identity] = worker
 
             poller_interval = utils.return_poller_interval(
                 poller_time=poller_time,
@@ -611,12 +1035,73 @@ class Server(interface.ProcessInterface):
                 self.log.debug(
                     "Post prune workers [ %s ]", self.workers.prune()
                 )
+                self._prune_parked_work()
+                self._prune_worker_credits()
                 prune_time = time.time() + 10
 
             if self.driver.event.is_set():
+                self._flush_held_work()
                 self.driver.job_close()
                 break
 
+    def _job_records(self, message):
+        """Yield all job records contained within a received message.
+
+        Batched messages are unpacked into individual job records. The
+        data, stderr, and stdout parts may be received raw, they are
+        decompressed or decoded directly from the received frames.
+
+        :param message: Received job message.
+        :type message: Tuple
+        :yields: Tuple
+        """
+
+        identity, msg_id, control, command = message[:4]
+        data, info, stderr, stdout = message[4:]
+        if control != self.driver.batch_notice:
+            yield (
+                identity,
+                msg_id,
+                control,
+                command,
+                utils.decompress_frame(data),
+                info,
+                utils.decompress_frame(stderr),
+                utils.decompress_frame(stdout),
+            )
+            return
+
+        try:
+            records = utils.decode_payload(utils.decompress_frame(data))
+        except Exception as e:
+            self.log.error(
+                "Invalid result batch from [ %s ]: %s", identity, str(e)
+            )
+            return
+
+        self.log.debug(
+            "Result batch with [ %s ] messages from [ %s ]",
+            len(records),
+            identity,
+        )
+        for record in records:
+            yield tuple(
+                [identity]
+                + [
+                    utils.decompress_frame(record.get(i))
+                    or self.driver.nullbyte
+                    for i in [
+                        "msg_id",
+                        "control",
+                        "command",
+                        "data",
+                        "info",
+                        "stderr",
+                        "stdout",
+                    ]
+                ]
+            )
+
     def _query_coordination(self, job_id):
         """Run Query coordination.
 
@@ -668,12 +1153,13 @@ class Server(interface.ProcessInterface):
                 new_task["job_id"],
                 target,
             )
-            self.send_queue.put(
-                dict(
+            self._send_lane_put(
+                send_item=dict(
                     identity=target,
                     command=new_task["verb"],
                     data=new_task,
-                )
+                ),
+                lane="callback",
             )
 
     def _node_return_info(self, node_info):
@@ -776,6 +1262,8 @@ class Server(interface.ProcessInterface):
                     elif key == "purge_jobs":
                         self.return_jobs.clear()
                         data = {"success": True}
+                    elif key == "driver_metrics":
+                        data = self.driver.get_metrics()
                     else:
                         data = {"failed": True}
 
@@ -849,6 +1337,27 @@ class Server(interface.ProcessInterface):
             )
 
             worker_machine_id = metadata.pop("machine_id", None)
+            worker.max_inflight_jobs = metadata.pop("max_inflight_jobs", None)
+            worker.slots = metadata.pop("slots", None)
+            worker.compression = metadata.pop("compression", None)
+            worker.encoding = metadata.pop("encoding", None)
+            slots_timestamp = metadata.pop("slots_timestamp", None)
+            # NOTE(cloudnull): When a worker reports all of its slots are
+            #                  available, release the credits sent before
+            #                  the slots were counted so lost returns can
+            #                  not leak credits. Credits sent after the
+            #                  slots were counted are still in transit.
+            if worker.max_inflight_jobs and (
+                worker.slots == worker.max_inflight_jobs
+            ):
+                self._reset_worker_credits(
+                    identity=identity, timestamp=slots_timestamp
+                )
+
+            worker.inflight = sum(
+                self.worker_inflight.get(identity, dict()).values()
+            )
+            worker.backlog = len(self.worker_backlog.get(identity, list()))
             for k, v in metadata.items():
                 setattr(worker, k, v)
 
@@ -887,6 +1396,7 @@ class Server(interface.ProcessInterface):
         #                  different data-store options.
         worker.active = True
         self.workers[identity] = worker
+        self._unpark_worker(identity=identity)
 
     def handle_job(
         self, identity, job_id, control, data, info, stderr, stdout
@@ -916,10 +1426,13 @@ class Server(interface.ProcessInterface):
         )
 
         try:
-            data_item = json.loads(data)
+            data_item = utils.decode_payload(data)
         except Exception:
             data_item = dict()
 
+        if control in [self.driver.job_end, self.driver.job_failed]:
+            self._release_worker_credit(identity=identity, job_id=job_id)
+
         self._set_job_status(
             job_status=control,
             job_id=job_id,
@@ -933,6 +1446,7 @@ class Server(interface.ProcessInterface):
                 "component_exec_timestamp", 0
             ),
             recv_time=time.time(),
+            append=data_item.get("output_delta", False),
         )
 
         for new_task in data_item.get("new_tasks", list()):
@@ -972,12 +1486,13 @@ class Server(interface.ProcessInterface):
                     new_task["job_id"],
                     target,
                 )
-                self.send_queue.put(
-                    dict(
+                self._send_lane_put(
+                    send_item=dict(
                         identity=target,
                         command=new_task["verb"],
                         data=new_task,
-                    )
+                    ),
+                    lane="callback",
                 )
 
     def handle_job_info(self, job_info):
@@ -1036,4 +1551,5 @@ class Server(interface.ProcessInterface):
         self.run_threads(threads=threads, stop_event=self.driver.event)
         self.driver.shutdown()
         self.job_queue.flush()
-        self.send_queue.flush()
+        for _, queue_name, _ in self.send_lanes:
+            getattr(self, queue_name).flush()
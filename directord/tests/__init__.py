@@ -149,12 +149,27 @@ class FakeArgs:
     messaging_ssl_cert = "/etc/directord/messaging/ssl/directord.crt"
     messaging_ssl_key = "/etc/directord/messaging/ssl/directord.key"
     machine_id = None
+    max_inflight_jobs = 0
+    component_process_pool = 0
+    output_limit = 0
+    output_spill_path = None
+    output_stream_interval = 0
+    result_batch_window = 0
+    compression_threshold = 0
+    payload_encoding = "json"
     grpc_port = 5558
     grpc_bind_address = "0.0.0.0"
     grpc_server_address = "127.0.0.1"
     grpc_server_workers = 4
     grpc_ssl = False
     grpc_disable_compression = False
+    grpc_streaming = False
+    grpc_batch_size = 1
+    grpc_queue_max_depth = 0
+    grpc_queue_max_bytes = 0
+    grpc_queue_overflow = "reject"
+    grpc_queue_ttl = 0
+    grpc_queue_path = None
     grpc_ssl_ca = "/etc/pki/ca-trust/source/anchors/cm-local-ca.pem"
     grpc_ssl_cert = "/etc/directord/grpc/ssl/directord.crt"
     grpc_ssl_key = "/etc/directord/grpc/ssl/directord.key"
@@ -206,6 +221,14 @@ class FakeCache:
     def setdefault(self, key, value, **kwargs):
         self.cache[key] = value
 
+    def wait_for(self, key, predicate=None, timeout=None, interval=1):
+        value = self.cache.get(key)
+        if predicate is None:
+            predicate = bool
+        if not predicate(value):
+            raise TimeoutError(key)
+        return value
+
     def clear(self):
         current = len(self.cache)
         self.cache = dict()
@@ -303,6 +326,9 @@ class TestDriverBase(TestBase):
         self.mock_driver.job_failed = base_driver.job_failed
         self.mock_driver.transfer_start = base_driver.transfer_start
         self.mock_driver.transfer_end = base_driver.transfer_end
+        self.mock_driver.batch_notice = base_driver.batch_notice
+        self.mock_driver.compress_notice = base_driver.compress_notice
+        self.mock_driver.encoding_notice = base_driver.encoding_notice
         self.mock_driver.bind_job = MagicMock()
         self.mock_driver.heartbeat_send = MagicMock()
         event = self.mock_driver.event = MagicMock()
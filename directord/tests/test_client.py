@@ -12,13 +12,19 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 
+import concurrent.futures
 import json
+import tempfile
+import threading
+import unittest
 
 from unittest.mock import ANY
+from unittest.mock import MagicMock
 from unittest.mock import patch
 
 from directord import client
 from directord import tests
+from directord import utils
 
 
 class TestClient(tests.TestDriverBase):
@@ -332,3 +338,271 @@ class TestClient(tests.TestDriverBase):
         self.client.worker_run()
         mock_run_threads.assert_called_with(ANY, threads=[ANY], stop_event=ANY)
         mock_makedirs.assert_called()
+
+    def test_available_slots_unlimited(self):
+        self.assertIsNone(self.client.available_slots)
+
+    def test_available_slots(self):
+        self.client.max_inflight_jobs = 2
+        self.client.handle_job(
+            command="RUN",
+            data=json.dumps({"job_id": "XXX", "job_sha3_224": "YYY"}),
+            info=None,
+        )
+        self.assertEqual(self.client.available_slots, 1)
+        self.client.q_return = tests.MockQueue()
+        self.client.q_return.put(
+            (
+                None,
+                None,
+                True,
+                None,
+                {"job_id": "XXX", "job_sha3_224": "YYY", "parent_id": None},
+                "RUN",
+                0,
+                None,
+            )
+        )
+        self.client.job_q_results()
+        self.assertEqual(self.client.available_slots, 2)
+
+    @unittest.skipIf(utils.msgpack is None, "msgpack is not installed")
+    def test_handle_job_msgpack(self):
+        self.assertIsNone(self.client.encoding)
+        self.client.handle_job(
+            command="RUN",
+            data=utils.encode_payload(
+                {"job_id": "XXX", "job_sha3_224": "YYY"}, encoding="msgpack"
+            ),
+            info=None,
+        )
+        self.assertEqual(self.client.encoding, "msgpack")
+
+    def test_job_q_results_output_delta(self):
+        self.client.inflight_jobs = 1
+        self.client.q_return = tests.MockQueue()
+        self.client._output_stream(
+            job={"job_id": "XXX", "job_sha3_224": "YYY", "parent_id": "ZZZ"},
+            command="RUN",
+            stdout="line1\n",
+            stderr="",
+        )
+        with patch.object(self.client, "_set_job_status") as mock_status:
+            self.assertTrue(self.client.job_q_results())
+        mock_status.assert_not_called()
+        self.mock_driver.job_send.assert_called_once_with(
+            msg_id="XXX",
+            control=self.mock_driver.job_processing,
+            command="RUN",
+            data=json.dumps({"output_delta": True}),
+            info="task output",
+            stderr="",
+            stdout="line1\n",
+        )
+        self.assertEqual(self.client.inflight_jobs, 1)
+
+    def _job_item(self, job_id, command="RUN", **kwargs):
+        job = {"job_id": job_id, "job_sha3_224": job_id, "parent_id": "ZZZ"}
+        job.update(kwargs)
+        return (dict(cache=None, job=job), command, None)
+
+    def test_job_q_processor(self):
+        self.mocked_get_queue.return_value = tests.MockQueue()
+        done = threading.Event()
+        ran = list()
+
+        def _run(component_kwargs, *args, **kwargs):
+            ran.append(component_kwargs["job"]["job_id"])
+            if len(ran) == 3:
+                done.set()
+
+        q = tests.MockQueue()
+        q.put(self._job_item("job1"))
+        q.put(self._job_item("job2"))
+        q.put(self._job_item("job3", parent_async_bypass=True))
+        self.mock_driver.event.is_set.side_effect = done.is_set
+        with patch.object(self.client, "job_q_component_run") as mock_run:
+            mock_run.side_effect = _run
+            self.client.job_q_processor(q_processes=q)
+        self.assertEqual(sorted(ran), ["job1", "job2", "job3"])
+        self.assertLess(ran.index("job1"), ran.index("job2"))
+        self.assertTrue(q.empty())
+
+    def test_job_q_processor_bypass_waiters(self):
+        self.mocked_get_queue.return_value = tests.MockQueue()
+        self.client.cpu_count = 1
+        chains = self.client.cpu_count * 4
+        released = threading.Event()
+        done = threading.Event()
+        ran = list()
+
+        def _run(component_kwargs, command, *args, **kwargs):
+            if command == "QUERY_WAIT":
+                self.assertTrue(released.wait(5))
+            else:
+                released.set()
+            ran.append(component_kwargs["job"]["job_id"])
+            if len(ran) == chains + 1:
+                done.set()
+
+        q = tests.MockQueue()
+        for i in range(chains):
+            q.put(
+                self._job_item(
+                    "wait{}".format(i),
+                    command="QUERY_WAIT",
+                    parent_id="chain{}".format(i),
+                    parent_async_bypass=True,
+                )
+            )
+        q.put(
+            self._job_item(
+                "arg",
+                command="ARG",
+                parent_id="callback",
+                parent_async_bypass=True,
+            )
+        )
+        self.mock_driver.event.is_set.side_effect = done.is_set
+        deadline = threading.Timer(10, done.set)
+        deadline.start()
+        try:
+            with patch.object(self.client, "job_q_component_run") as mock_run:
+                mock_run.side_effect = _run
+                self.client.job_q_processor(q_processes=q)
+        finally:
+            deadline.cancel()
+        self.assertEqual(len(ran), chains + 1)
+        self.assertEqual(ran[0], "arg")
+
+    def test_job_q_processor_sentinel_shutdown(self):
+        self.mocked_get_queue.return_value = tests.MockQueue()
+        stop = threading.Event()
+        release = threading.Event()
+
+        def _run(component_kwargs, command, *args, **kwargs):
+            if command == "QUEUESENTINEL":
+                stop.set()
+            else:
+                q.put(
+                    self._job_item(
+                        "sentinel",
+                        command="QUEUESENTINEL",
+                        parent_async_bypass=True,
+                    )
+                )
+                q.put(self._job_item("job3"))
+                release.wait(5)
+
+        self.client.q_return = tests.MockQueue()
+        q = tests.MockQueue()
+        q.put(self._job_item("job1"))
+        q.put(self._job_item("job2"))
+        self.mock_driver.event.is_set.side_effect = stop.is_set
+        try:
+            with patch.object(self.client, "job_q_component_run") as mock_run:
+                mock_run.side_effect = _run
+                self.client.job_q_processor(q_processes=q)
+        finally:
+            release.set()
+
+        omitted = self.client.q_return.get_nowait()
+        self.assertEqual(omitted[4]["job_id"], "job2")
+        self.assertIn("Omitted due to sentinel", omitted[3])
+        self.assertTrue(self.client.q_return.empty())
+        # job3 was queued after the sentinel and returned on shutdown.
+        self.assertEqual(q.get_nowait()[0]["job"]["job_id"], "job3")
+
+    def test_job_q_component_run_process_pool(self):
+        self.client.q_return = tests.MockQueue()
+        self.client.process_pool = MagicMock()
+        future = self.client.process_pool.submit.return_value
+        future.result.return_value = (b"stdout", None, True, "info", None)
+        component_kwargs, command, info = self._job_item(
+            "XXX", skip_cache=True, command="true"
+        )
+        with patch.object(self.client, "cache", tests.FakeCache()):
+            self.client.job_q_component_run(
+                component_kwargs, "RUN", info, MagicMock()
+            )
+        self.client.process_pool.submit.assert_called_once_with(
+            client._process_component_run,
+            command="RUN",
+            info=None,
+            job=component_kwargs["job"],
+            output_limit=0,
+            output_spill_path=None,
+        )
+        self.assertEqual(self.client.q_return.get_nowait()[2], True)
+
+    def test_job_q_component_run_callback_timeout(self):
+        self.client.q_return = tests.MockQueue()
+        self.client.process_pool = MagicMock()
+        self.mock_driver.identity = "test-node"
+        future = self.client.process_pool.submit.return_value
+        callback = {
+            "job_id": "YYY",
+            "job_sha3_224": "YYY",
+            "targets": ["test-node"],
+        }
+        future.result.return_value = (
+            b"stdout",
+            None,
+            True,
+            "info",
+            [callback],
+        )
+        component_kwargs, command, info = self._job_item(
+            "XXX", skip_cache=True, command="true", timeout=5
+        )
+        cache = tests.FakeCache()
+        with patch.object(self.client, "cache", cache):
+            with patch.object(cache, "wait_for", autospec=True) as mock_wait:
+                mock_wait.side_effect = TimeoutError("YYY")
+                self.client.job_q_component_run(
+                    component_kwargs, "RUN", info, MagicMock()
+                )
+        self.assertEqual(mock_wait.call_args.kwargs["timeout"], 5)
+        self.assertIsNone(self.client.q_return.get_nowait()[2])
+        result = self.client.q_return.get_nowait()
+        self.assertFalse(result[2])
+        self.assertEqual(result[3], "Callback [ YYY ] never completed")
+
+    def test_job_q_component_run_process_pool_broken(self):
+        self.client.q_return = tests.MockQueue()
+        process_pool = self.client.process_pool = MagicMock()
+        future = process_pool.submit.return_value
+        future.result.side_effect = (
+            concurrent.futures.process.BrokenProcessPool("broken")
+        )
+        component_kwargs, command, info = self._job_item(
+            "XXX", skip_cache=True, command="true"
+        )
+        with patch.object(self.client, "cache", tests.FakeCache()):
+            self.client.job_q_component_run(
+                component_kwargs, "RUN", info, MagicMock()
+            )
+        self.assertIsNone(self.client.process_pool)
+        process_pool.shutdown.assert_called_once_with(wait=False)
+        self.assertEqual(self.client.q_return.get_nowait()[2], False)
+
+    def test_process_component_run(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            client._process_pool_init(
+                cache_path=tmpdir, lock=MagicMock(), identity="test-node"
+            )
+            client._PROCESS_CACHE["args"] = {"query": "value"}
+            result = client._process_component_run(
+                command="QUERY",
+                info=None,
+                job={
+                    "job_id": "XXX",
+                    "parent_id": "YYY",
+                    "query": "query",
+                    "targets": ["test-node"],
+                },
+            )
+        stdout, _, outcome, _, block_on_tasks = result
+        self.assertTrue(outcome)
+        self.assertEqual(json.loads(stdout), {"query": "value"})
+        self.assertEqual(block_on_tasks[0]["targets"], ["test-node"])
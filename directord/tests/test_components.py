@@ -12,6 +12,9 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 
+import signal
+import subprocess
+import tempfile
 import unittest
 
 from unittest.mock import call
@@ -99,6 +102,7 @@ class TestComponents(tests.TestBase):
                 "opt0": "*.json",
                 "opt1": None,
                 "opt2": False,
+                "output_limit": None,
                 "stdout_arg": None,
                 "stderr_arg": None,
             },
@@ -329,7 +333,13 @@ class TestComponents(tests.TestBase):
             cache=tests.FakeCache(),
             job={"packages": ["kernel", "gcc"]},
         )
-        calls = [call(command="dnf -q -y install kernel gcc", env=None)]
+        calls = [
+            call(
+                command="dnf -q -y install kernel gcc",
+                env=None,
+                **self._dnf.run_command_options,
+            )
+        ]
         self.assertEqual(mock_run_command.call_args_list, calls)
         self.assertTrue(outcome)
 
@@ -344,6 +354,7 @@ class TestComponents(tests.TestBase):
             call(
                 command="dnf -q -y --exclude=libexec install kernel gcc",
                 env=None,
+                **self._dnf.run_command_options,
             )
         ]
         self.assertEqual(mock_run_command.call_args_list, calls)
@@ -356,7 +367,13 @@ class TestComponents(tests.TestBase):
             cache=tests.FakeCache(),
             job={"packages": ["kernel", "gcc"]},
         )
-        calls = [call(command="dnf -q -y install kernel gcc", env=None)]
+        calls = [
+            call(
+                command="dnf -q -y install kernel gcc",
+                env=None,
+                **self._dnf.run_command_options,
+            )
+        ]
         self.assertEqual(mock_run_command.call_args_list, calls)
         self.assertFalse(outcome)
 
@@ -368,9 +385,21 @@ class TestComponents(tests.TestBase):
             job={"packages": ["kernel", "gcc"], "clear": True},
         )
         calls = [
-            call(command="dnf clean all", env=None),
-            call(command="dnf makecache", env=None),
-            call(command="dnf -q -y install kernel gcc", env=None),
+            call(
+                command="dnf clean all",
+                env=None,
+                **self._dnf.run_command_options,
+            ),
+            call(
+                command="dnf makecache",
+                env=None,
+                **self._dnf.run_command_options,
+            ),
+            call(
+                command="dnf -q -y install kernel gcc",
+                env=None,
+                **self._dnf.run_command_options,
+            ),
         ]
         self.assertEqual(mock_run_command.call_args_list, calls)
         self.assertTrue(outcome)
@@ -383,7 +412,11 @@ class TestComponents(tests.TestBase):
             job={"packages": ["kernel", "gcc"], "state": "latest"},
         )
         calls = [
-            call(command="dnf -q -y --best install kernel gcc", env=None),
+            call(
+                command="dnf -q -y --best install kernel gcc",
+                env=None,
+                **self._dnf.run_command_options,
+            ),
         ]
         self.assertEqual(mock_run_command.call_args_list, calls)
         self.assertTrue(outcome)
@@ -406,6 +439,7 @@ class TestComponents(tests.TestBase):
                     "install kernel gcc"
                 ),
                 env=None,
+                **self._dnf.run_command_options,
             ),
         ]
         self.assertEqual(mock_run_command.call_args_list, calls)
@@ -418,7 +452,13 @@ class TestComponents(tests.TestBase):
             cache=tests.FakeCache(),
             job={"packages": ["kernel", "gcc"], "state": "absent"},
         )
-        calls = [call(command="dnf -q -y remove kernel gcc", env=None)]
+        calls = [
+            call(
+                command="dnf -q -y remove kernel gcc",
+                env=None,
+                **self._dnf.run_command_options,
+            )
+        ]
         self.assertEqual(mock_run_command.call_args_list, calls)
         self.assertTrue(outcome)
 
@@ -437,6 +477,7 @@ class TestComponents(tests.TestBase):
             call(
                 command="dnf -q -y --exclude=libexec,unzip remove kernel gcc",
                 env=None,
+                **self._dnf.run_command_options,
             )
         ]
         self.assertEqual(mock_run_command.call_args_list, calls)
@@ -449,7 +490,13 @@ class TestComponents(tests.TestBase):
             cache=tests.FakeCache(),
             job={"services": ["httpd.service"]},
         )
-        calls = [call(command="systemctl start httpd.service", env=None)]
+        calls = [
+            call(
+                command="systemctl start httpd.service",
+                env=None,
+                **self._service.run_command_options,
+            )
+        ]
         self.assertEqual(mock_run_command.call_args_list, calls)
         self.assertTrue(outcome)
 
@@ -460,7 +507,13 @@ class TestComponents(tests.TestBase):
             cache=tests.FakeCache(),
             job={"services": ["httpd.service"]},
         )
-        calls = [call(command="systemctl start httpd.service", env=None)]
+        calls = [
+            call(
+                command="systemctl start httpd.service",
+                env=None,
+                **self._service.run_command_options,
+            )
+        ]
         self.assertEqual(mock_run_command.call_args_list, calls)
         self.assertFalse(outcome)
 
@@ -472,8 +525,16 @@ class TestComponents(tests.TestBase):
             job={"services": ["httpd.service"], "state": "enable"},
         )
         calls = [
-            call(command="systemctl enable httpd.service", env=None),
-            call(command="systemctl start httpd.service", env=None),
+            call(
+                command="systemctl enable httpd.service",
+                env=None,
+                **self._service.run_command_options,
+            ),
+            call(
+                command="systemctl start httpd.service",
+                env=None,
+                **self._service.run_command_options,
+            ),
         ]
         self.assertEqual(mock_run_command.call_args_list, calls)
         self.assertTrue(outcome)
@@ -485,7 +546,13 @@ class TestComponents(tests.TestBase):
             cache=tests.FakeCache(),
             job={"services": ["httpd.service"], "state": "enable"},
         )
-        calls = [call(command="systemctl enable httpd.service", env=None)]
+        calls = [
+            call(
+                command="systemctl enable httpd.service",
+                env=None,
+                **self._service.run_command_options,
+            )
+        ]
         self.assertEqual(mock_run_command.call_args_list, calls)
         self.assertFalse(outcome)
 
@@ -501,8 +568,16 @@ class TestComponents(tests.TestBase):
             },
         )
         calls = [
-            call(command="systemctl disable httpd.service", env=None),
-            call(command="systemctl stop httpd.service", env=None),
+            call(
+                command="systemctl disable httpd.service",
+                env=None,
+                **self._service.run_command_options,
+            ),
+            call(
+                command="systemctl stop httpd.service",
+                env=None,
+                **self._service.run_command_options,
+            ),
         ]
         self.assertTrue(outcome)
         self.assertEqual(mock_run_command.call_args_list, calls)
@@ -520,9 +595,21 @@ class TestComponents(tests.TestBase):
             },
         )
         calls = [
-            call(command="systemctl mask httpd.service", env=None),
-            call(command="systemctl disable httpd.service", env=None),
-            call(command="systemctl stop httpd.service", env=None),
+            call(
+                command="systemctl mask httpd.service",
+                env=None,
+                **self._service.run_command_options,
+            ),
+            call(
+                command="systemctl disable httpd.service",
+                env=None,
+                **self._service.run_command_options,
+            ),
+            call(
+                command="systemctl stop httpd.service",
+                env=None,
+                **self._service.run_command_options,
+            ),
         ]
         self.assertEqual(mock_run_command.call_args_list, calls)
         self.assertTrue(outcome)
@@ -539,9 +626,21 @@ class TestComponents(tests.TestBase):
             },
         )
         calls = [
-            call(command="systemctl unmask httpd.service", env=None),
-            call(command="systemctl enable httpd.service", env=None),
-            call(command="systemctl start httpd.service", env=None),
+            call(
+                command="systemctl unmask httpd.service",
+                env=None,
+                **self._service.run_command_options,
+            ),
+            call(
+                command="systemctl enable httpd.service",
+                env=None,
+                **self._service.run_command_options,
+            ),
+            call(
+                command="systemctl start httpd.service",
+                env=None,
+                **self._service.run_command_options,
+            ),
         ]
         self.assertEqual(mock_run_command.call_args_list, calls)
         self.assertTrue(outcome)
@@ -554,7 +653,11 @@ class TestComponents(tests.TestBase):
             job={"services": ["httpd.service"], "running": "reload"},
         )
         calls = [
-            call(command="systemctl reload httpd.service", env=None),
+            call(
+                command="systemctl reload httpd.service",
+                env=None,
+                **self._service.run_command_options,
+            ),
         ]
         self.assertTrue(outcome)
         self.assertEqual(mock_run_command.call_args_list, calls)
@@ -634,6 +737,25 @@ class TestComponents(tests.TestBase):
             start_new_session=False,
         )
 
+    @patch("subprocess.Popen")
+    def test_run_command_no_block(self, popen):
+        popen.return_value = tests.FakePopen()
+        with patch("os.environ", {"testBaseEnv": "value"}):
+            stdout, _, outcome = components.ComponentBase().run_command(
+                command="test_command", no_block=True
+            )
+        self.assertIsNone(stdout)
+        self.assertEqual(outcome, True)
+        popen.assert_called_with(
+            "test_command",
+            stdout=-1,
+            stderr=-1,
+            executable="/bin/sh",
+            env={"testBaseEnv": "value"},
+            shell=True,
+            start_new_session=True,
+        )
+
     def test_file_blueprinter(self):
         fake_cache = tests.FakeCache()
         with patch(
@@ -660,7 +782,10 @@ class TestComponents(tests.TestBase):
             job={"command": "command {{ test }} test"},
         )
         mock_run_command.assert_called_with(
-            command="command 1 test", env=None, no_block=None
+            command="command 1 test",
+            env=None,
+            no_block=None,
+            **self._run.run_command_options,
         )
 
     @patch("directord.components.ComponentBase.run_command")
@@ -675,7 +800,10 @@ class TestComponents(tests.TestBase):
             },
         )
         mock_run_command.assert_called_with(
-            command="command 1 test", env=None, no_block=None
+            command="command 1 test",
+            env=None,
+            no_block=None,
+            **self._run.run_command_options,
         )
 
     @patch("directord.components.ComponentBase.run_command")
@@ -691,7 +819,29 @@ class TestComponents(tests.TestBase):
             },
         )
         mock_run_command.assert_called_with(
-            command="command 1 test", env=None, no_block=None
+            command="command 1 test",
+            env=None,
+            no_block=None,
+            **self._run.run_command_options,
+        )
+
+    @patch("directord.components.ComponentBase.run_command")
+    def test__run_command_stdout_args_truncated(self, mock_run_command):
+        mock_run_command.return_value = [
+            "testing \u00e9".encode()[:-1],
+            b"",
+            True,
+        ]
+        fake_cache = tests.FakeCache()
+        self._run.client(
+            cache=fake_cache,
+            job={
+                "command": "command {{ test }} test",
+                "stdout_arg": "VALUE1",
+            },
+        )
+        self.assertEqual(
+            self._run.block_on_tasks[0]["args"], {"VALUE1": "testing \ufffd"}
         )
 
     @patch("os.makedirs", autospec=True)
@@ -758,6 +908,138 @@ class TestComponents(tests.TestBase):
             blueprinted_content, "Can't compile non template nodes"
         )
 
+    def test_blueprinter_template_cache(self):
+        components._blueprint_template.cache_clear()
+        with patch.object(
+            components.blueprint_environment(),
+            "from_string",
+            wraps=components.blueprint_environment().from_string,
+        ) as mock_from_string:
+            for i in range(3):
+                _, blueprinted_content = self.components.blueprinter(
+                    content=tests.TEST_BLUEPRINT_CONTENT, values={"test": i}
+                )
+                self.assertEqual(
+                    blueprinted_content,
+                    "This is a blueprint string {}".format(i),
+                )
+        mock_from_string.assert_called_once_with(tests.TEST_BLUEPRINT_CONTENT)
+        self.assertIs(
+            self.components.blueprint, components.blueprint_environment()
+        )
+
+    def test_output_buffer(self):
+        output = components.OutputBuffer()
+        output.write(b"a" * 100)
+        output.write(b"b" * 100)
+        self.assertFalse(output.truncated)
+        self.assertEqual(output.getvalue(), b"a" * 100 + b"b" * 100)
+
+    def test_output_buffer_limit(self):
+        output = components.OutputBuffer(limit=10)
+        output.write(b"a" * 8)
+        output.write(b"b" * 8)
+        output.write(b"c" * 8)
+        self.assertTrue(output.truncated)
+        self.assertEqual(len(output.head) + len(output.tail), 10)
+        self.assertEqual(
+            output.getvalue(),
+            b"aaaaa\n[ ... 14 bytes truncated ... ]\nccccc",
+        )
+
+    def test_output_buffer_spill(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            output = components.OutputBuffer(limit=10, spill_path=tempdir)
+            output.write(b"a" * 8)
+            self.assertIsNone(output.spill_file)
+            output.write(b"b" * 8)
+            output.close()
+            self.assertIn(output.spill_file.name.encode(), output.getvalue())
+            with open(output.spill_file.name, "rb") as f:
+                self.assertEqual(f.read(), b"a" * 8 + b"b" * 8)
+
+    def test_run_command_output_limit(self):
+        stdout, stderr, outcome = self.components.run_command(
+            command="yes | head -c 100000; echo error >&2",
+            output_limit=64,
+        )
+        self.assertTrue(outcome)
+        self.assertIn(b"99936 bytes truncated", stdout)
+        self.assertEqual(stderr, b"error\n")
+
+    def test_run_command_output_limit_component(self):
+        self.components.output_limit = 64
+        stdout, _, outcome = self.components.run_command(
+            command="yes | head -c 100000; exit 2",
+            **self.components.run_command_options,
+        )
+        self.assertFalse(outcome)
+        self.assertIn(b"99936 bytes truncated", stdout)
+
+    def test_run_command_output_callback(self):
+        updates = list()
+        self.components.output_stream_interval = 0.01
+        self.components.output_callback = lambda **kwargs: updates.append(
+            kwargs
+        )
+        stdout, stderr, outcome = self.components.run_command(
+            command="echo line1; sleep 0.2; echo line2; echo error >&2",
+            **self.components.run_command_options,
+        )
+        self.assertTrue(outcome)
+        self.assertEqual(stdout, b"line1\nline2\n")
+        self.assertEqual(stderr, b"error\n")
+        # NOTE(cloudnull): Output pending when the command exits is sent
+        #                  with the final job status.
+        self.assertEqual(updates, [{"stdout": "line1\n", "stderr": ""}])
+
+    def test_timeout_kill_process_group(self):
+        job = {
+            "command": "sleep 30 & sleep 30",
+            "timeout": 0.5,
+            "job_id": "XXX",
+        }
+        with patch.object(
+            self._run, "kill_processes", wraps=self._run.kill_processes
+        ) as mock_kill_processes:
+            stdout, stderr, outcome, _ = self._run.client(
+                cache=self.fake_cache, job=job
+            )
+        self.assertFalse(outcome)
+        self.assertEqual(stderr, "Timeout encountered")
+        mock_kill_processes.assert_called_once()
+        self.assertFalse(self._run.processes)
+        self.assertTrue(self._run.cancelled.is_set())
+
+    @patch("subprocess.Popen")
+    def test_run_command_cancelled(self, popen):
+        self.components.cancelled.set()
+        stdout, stderr, outcome = self.components.run_command(
+            command="test_command", **self.components.run_command_options
+        )
+        self.assertIsNone(stdout)
+        self.assertEqual(stderr, "Command cancelled")
+        self.assertFalse(outcome)
+        popen.assert_not_called()
+
+    def test_run_command_options_timeout(self):
+        self.assertFalse(
+            self.components.run_command_options["start_new_session"]
+        )
+        self.components.timeout = 5
+        self.assertTrue(
+            self.components.run_command_options["start_new_session"]
+        )
+
+    def test_kill_processes(self):
+        process = subprocess.Popen(
+            "sleep 30 & sleep 30", shell=True, start_new_session=True
+        )
+        self.components.processes.add(process)
+        self.components.kill_processes(grace=1)
+        self.assertFalse(self.components.processes)
+        self.assertEqual(process.wait(timeout=5), -signal.SIGTERM)
+
     @patch("time.sleep")
     def test_wait_seconds(self, mock_sleep):
         stdout, stderr, outcome, return_info = self._wait.client(
@@ -825,8 +1107,16 @@ class TestComponents(tests.TestBase):
 
         mock_sleep.assert_called_once_with(5)
         run_calls = [
-            call(command="curl -k http://google.com", env=None),
-            call(command="curl -k http://google.com", env=None),
+            call(
+                command="curl -k http://google.com",
+                env=None,
+                **self._wait.run_command_options,
+            ),
+            call(
+                command="curl -k http://google.com",
+                env=None,
+                **self._wait.run_command_options,
+            ),
         ]
         self.assertEqual(mock_run_command.mock_calls, run_calls)
 
@@ -841,7 +1131,24 @@ class TestComponents(tests.TestBase):
         self.assertFalse(outcome)
 
         mock_sleep.assert_not_called()
-        mock_run_command.assert_called_once_with(command="foo", env=None)
+        mock_run_command.assert_called_once_with(
+            command="foo", env=None, **self._wait.run_command_options
+        )
+
+    @patch("directord.components.ComponentBase.run_command")
+    @patch("time.sleep")
+    def test_wait_cmd_cancelled(self, mock_sleep, mock_run_command):
+        def _run_command(*args, **kwargs):
+            self._wait.cancelled.set()
+            return b"", b"", False
+
+        mock_run_command.side_effect = _run_command
+        stdout, stderr, outcome, return_info = self._wait.client(
+            cache=tests.FakeCache(),
+            job={"command": "foo", "retry": 5, "retry_wait": 5},
+        )
+        self.assertFalse(outcome)
+        mock_run_command.assert_called_once()
 
     @patch("directord.components.lib.podman.PodmanClient", autospec=True)
     def test_podman_connect_call(self, mock_podman_client):
@@ -12,6 +12,11 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 
+import asyncio
+from concurrent import futures
+import queue
+import tempfile
+import time
 import unittest
 
 import unittest.mock as mock
@@ -75,6 +80,7 @@ class TestDriverGrpcdServerMode(tests.TestBase):
             "/etc/pki/ca-trust/source/anchors/cm-local-ca.pem",
             "/etc/directord/grpc/ssl/directord.crt",
             "/etc/directord/grpc/ssl/directord.key",
+            1,
         )
 
     def test_backend_init(self):
@@ -145,12 +151,17 @@ class TestDriverGrpcdServerMode(tests.TestBase):
         mock_data.stdout = "stdout"
         mock_data.stderr = "stderr"
 
-        self.driver._client.get_job.return_value = ("target", mock_data)
+        self.driver._client.get_job.side_effect = [
+            ("target", None),
+            ("target", mock_data),
+        ]
 
         self.driver.job_check = mock_job_check
 
         data = self.driver.job_recv()
 
+        self.assertEqual(self.driver._client.get_job.call_count, 2)
+
         self.assertEqual(
             data,
             [
@@ -165,6 +176,49 @@ class TestDriverGrpcdServerMode(tests.TestBase):
             ],
         )
 
+    def test_job_recv_streaming(self):
+        """Test job recv using a subscription."""
+        mock_data = mock.Mock()
+        mock_data.identity = "identity"
+        mock_data.msg_id = "msg_id"
+        mock_data.control = "control"
+        mock_data.command = "command"
+        mock_data.data = "{}"
+        mock_data.info = "info"
+        mock_data.stdout = "stdout"
+        mock_data.stderr = "stderr"
+        subscription = grpcd.Subscription()
+        subscription.put(mock_data)
+        self.driver._client.subscribe.return_value = subscription
+        self.driver.streaming = True
+
+        data = self.driver.job_recv()
+
+        self.driver._client.subscribe.assert_called_once_with(
+            "SubscribeJobs", "DIRECTORD_SERVER"
+        )
+        self.driver._client.get_job.assert_not_called()
+        self.assertEqual(
+            data,
+            [
+                "identity",
+                "msg_id",
+                "control",
+                "command",
+                "{}",
+                "info",
+                "stderr",
+                "stdout",
+            ],
+        )
+
+    def test_job_recv_streaming_nonblocking(self):
+        """Test non-blocking job recv using an empty subscription."""
+        self.driver._client.subscribe.return_value = grpcd.Subscription()
+        self.driver.streaming = True
+        self.assertRaises(queue.Empty, self.driver.job_recv, nonblocking=True)
+        self.driver._client.get_job.assert_not_called()
+
     def test_backend_send(self):
         """Test backend send."""
         mock_put = mock.MagicMock()
@@ -320,6 +374,19 @@ class TestDriverGrpcdServerMode(tests.TestBase):
         mock_put.reset_mock()
         mock_put.side_effect = Exception("err")
         self.assertRaises(Exception, self.driver.job_send)
+        metrics = self.driver.get_metrics()
+        self.assertEqual(metrics["sent"]["job"]["unknown"]["messages"], 3)
+        self.assertEqual(metrics["send_failures"], 1)
+
+    def test_get_queue_depths(self):
+        """Test queue depths are reported from the server queues."""
+        grpcd.JobQueue.instance().purge_queue()
+        grpcd.MessageQueue.instance().purge_queue()
+        grpcd.JobQueue.instance().add_queue("target", "data")
+        depths = self.driver.get_metrics()["queues"]
+        self.assertEqual(depths["backend"], {})
+        self.assertEqual(depths["job"]["target"]["depth"], 1)
+        grpcd.JobQueue.instance().purge_queue()
 
     @mock.patch("time.sleep")
     def test_backend_check(self, mock_sleep):
@@ -342,6 +409,20 @@ class TestDriverGrpcdServerMode(tests.TestBase):
         self.driver._client.job_check.return_value = False
         self.assertFalse(self.driver.job_check())
         mock_sleep.assert_called_once_with(self.driver.timeout)
+        poll = self.driver.get_metrics()["poll"]["job"]
+        self.assertEqual(poll["count"], 2)
+        self.assertEqual(poll["ready"], 1)
+
+    @mock.patch("time.sleep")
+    def test_job_check_streaming(self, mock_sleep):
+        """Test job check function using a subscription."""
+        subscription = self.driver._client.subscribe.return_value
+        subscription.wait.return_value = True
+        self.driver.streaming = True
+        self.assertTrue(self.driver.job_check(constant=2000))
+        subscription.wait.assert_called_once_with(timeout=2)
+        self.driver._client.job_check.assert_not_called()
+        mock_sleep.assert_not_called()
 
     @mock.patch("directord.utils.get_uuid", return_value="uuid")
     def test_hearbeat_send(self, mock_uuid):
@@ -361,6 +442,28 @@ class TestDriverGrpcdServerMode(tests.TestBase):
             ),
         )
 
+    @mock.patch("time.time", return_value=1)
+    @mock.patch("directord.utils.get_uuid", return_value="uuid")
+    def test_hearbeat_send_flow_control(self, mock_uuid, mock_time):
+        mock_job_send = mock.MagicMock()
+        self.driver.job_send = mock_job_send
+        self.driver.machine_id = "machine_id"
+        self.driver.heartbeat_send(
+            1, 1, 1, "grpcd", max_inflight_jobs=4, slots=3
+        )
+        mock_job_send.assert_called_once_with(
+            target="DIRECTORD_SERVER",
+            identity="DIRECTORD_SERVER",
+            control="\x05",
+            msg_id="uuid",
+            data=(
+                '{"job_id": "uuid", "version": 1, "host_uptime": 1, '
+                '"agent_uptime": 1, "machine_id": "machine_id", '
+                '"driver": "grpcd", "max_inflight_jobs": 4, "slots": 3, '
+                '"slots_timestamp": 1}'
+            ),
+        )
+
     def test_backend_close(self):
         """Test backend close"""
         mock_log = mock.MagicMock()
@@ -381,6 +484,74 @@ class TestDriverGrpcdServerMode(tests.TestBase):
             "skipping close."
         )
 
+    @unittest.skipIf(grpcd.grpc_aio is None, "grpc.aio is not available")
+    def test_job_send_async(self):
+        """Test job send using the asyncio channel."""
+        aio_request = self.driver._client.aio_request = mock.AsyncMock()
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        self.assertTrue(
+            loop.run_until_complete(
+                self.driver.job_send_async(
+                    identity="bar", msg_id="msg_id", control="\x04"
+                )
+            )
+        )
+        method, request = aio_request.await_args.args
+        self.assertEqual(method, "PutJob")
+        self.assertEqual(request.target, "bar")
+        self.assertEqual(request.data.msg_id, "msg_id")
+        sent = self.driver.get_metrics()["sent"]
+        self.assertEqual(sent["job"]["job_end"]["messages"], 1)
+
+    @unittest.skipIf(grpcd.grpc_aio is None, "grpc.aio is not available")
+    def test_backend_recv_async(self):
+        """Test backend recv using the asyncio channel."""
+        mock_data = mock.Mock()
+        mock_data.identity = "identity"
+        mock_data.msg_id = "msg_id"
+        mock_data.control = "control"
+        mock_data.command = "command"
+        mock_data.data = ""
+        mock_data.info = "info"
+        mock_data.stdout = "stdout"
+        mock_data.stderr = "stderr"
+        aio_request = self.driver._client.aio_request = mock.AsyncMock()
+        aio_request.side_effect = [
+            mock.Mock(has_data=True),
+            mock.Mock(status=True, data=mock_data),
+        ]
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        self.assertEqual(
+            loop.run_until_complete(self.driver.backend_recv_async()),
+            [
+                "identity",
+                "msg_id",
+                "control",
+                "command",
+                "{}",
+                "info",
+                "stderr",
+                "stdout",
+            ],
+        )
+        self.assertEqual(
+            [i.args[0] for i in aio_request.await_args_list],
+            ["MessageCheck", "GetMessage"],
+        )
+
+    @mock.patch("directord.drivers.grpcd.grpc_aio", None)
+    def test_job_check_async_fallback(self):
+        """Test job check runs the blocking check without grpc.aio."""
+        self.driver._client.job_check.return_value = True
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        self.assertTrue(loop.run_until_complete(self.driver.job_check_async()))
+        self.driver._client.job_check.assert_called_once_with(
+            self.driver.identity
+        )
+
 
 class TestDriverGrpcdClientMode(tests.TestBase):
     def setUp(self):
@@ -413,6 +584,7 @@ class TestDriverGrpcdClientMode(tests.TestBase):
             "/etc/pki/ca-trust/source/anchors/cm-local-ca.pem",
             "/etc/directord/grpc/ssl/directord.crt",
             "/etc/directord/grpc/ssl/directord.key",
+            1,
         )
 
     def test_backend_recv(self):
@@ -516,8 +688,8 @@ class TestGrpcQueueBase(tests.TestBase):
 
     def test_add(self):
         """Test queue add."""
-        self.queue.add_queue("foo", "bar")
-        self.assertEqual(self.queue._data_queue.get("foo").get(), "bar")
+        self.assertTrue(self.queue.add_queue("foo", "bar"))
+        self.assertEqual(self.queue._data_queue.get("foo").get()[2], "bar")
 
     def test_get(self):
         """Test queue get."""
@@ -533,11 +705,94 @@ class TestGrpcQueueBase(tests.TestBase):
         self.queue.get_from_queue("foo")
         self.assertFalse(self.queue.check_queue("foo"))
 
+    def test_get_many(self):
+        """Test queue get many."""
+        self.assertEqual(self.queue.get_many_from_queue("foo", 2), [])
+        for i in ["bar", "baz", "qux"]:
+            self.queue.add_queue("foo", i)
+        self.assertEqual(
+            self.queue.get_many_from_queue("foo", 2), ["bar", "baz"]
+        )
+        self.assertEqual(self.queue.get_many_from_queue("foo", 2), ["qux"])
+
+    def test_wait(self):
+        """Test queue wait."""
+        self.assertEqual(self.queue.wait_from_queue("foo", timeout=0), None)
+        self.queue.add_queue("foo", "bar")
+        self.assertEqual(self.queue.wait_from_queue("foo", timeout=0), "bar")
+
     def test_stats(self):
         """Test queue stats."""
-        self.assertEqual(self.queue.get_stats(), {"targets": []})
+        self.assertEqual(self.queue.get_stats(), {"targets": [], "queues": {}})
         self.queue.add_queue("foo", "bar")
-        self.assertEqual(self.queue.get_stats(), {"targets": ["foo"]})
+        stats = self.queue.get_stats()
+        self.assertEqual(stats["targets"], ["foo"])
+        self.assertEqual(stats["queues"]["foo"]["depth"], 1)
+        self.assertEqual(stats["queues"]["foo"]["bytes"], 3)
+        self.assertEqual(stats["queues"]["foo"]["puts"], 1)
+        self.queue.get_from_queue("foo")
+        stats = self.queue.get_stats()
+        self.assertEqual(stats["queues"]["foo"]["depth"], 0)
+        self.assertEqual(stats["queues"]["foo"]["bytes"], 0)
+        self.assertEqual(stats["queues"]["foo"]["gets"], 1)
+
+    def test_max_depth_reject(self):
+        """Test queue rejects items when full."""
+        self.queue.configure(max_depth=2)
+        self.assertTrue(self.queue.add_queue("foo", "bar"))
+        self.assertTrue(self.queue.add_queue("foo", "baz"))
+        self.assertFalse(self.queue.add_queue("foo", "qux"))
+        self.assertEqual(
+            self.queue.get_many_from_queue("foo", 3), ["bar", "baz"]
+        )
+        stats = self.queue.get_stats()
+        self.assertEqual(stats["queues"]["foo"]["rejected"], 1)
+
+    def test_max_depth_drop_oldest(self):
+        """Test queue drops the oldest items when full."""
+        self.queue.configure(max_depth=2, overflow="drop-oldest")
+        for i in ["bar", "baz", "qux"]:
+            self.assertTrue(self.queue.add_queue("foo", i))
+        self.assertEqual(
+            self.queue.get_many_from_queue("foo", 3), ["baz", "qux"]
+        )
+        stats = self.queue.get_stats()
+        self.assertEqual(stats["queues"]["foo"]["dropped"], 1)
+
+    def test_max_bytes(self):
+        """Test queue rejects items over the byte limit."""
+        self.queue.configure(max_bytes=5)
+        self.assertTrue(self.queue.add_queue("foo", "bar"))
+        self.assertFalse(self.queue.add_queue("foo", "baz"))
+        self.assertTrue(self.queue.add_queue("foo", "q"))
+
+    def test_ttl(self):
+        """Test queue expires items."""
+        self.queue.configure(ttl=10)
+        with mock.patch("time.time", return_value=100):
+            self.queue.add_queue("foo", "bar")
+        with mock.patch("time.time", return_value=105):
+            self.queue.add_queue("foo", "baz")
+        with mock.patch("time.time", return_value=112):
+            self.assertEqual(self.queue.get_from_queue("foo"), "baz")
+            stats = self.queue.get_stats()
+        self.assertEqual(stats["queues"]["foo"]["expired"], 1)
+        self.assertEqual(stats["queues"]["foo"]["bytes"], 0)
+
+    def test_flush_restore(self):
+        """Test queue persistence."""
+        with tempfile.TemporaryDirectory() as path:
+            self.queue.configure(path=path)
+            self.queue.add_queue("foo", "bar")
+            self.queue.add_queue("foo", "baz")
+            self.queue.flush()
+            grpcd.QueueBase._instance = None
+            restored = grpcd.QueueBase.instance()
+            restored.configure(path=path)
+            self.assertEqual(restored.get_stats()["targets"], ["foo"])
+            self.assertEqual(
+                restored.get_many_from_queue("foo", 3), ["bar", "baz"]
+            )
 
     def test_purge(self):
         """Test queue purge."""
@@ -546,6 +801,190 @@ class TestGrpcQueueBase(tests.TestBase):
         self.assertEqual(self.queue._data_queue, {})
 
 
+class TestGrpcSubscription(tests.TestBase):
+    def setUp(self):
+        super().setUp()
+        grpcd.JobQueue._instance = None
+
+    def tearDown(self):
+        super().tearDown()
+        grpcd.JobQueue._instance = None
+
+    def test_subscription(self):
+        """Test subscription buffer."""
+        subscription = grpcd.Subscription()
+        self.assertFalse(subscription.wait(timeout=0))
+        subscription.put("foo")
+        subscription.put("bar")
+        self.assertTrue(subscription.wait(timeout=0))
+        self.assertEqual(subscription.get(), "foo")
+        self.assertEqual(subscription.get(), "bar")
+        self.assertFalse(subscription.wait(timeout=0))
+        self.assertRaises(queue.Empty, subscription.get, block=False)
+
+    def test_subscribe_jobs(self):
+        """Test job subscriptions stream queued jobs."""
+        servicer = grpcd.MessageServiceServicer(mock.MagicMock())
+        request = mock.MagicMock()
+        request.target = "foo"
+        context = mock.MagicMock()
+        context.is_active.side_effect = [True, True, True, False]
+        grpcd.JobQueue.instance().add_queue("foo", "bar")
+        with mock.patch.object(
+            grpcd.JobQueue.instance(), "wait_from_queue"
+        ) as mock_wait:
+            mock_wait.side_effect = ["bar", None]
+            self.assertEqual(
+                list(servicer.SubscribeJobs(request, context)), ["bar"]
+            )
+
+    def test_subscribe_jobs_inactive(self):
+        """Test job subscriptions requeue jobs for inactive subscribers."""
+        servicer = grpcd.MessageServiceServicer(mock.MagicMock())
+        request = mock.MagicMock()
+        request.target = "foo"
+        context = mock.MagicMock()
+        context.is_active.side_effect = [True, False]
+        job_queue = grpcd.JobQueue.instance()
+        job_queue.add_queue("foo", "bar")
+
+        def _wait_from_queue(target, timeout=None):
+            data = job_queue.get_from_queue(target)
+            job_queue.add_queue(target, "baz")
+            return data
+
+        with mock.patch.object(job_queue, "wait_from_queue") as mock_wait:
+            mock_wait.side_effect = _wait_from_queue
+            self.assertEqual(
+                list(servicer.SubscribeJobs(request, context)), []
+            )
+        self.assertEqual(job_queue.get_from_queue("foo"), "bar")
+        self.assertEqual(job_queue.get_from_queue("foo"), "baz")
+        stats = job_queue.get_stats()["queues"]["foo"]
+        self.assertEqual(stats["bytes"], 0)
+        self.assertEqual(stats["gets"], 2)
+
+
+@unittest.skipIf(GRPC_UNAVAILABLE, "grpc library unavailable")
+class TestGrpcBatch(tests.TestBase):
+    def setUp(self):
+        super().setUp()
+        grpcd.JobQueue._instance = None
+        grpcd.MessageServiceClient._instance = None
+        with mock.patch(
+            "directord.drivers.grpcd.MessageServiceClient.connect"
+        ):
+            self.client = grpcd.MessageServiceClient.instance(
+                mock.MagicMock(), "localhost", 5558, batch_size=2
+            )
+        self.client.stub = mock.MagicMock()
+
+    def tearDown(self):
+        super().tearDown()
+        grpcd.JobQueue._instance = None
+        grpcd.MessageServiceClient._instance = None
+
+    def test_get_jobs(self):
+        """Test batched jobs are served from the local buffer."""
+        self.client.stub.GetJobs.return_value = grpcd.msg_pb2.BatchResponse(
+            target="foo",
+            data=[
+                grpcd.msg_pb2.MessageData(msg_id="bar"),
+                grpcd.msg_pb2.MessageData(msg_id="baz"),
+            ],
+        )
+        self.assertFalse(self.client._batch_buffered("GetJobs", "foo"))
+        _, data = self.client.get_job("foo")
+        self.assertEqual(data.msg_id, "bar")
+        self.assertTrue(self.client.job_check("foo"))
+        _, data = self.client.get_job("foo")
+        self.assertEqual(data.msg_id, "baz")
+        self.client.stub.GetJobs.assert_called_once()
+        self.client.stub.GetJob.assert_not_called()
+
+    def test_put_jobs(self):
+        """Test jobs are sent using batch calls."""
+        self.client.stub.PutJobs.return_value = grpcd.msg_pb2.Status(
+            result=True
+        )
+        pending = [futures.Future(), futures.Future()]
+        self.client._batch_pending["PutJobs"].extend(
+            [(grpcd.msg_pb2.BatchItem(target="foo"), i) for i in pending]
+        )
+        self.assertTrue(self.client.put_job("foo", "identity", msg_id="bar"))
+        self.assertEqual(self.client.stub.PutJobs.call_count, 2)
+        self.assertTrue(all(i.result(timeout=0) for i in pending))
+        self.client.stub.PutJob.assert_not_called()
+        self.assertFalse(self.client._batch_pending["PutJobs"])
+        self.assertFalse(self.client._batch_sending)
+
+    def test_put_jobs_rpc_error(self):
+        """Test pending jobs get the result of the call which sent them."""
+
+        class RpcError(grpc.RpcError):
+            def code(self):
+                return grpc.StatusCode.UNAVAILABLE
+
+            def details(self):
+                return "unavailable"
+
+        self.client.stub.PutJobs.side_effect = RpcError
+        pending = futures.Future()
+        self.client._batch_pending["PutJobs"].append(
+            (grpcd.msg_pb2.BatchItem(target="foo"), pending)
+        )
+        self.assertFalse(self.client.put_job("foo", "identity", msg_id="bar"))
+        self.assertFalse(pending.result(timeout=0))
+        self.client.stub.PutJobs.assert_called_once()
+        self.assertFalse(self.client._batch_sending)
+
+    def test_put_jobs_failure(self):
+        """Test pending jobs fail when a batch send fails."""
+        self.client.stub.PutJobs.side_effect = ValueError
+        pending = futures.Future()
+        self.client._batch_pending["PutJobs"].append(
+            (grpcd.msg_pb2.BatchItem(target="foo"), pending)
+        )
+        self.assertRaises(
+            ValueError, self.client.put_job, "foo", "identity", msg_id="bar"
+        )
+        self.assertRaises(ValueError, pending.result, timeout=0)
+        self.assertFalse(self.client._batch_pending["PutJobs"])
+        self.assertFalse(self.client._batch_sending)
+
+    def test_put_jobs_sending(self):
+        """Test jobs wait for the result of a batch send in progress."""
+        self.client._batch_sending.add("PutJobs")
+        with futures.ThreadPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(
+                self.client.put_job, "foo", "identity", msg_id="bar"
+            )
+            while not self.client._batch_pending["PutJobs"]:
+                time.sleep(0.01)
+            self.client.stub.PutJobs.assert_not_called()
+            _, pending = self.client._batch_pending["PutJobs"].popleft()
+            pending.set_result(False)
+            self.assertFalse(result.result(timeout=5))
+
+    def test_servicer_jobs(self):
+        """Test batched job calls on the server."""
+        servicer = grpcd.MessageServiceServicer(mock.MagicMock())
+        request = grpcd.msg_pb2.PutBatchRequest(
+            items=[
+                grpcd.msg_pb2.BatchItem(
+                    target="foo",
+                    data=grpcd.msg_pb2.MessageData(msg_id=str(i)),
+                )
+                for i in range(3)
+            ]
+        )
+        self.assertTrue(servicer.PutJobs(request, None).result)
+        response = servicer.GetJobs(
+            grpcd.msg_pb2.GetBatchRequest(target="foo", limit=2), None
+        )
+        self.assertEqual([i.msg_id for i in response.data], ["0", "1"])
+
+
 @unittest.skipIf(GRPC_UNAVAILABLE, "grpc library unavailable")
 class TestGrpcServer(tests.TestBase):
     """Test grpc server logic."""
@@ -828,7 +1267,7 @@ class TestGrpcClient(tests.TestBase):
         grpcd.MessageServiceClient._instance = None
         obj = grpcd.MessageServiceClient.instance(mock_log, "localhost", 5558)
         mock_setup.assert_called_once_with(
-            "localhost", 5558, False, True, None, None, None
+            "localhost", 5558, False, True, None, None, None, 1
         )
 
         mock_channel = mock.MagicMock()
@@ -0,0 +1,209 @@
+#   Copyright Peznauts <kevin@cloudnull.com>. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+
+import asyncio
+import json
+import logging
+import queue
+import threading
+
+from unittest.mock import patch
+
+import tenacity
+
+from directord import drivers
+from directord import tests
+from directord.drivers import loopback
+
+
+class TestDriverLoopback(tests.TestBase):
+    def setUp(self):
+        super().setUp()
+        loopback.Exchange._instance = None
+        server_args = tests.FakeArgs()
+        server_args.mode = "server"
+        self.server = loopback.Driver(args=server_args)
+        self.client = loopback.Driver(args=tests.FakeArgs())
+
+    def tearDown(self):
+        super().tearDown()
+        loopback.Exchange._instance = None
+
+    def test_exchange_instance(self):
+        self.assertRaises(RuntimeError, loopback.Exchange)
+        self.assertEqual(
+            loopback.Exchange.instance(), loopback.Exchange.instance()
+        )
+
+    def test_identity(self):
+        self.assertEqual(self.server.identity, "DIRECTORD_SERVER")
+        self.assertEqual(self.client.identity, "test-node")
+
+    def test_heartbeat_send(self):
+        self.client.heartbeat_send(
+            host_uptime=1, agent_uptime=2, version="x", driver="loopback"
+        )
+        self.assertTrue(self.server.job_check(constant=1))
+        identity, msg_id, control, _, data, _, _, _ = self.server.job_recv()
+        self.assertEqual(identity, "test-node")
+        self.assertEqual(control, self.server.heartbeat_notice)
+        self.assertEqual(json.loads(data)["job_id"], msg_id)
+
+    def test_job_send_client(self):
+        self.server.job_send(
+            identity="test-node",
+            msg_id="XXX",
+            control=self.server.job_processing,
+            command="RUN",
+            data=b'{"job_id": "XXX"}',
+        )
+        self.assertFalse(self.server.job_check(constant=1))
+        self.assertTrue(self.client.job_check(constant=1))
+        self.assertEqual(
+            self.client.job_recv(),
+            (
+                "XXX",
+                self.server.job_processing,
+                "RUN",
+                '{"job_id": "XXX"}',
+                "\x00",
+                "\x00",
+                "\x00",
+            ),
+        )
+
+    def test_backend_send_raw(self):
+        self.server.backend_send(
+            identity="test-node", control=self.server.transfer_end, data=b"x"
+        )
+        self.assertTrue(self.client.backend_check(constant=1))
+        _, control, _, data, info, _, _ = self.client.backend_recv(raw=True)
+        self.assertEqual(control, self.server.transfer_end)
+        self.assertEqual(data, b"x")
+        self.assertEqual(info, "\x00")
+
+    def test_recv_nonblocking(self):
+        self.assertRaises(queue.Empty, self.client.job_recv, nonblocking=True)
+
+    def test_job_check_wakes_on_send(self):
+        timer = threading.Timer(0.1, self.client.job_send, kwargs={})
+        timer.start()
+        self.assertTrue(self.server.job_check(constant=5000))
+        timer.join()
+
+    def test_exchange_stats(self):
+        self.client.job_send(msg_id="XXX")
+        self.assertEqual(
+            self.client.exchange.get_stats(), {"job/DIRECTORD_SERVER": 1}
+        )
+        self.client.exchange.purge()
+        self.assertEqual(self.client.exchange.get_stats(), {})
+
+    def test_metrics(self):
+        self.client.job_send(control=self.client.job_end, data="abc")
+        self.assertTrue(self.server.job_check(constant=1))
+        self.server.job_recv()
+        self.assertFalse(self.server.job_check(constant=1))
+        self.client.backend_send(control=self.client.transfer_start)
+        sent = self.client.get_metrics()
+        self.assertEqual(sent["driver"], "loopback")
+        self.assertEqual(sent["sent"]["job"]["job_end"]["messages"], 1)
+        self.assertEqual(
+            sent["sent"]["backend"]["transfer_start"]["messages"], 1
+        )
+        self.assertEqual(
+            sent["queues"],
+            {"job/DIRECTORD_SERVER": 0, "backend/DIRECTORD_SERVER": 1},
+        )
+        received = self.server.get_metrics()
+        self.assertEqual(
+            received["received"]["job"]["job_end"]["bytes"],
+            sent["sent"]["job"]["job_end"]["bytes"],
+        )
+        self.assertEqual(received["poll"]["job"]["count"], 2)
+        self.assertEqual(received["poll"]["job"]["ready"], 1)
+        self.server.metrics.reset()
+        self.assertEqual(self.server.get_metrics()["received"], {})
+
+    def test_metrics_shared(self):
+        store = dict()
+        metrics = drivers.DriverMetrics()
+        metrics.share(store=store)
+        self.server.metrics.share(store=store)
+        metrics.record_recv(channel="job", control="\x04", parts=[b"abc"])
+        self.assertIn(metrics.key, store)
+        metrics.record_poll(channel="job", duration=1, ready=True)
+        self.assertNotIn("job", store[metrics.key]["poll"])
+        metrics.publish(force=True)
+        self.server.metrics.record_recv(
+            channel="job", control="\x04", parts=[b"abcd"]
+        )
+        received = self.server.get_metrics()
+        self.assertEqual(
+            received["received"]["job"]["job_end"],
+            {"messages": 2, "bytes": 7, "rate": 2.0},
+        )
+        self.assertEqual(received["poll"]["job"]["ready"], 1)
+        self.assertEqual(
+            metrics.snapshot()["received"]["job"]["job_end"]["messages"], 2
+        )
+
+    def test_metrics_forked(self):
+        metrics = drivers.DriverMetrics()
+        metrics.record_failure()
+        key = metrics.key
+        with patch("os.getpid", autospec=True) as mock_getpid:
+            mock_getpid.return_value = -1
+            metrics.record_retry()
+            snapshot = metrics.snapshot()
+        self.assertNotEqual(metrics.key, key)
+        self.assertEqual(snapshot["send_failures"], 0)
+        self.assertEqual(snapshot["send_retries"], 1)
+
+    def test_metrics_control_name(self):
+        self.assertEqual(
+            drivers.DriverMetrics.control_name(b"\x05"), "heartbeat_notice"
+        )
+        self.assertEqual(drivers.DriverMetrics.control_name(None), "nullbyte")
+        self.assertEqual(drivers.DriverMetrics.control_name("\x7f"), "unknown")
+
+    def test_metrics_retry(self):
+        attempts = list()
+
+        @tenacity.retry(
+            stop=tenacity.stop_after_attempt(3),
+            wait=tenacity.wait_none(),
+            before_sleep=drivers.before_sleep_log(
+                logging.getLogger(__name__), logging.DEBUG
+            ),
+        )
+        def _send(driver):
+            attempts.append(driver)
+            if len(attempts) < 3:
+                raise ValueError
+
+        _send(self.client)
+        self.assertEqual(self.client.get_metrics()["send_retries"], 2)
+
+    def test_async_interface(self):
+        async def _exchange():
+            await self.client.job_send_async(msg_id="XXX", command="RUN")
+            self.assertTrue(await self.server.job_check_async(constant=1))
+            return await self.server.job_recv_async()
+
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        message = loop.run_until_complete(_exchange())
+        self.assertEqual(message[:2], ("test-node", "XXX"))
+        self.assertEqual(message[3], "RUN")
@@ -13,6 +13,8 @@
 #   under the License.
 
 import json
+import threading
+import time
 
 from unittest.mock import MagicMock
 from unittest.mock import patch
@@ -63,6 +65,7 @@ class TestDriverMessaging(tests.TestBase):
             method="_heartbeat",
             topic="directord",
             server=ANY,
+            cast=True,
             identity="test-node",
             job_id="XXX",
             control="\x05",
@@ -80,6 +83,7 @@ class TestDriverMessaging(tests.TestBase):
             method="_heartbeat",
             topic="directord",
             server=ANY,
+            cast=True,
             identity="foohost",
             job_id="XXX",
             control="\x05",
@@ -107,6 +111,7 @@ class TestDriverMessaging(tests.TestBase):
             method="_job",
             topic="directord",
             server=ANY,
+            cast=False,
             identity=ANY,
             job_id="XXX",
             control="TESTcontrol",
@@ -116,3 +121,82 @@ class TestDriverMessaging(tests.TestBase):
             stderr="TEST STDERR",
             stdout="TEST STDOUT",
         )
+
+    @patch("oslo_messaging.RPCClient", autospec=True)
+    def test_send_call(self, mock_client):
+        self.driver._send(method="_job", topic="directord", job_id="XXX")
+        self.driver._send(method="_job", topic="directord", job_id="YYY")
+        mock_client.assert_called_once_with(
+            self.driver.transport, ANY, timeout=2, retry=3
+        )
+        mock_client.return_value.call.assert_called_with(
+            {}, "_job", job_id="YYY"
+        )
+        mock_client.return_value.cast.assert_not_called()
+
+    @patch("oslo_messaging.RPCClient", autospec=True)
+    def test_send_cast(self, mock_client):
+        self.driver._send(
+            method="_heartbeat", topic="directord", cast=True, job_id="XXX"
+        )
+        mock_client.return_value.cast.assert_called_once_with(
+            {}, "_heartbeat", job_id="XXX"
+        )
+        mock_client.return_value.call.assert_not_called()
+
+    @patch("oslo_messaging.RPCClient", autospec=True)
+    def test_send_client_per_target(self, mock_client):
+        self.driver._send(method="_job", topic="directord", server="a")
+        self.driver._send(method="_job", topic="directord", server="b")
+        self.driver._send(method="_job", topic="directord", server="a")
+        self.assertEqual(mock_client.call_count, 2)
+        self.assertEqual(len(self.driver._rpc_clients), 2)
+
+    @patch("oslo_messaging.RPCClient", autospec=True)
+    def test_rpc_client_discarded_on_failure(self, mock_client):
+        self.driver._rpc_client(topic="directord", server="directord")
+        mock_client.return_value.call.side_effect = ValueError
+        with self.assertRaises(ValueError):
+            self.driver._send.__wrapped__(
+                self.driver, method="_job", topic="directord"
+            )
+        self.assertEqual(self.driver._rpc_clients, {})
+        self.assertEqual(self.driver.metrics.send_failures, 1)
+
+    @patch("oslo_messaging.RPCClient", autospec=True)
+    def test_send_metrics(self, mock_client):
+        self.driver._send(
+            method="_backend",
+            topic="directord-backend",
+            identity="test-node",
+            job_id="XXX",
+            control="\x02",
+        )
+        metrics = self.driver.get_metrics()
+        self.assertEqual(
+            metrics["sent"]["backend"]["transfer_start"]["bytes"], 13
+        )
+        self.assertEqual(metrics["send_time"]["backend"]["count"], 1)
+
+    def test_job_check(self):
+        self.assertFalse(self.driver.job_check(constant=1))
+        job = ["XXX", "\x16", "RUN", "{}", None, None, None]
+        self.driver.job_q.put(job)
+        self.assertTrue(self.driver.job_check(constant=1))
+        self.assertEqual(self.driver.job_recv(), job)
+        metrics = self.driver.get_metrics()
+        self.assertEqual(metrics["poll"]["job"]["count"], 2)
+        self.assertEqual(metrics["poll"]["job"]["ready"], 1)
+        self.assertEqual(
+            metrics["received"]["job"]["job_processing"],
+            {"messages": 1, "bytes": 9, "rate": 1.0},
+        )
+        self.assertEqual(metrics["queues"], {"job": 0, "backend": 0})
+
+    def test_backend_check_wakes_on_put(self):
+        timer = threading.Timer(0.1, self.driver.backend_q.put, ["msg"])
+        timer.start()
+        start = time.time()
+        self.assertTrue(self.driver.backend_check(constant=5000))
+        self.assertLess(time.time() - start, 5)
+        timer.join()
@@ -12,6 +12,7 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 
+import asyncio
 import unittest
 
 from unittest.mock import ANY, MagicMock
@@ -160,8 +161,27 @@ class TestDriverZMQ(tests.TestBase):
                 b"\x00",
             ],
             flags=0,
+            copy=False,
         )
 
+    @patch("zmq.sugar.socket.Socket", autospec=True)
+    def test_socket_send_metrics(self, mock_socket):
+        self.driver._socket_send(
+            socket=mock_socket, msg_id="XXX", control=b"\x04"
+        )
+        mock_socket.send_multipart.side_effect = ValueError
+        with self.assertRaises(ValueError):
+            self.driver._socket_send.__wrapped__(
+                self.driver, socket=mock_socket
+            )
+        metrics = self.driver.get_metrics()
+        self.assertEqual(
+            metrics["sent"]["job"]["job_end"],
+            {"messages": 1, "bytes": 9, "rate": 1.0},
+        )
+        self.assertEqual(metrics["send_time"]["job"]["count"], 1)
+        self.assertEqual(metrics["send_failures"], 1)
+
     @patch("zmq.sugar.socket.Socket", autospec=True)
     def test_socket_send_ident(self, mock_socket):
         self.driver._socket_send(socket=mock_socket, identity=b"test-identity")
@@ -177,6 +197,7 @@ class TestDriverZMQ(tests.TestBase):
                 b"\x00",
             ],
             flags=0,
+            copy=False,
         )
 
     @patch("zmq.sugar.socket.Socket", autospec=True)
@@ -198,6 +219,7 @@ class TestDriverZMQ(tests.TestBase):
                 b"\x00",
             ],
             flags=0,
+            copy=False,
         )
 
     @patch("zmq.sugar.socket.Socket", autospec=True)
@@ -217,6 +239,7 @@ class TestDriverZMQ(tests.TestBase):
                 b"\x00",
             ],
             flags=0,
+            copy=False,
         )
 
     @patch("zmq.sugar.socket.Socket", autospec=True)
@@ -238,6 +261,7 @@ class TestDriverZMQ(tests.TestBase):
                 b"\x00",
             ],
             flags=0,
+            copy=False,
         )
 
     @patch("zmq.sugar.socket.Socket", autospec=True)
@@ -259,6 +283,7 @@ class TestDriverZMQ(tests.TestBase):
                 b"\x00",
             ],
             flags=0,
+            copy=False,
         )
 
     @patch("zmq.sugar.socket.Socket", autospec=True)
@@ -278,6 +303,7 @@ class TestDriverZMQ(tests.TestBase):
                 b"\x00",
             ],
             flags=0,
+            copy=False,
         )
 
     @patch("zmq.sugar.socket.Socket", autospec=True)
@@ -297,6 +323,7 @@ class TestDriverZMQ(tests.TestBase):
                 b"\x00",
             ],
             flags=0,
+            copy=False,
         )
 
     @patch("zmq.sugar.socket.Socket", autospec=True)
@@ -316,8 +343,104 @@ class TestDriverZMQ(tests.TestBase):
                 b"stdout",
             ],
             flags=0,
+            copy=False,
         )
 
+    @patch("zmq.sugar.socket.Socket", autospec=True)
+    def test_recv(self, mock_socket):
+        mock_socket.recv_multipart.return_value = [
+            b"test-identity",
+            b"testing_id",
+            b"\x01",
+            b"test-command",
+            b"data",
+            b"info",
+            b"stderr",
+            b"stdout",
+        ]
+        self.assertEqual(
+            self.driver._recv(socket=mock_socket),
+            (
+                "test-identity",
+                "testing_id",
+                "\x01",
+                "test-command",
+                "data",
+                "info",
+                "stderr",
+                "stdout",
+            ),
+        )
+        mock_socket.recv_multipart.assert_called_once_with(flags=0, copy=True)
+        received = self.driver.get_metrics()["received"]
+        self.assertEqual(received["job"]["unknown"]["messages"], 1)
+        self.assertEqual(received["job"]["unknown"]["bytes"], 56)
+
+    @patch("zmq.sugar.socket.Socket", autospec=True)
+    def test_recv_raw(self, mock_socket):
+        mock_socket.copy_threshold = zmq.COPY_THRESHOLD
+        mock_socket.recv_multipart.return_value = [
+            zmq.Frame(i)
+            for i in [
+                b"testing_id",
+                b"\x01",
+                b"test-command",
+                b"data",
+                b"info",
+                b"stderr",
+                b"stdout",
+            ]
+        ]
+        (
+            msg_id,
+            control,
+            command,
+            data,
+            info,
+            stderr,
+            stdout,
+        ) = self.driver._recv(socket=mock_socket, nonblocking=True, raw=True)
+        self.assertEqual(msg_id, "testing_id")
+        self.assertEqual(control, "\x01")
+        self.assertEqual(command, "test-command")
+        self.assertEqual(info, "info")
+        self.assertEqual(data, b"data")
+        self.assertEqual(stderr, b"stderr")
+        self.assertEqual(stdout, b"stdout")
+        mock_socket.recv_multipart.assert_called_once_with(
+            flags=zmq.NOBLOCK, copy=False
+        )
+
+    @patch("zmq.sugar.socket.Socket", autospec=True)
+    def test_recv_raw_copy_threshold(self, mock_socket):
+        mock_socket.copy_threshold = 5
+        mock_socket.recv_multipart.return_value = [
+            zmq.Frame(i)
+            for i in [
+                b"testing_id",
+                b"\x01",
+                b"test-command",
+                b"data",
+                b"info",
+                b"stderr",
+                b"stdout",
+            ]
+        ]
+        (
+            _,
+            _,
+            _,
+            data,
+            info,
+            stderr,
+            stdout,
+        ) = self.driver._recv(socket=mock_socket, raw=True)
+        self.assertIsInstance(data, bytes)
+        self.assertEqual(info, "info")
+        self.assertIsInstance(stderr, memoryview)
+        self.assertEqual(bytes(stderr), b"stderr")
+        self.assertEqual(bytes(stdout), b"stdout")
+
     @patch("directord.drivers.zeromq.Driver._socket_bind", autospec=True)
     def test_job_bind(self, mock_socket_bind):
         self.driver._job_bind()
@@ -459,3 +582,75 @@ class TestDriverZMQ(tests.TestBase):
                 call("/etc/directord/private_keys", exist_ok=True),
             ]
         )
+
+
+class TestDriverZMQAsync(tests.TestBase):
+    def setUp(self):
+        super().setUp()
+        with patch("zmq.Context"):
+            self.driver = zeromq.Driver(args=tests.FakeArgs)
+        self.ctx = zmq.Context()
+        self.driver.bind_job = self.ctx.socket(zmq.PAIR)
+        self.driver.bind_job.bind("inproc://directord-job")
+        self.peer = self.ctx.socket(zmq.PAIR)
+        self.peer.connect("inproc://directord-job")
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        super().tearDown()
+        self.loop.close()
+        self.driver.bind_job.close(linger=0)
+        self.peer.close(linger=0)
+        self.ctx.term()
+
+    def test_job_send_async(self):
+        self.loop.run_until_complete(
+            self.driver.job_send_async(
+                msg_id="XXX", control=self.driver.job_end, data="data"
+            )
+        )
+        self.assertEqual(
+            self.peer.recv_multipart(),
+            [b"XXX", b"\x04", b"\x00", b"data", b"\x00", b"\x00", b"\x00"],
+        )
+        sent = self.driver.get_metrics()["sent"]
+        self.assertEqual(sent["job"]["job_end"]["messages"], 1)
+
+    def test_job_recv_async(self):
+        self.assertFalse(
+            self.loop.run_until_complete(
+                self.driver.job_check_async(constant=1)
+            )
+        )
+        self.peer.send_multipart(
+            [b"XXX", b"\x04", b"RUN", b"data", b"info", b"err", b"out"]
+        )
+        self.assertTrue(
+            self.loop.run_until_complete(
+                self.driver.job_check_async(constant=1000)
+            )
+        )
+        (
+            msg_id,
+            control,
+            command,
+            data,
+            info,
+            stderr,
+            stdout,
+        ) = self.loop.run_until_complete(self.driver.job_recv_async(raw=True))
+        self.assertEqual(msg_id, "XXX")
+        self.assertEqual(control, self.driver.job_end)
+        self.assertEqual(info, "info")
+        self.assertEqual(bytes(data), b"data")
+        poll = self.driver.get_metrics()["poll"]["job"]
+        self.assertEqual(poll["count"], 2)
+        self.assertEqual(poll["ready"], 1)
+
+    def test_heartbeat_send_async(self):
+        self.loop.run_until_complete(
+            self.driver.heartbeat_send_async(version="x", driver="zmq")
+        )
+        message = self.peer.recv_multipart()
+        self.assertEqual(message[1], self.driver.heartbeat_notice.encode())
+        self.assertIn(b'"version": "x"', message[3])
@@ -12,6 +12,8 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 
+import os
+import tempfile
 import unittest
 
 from unittest import mock
@@ -61,6 +63,7 @@ class TestLogger(unittest.TestCase):
         self.uid_patched.stop()
         self.env_patched.stop()
         self.idr_patched.stop()
+        self.stat_patched.stop()
 
     def test_logger_max_backup(self):
         self.assertEqual(self.log.max_backup, 5)
@@ -235,6 +238,14 @@ class TestDirectordConnect(unittest.TestCase):
 
 
 class TestDirectordInit(tests.TestBase):
+    def setUp(self):
+        super().setUp()
+        directord._COMPONENT_REGISTRY.clear()
+
+    def tearDown(self):
+        super().tearDown()
+        directord._COMPONENT_REGISTRY.clear()
+
     def test_plugin_import(self):
         with patch("importlib.import_module", autospec=True) as mock_module:
             directord.plugin_import("notaplugin")
@@ -311,6 +322,62 @@ class TestDirectordInit(tests.TestBase):
                         "/test/path/share/directord/components/notacomponent.py",  # noqa
                     )
 
+    def test_component_import_registry(self):
+        with patch.object(
+            directord,
+            "plugin_import",
+            wraps=directord.plugin_import,
+        ) as mock_plugin_import:
+            status, transfer, component = directord.component_import("run")
+            self.assertTrue(status)
+            self.assertIsNone(transfer)
+            self.assertIn("run", directord._COMPONENT_REGISTRY)
+            _, _, component_again = directord.component_import("run")
+        mock_plugin_import.assert_called_once_with(
+            plugin=".components.builtin_run"
+        )
+        self.assertIsNot(component, component_again)
+
+    def test_component_import_registry_reload(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = os.path.join(tempdir, "share/directord/components")
+            os.makedirs(path)
+            transfer = os.path.join(path, "usercomponent.py")
+            with open(transfer, "w") as f:
+                f.write("class Component:\n    version = 1\n")
+
+            with patch.object(
+                directord, "plugin_import", autospec=True
+            ) as mock_plugin_import:
+                mock_plugin_import.side_effect = ImportError("not builtin")
+                with patch("sys.base_prefix", tempdir):
+                    with patch("sys.prefix", tempdir):
+                        for _ in range(2):
+                            _, _, component = directord.component_import(
+                                "usercomponent"
+                            )
+                            self.assertEqual(component.version, 1)
+                        self.assertEqual(mock_plugin_import.call_count, 1)
+
+                        with open(transfer, "w") as f:
+                            f.write("class Component:\n    version = 22\n")
+                        _, _, component = directord.component_import(
+                            "usercomponent"
+                        )
+                        self.assertEqual(component.version, 22)
+                        self.assertEqual(mock_plugin_import.call_count, 2)
+
+    def test_component_import_error_not_registered(self):
+        with patch.object(
+            directord, "plugin_import", autospec=True
+        ) as mock_plugin_import:
+            mock_plugin_import.side_effect = ImportError("not builtin")
+            with patch("sys.base_prefix", "/test/path"):
+                with patch("sys.prefix", "/test/path"):
+                    status, _, _ = directord.component_import("notacomponent")
+        self.assertFalse(status)
+        self.assertNotIn("notacomponent", directord._COMPONENT_REGISTRY)
+
 
 class TestIndicator(tests.TestBase):
     def setUp(self):
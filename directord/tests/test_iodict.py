@@ -14,6 +14,8 @@
 
 import pickle
 import queue
+import tempfile
+import threading
 import unittest
 
 from unittest.mock import call
@@ -569,6 +571,101 @@ class TestIODict(BaseTest):
         self.assertEqual(return_items, ["value1", "value2"])
 
 
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.cache = iodict.Cache(
+            path=self.tempdir.name, lock=threading.Lock(), memory=True
+        )
+        self.writer = iodict.Cache(
+            path=self.tempdir.name, lock=threading.Lock()
+        )
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_memory_disabled(self):
+        self.assertIsNone(self.writer._memory)
+        self.writer["key"] = "value"
+        self.assertEqual(self.writer["key"], "value")
+
+    def test_memory_write_through(self):
+        self.cache["key"] = {"a": 1}
+        self.assertIn("key", self.cache._memory)
+        with patch("builtins.open", autospec=True) as mock_open:
+            self.assertEqual(self.cache["key"], {"a": 1})
+        mock_open.assert_not_called()
+
+    def test_memory_read_cached(self):
+        self.writer["key"] = "value"
+        self.assertEqual(self.cache["key"], "value")
+        with patch("pickle.load", autospec=True) as mock_load:
+            self.assertEqual(self.cache["key"], "value")
+        mock_load.assert_not_called()
+
+    def test_memory_external_write(self):
+        self.cache["key"] = "value"
+        self.writer["key"] = "new-value"
+        self.assertEqual(self.cache["key"], "new-value")
+
+    def test_memory_external_delete(self):
+        self.cache["key"] = "value"
+        del self.writer["key"]
+        with self.assertRaises(KeyError):
+            self.cache["key"]
+        self.assertNotIn("key", self.cache._memory)
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_memory_delete(self):
+        self.cache["key"] = "value"
+        del self.cache["key"]
+        self.assertNotIn("key", self.cache._memory)
+        self.assertIsNone(self.cache.get("key"))
+
+    @patch("os.setxattr", autospec=True)
+    @patch("os.getxattr", autospec=True)
+    def test_memory_no_xattr(self, mock_getxattr, mock_setxattr):
+        mock_getxattr.side_effect = OSError
+        mock_setxattr.side_effect = OSError
+        self.cache["key"] = "value"
+        self.writer["key"] = "a-longer-value"
+        self.assertEqual(self.cache["key"], "a-longer-value")
+
+    def test_wait_for(self):
+        self.cache["key"] = "value"
+        self.assertEqual(self.cache.wait_for(key="key"), "value")
+
+    def test_wait_for_timeout(self):
+        with self.assertRaises(TimeoutError):
+            self.cache.wait_for(key="key", timeout=0.1, interval=0.01)
+
+    def test_wait_for_notify(self):
+        timer = threading.Timer(
+            0.1, self.cache.__setitem__, args=("key", "done")
+        )
+        timer.start()
+        self.assertEqual(
+            self.cache.wait_for(
+                key="key",
+                predicate=lambda value: value == "done",
+                timeout=5,
+                interval=5,
+            ),
+            "done",
+        )
+        timer.join()
+
+    def test_wait_for_external_write(self):
+        timer = threading.Timer(
+            0.1, self.writer.__setitem__, args=("key", "done")
+        )
+        timer.start()
+        self.assertEqual(
+            self.cache.wait_for(key="key", timeout=5, interval=0.01), "done"
+        )
+        timer.join()
+
+
 class TestDurableQueue(BaseTest):
     def setUp(self):
         super().setUp()
@@ -13,6 +13,8 @@
 #   under the License.
 
 
+import subprocess
+import sys
 import unittest
 
 from collections import namedtuple
@@ -22,6 +24,8 @@ from unittest.mock import patch
 from directord import main
 from directord import tests
 
+PARSE_DRIVER_ARGS = main._parse_driver_args
+
 
 class TestMain(tests.TestBase):
     def setUp(self):
@@ -29,7 +33,7 @@ class TestMain(tests.TestBase):
         self.maxDiff = 20000
         self.args = tests.FakeArgs()
         self.systemdinstall = main.SystemdInstall()
-        parse_driver_args_se = lambda x, y, z: x
+        parse_driver_args_se = lambda x, y, z, **kwargs: x
         mock_parse_driver_args = mock.Mock()
         mock_parse_driver_args.side_effect = parse_driver_args_se
         main._parse_driver_args = mock_parse_driver_args
@@ -340,6 +344,8 @@ class TestMain(tests.TestBase):
                 "socket_group": "0",
                 "socket_path": "/var/run/directord.sock",
                 "cache_path": "/var/cache/directord",
+                "compression_threshold": 0,
+                "payload_encoding": "json",
                 "mode": "server",
             },
         )
@@ -360,8 +366,16 @@ class TestMain(tests.TestBase):
                 "socket_group": "0",
                 "socket_path": "/var/run/directord.sock",
                 "cache_path": "/var/cache/directord",
+                "component_process_pool": 0,
+                "compression_threshold": 0,
+                "payload_encoding": "json",
                 "machine_id": None,
+                "max_inflight_jobs": 0,
                 "mode": "client",
+                "output_limit": 0,
+                "output_spill_path": None,
+                "output_stream_interval": 0,
+                "result_batch_window": 0,
                 "identity": None,
             },
         )
@@ -376,6 +390,7 @@ class TestMain(tests.TestBase):
                 "debug": False,
                 "driver": "grpcd",
                 "dump_cache": False,
+                "driver_metrics": False,
                 "export_jobs": None,
                 "export_nodes": None,
                 "filter": None,
@@ -408,6 +423,7 @@ class TestMain(tests.TestBase):
                 "debug": False,
                 "driver": "grpcd",
                 "dump_cache": False,
+                "driver_metrics": False,
                 "export_jobs": None,
                 "export_nodes": None,
                 "filter": None,
@@ -440,6 +456,7 @@ class TestMain(tests.TestBase):
                 "debug": False,
                 "driver": "grpcd",
                 "dump_cache": False,
+                "driver_metrics": False,
                 "export_jobs": None,
                 "export_nodes": None,
                 "filter": None,
@@ -472,6 +489,7 @@ class TestMain(tests.TestBase):
                 "debug": False,
                 "driver": "grpcd",
                 "dump_cache": False,
+                "driver_metrics": False,
                 "export_jobs": None,
                 "export_nodes": None,
                 "filter": None,
@@ -504,6 +522,7 @@ class TestMain(tests.TestBase):
                 "debug": False,
                 "driver": "grpcd",
                 "dump_cache": False,
+                "driver_metrics": False,
                 "export_jobs": None,
                 "export_nodes": None,
                 "filter": None,
@@ -536,6 +555,7 @@ class TestMain(tests.TestBase):
                 "debug": False,
                 "driver": "grpcd",
                 "dump_cache": False,
+                "driver_metrics": False,
                 "export_jobs": "xxxx",
                 "export_nodes": None,
                 "filter": None,
@@ -568,6 +588,7 @@ class TestMain(tests.TestBase):
                 "debug": False,
                 "driver": "grpcd",
                 "dump_cache": False,
+                "driver_metrics": False,
                 "export_jobs": None,
                 "export_nodes": "xxxx",
                 "filter": None,
@@ -615,6 +636,49 @@ class TestMain(tests.TestBase):
             },
         )
 
+    def test__requires_driver_args(self):
+        self.assertTrue(main._requires_driver_args(["server"]))
+        self.assertTrue(main._requires_driver_args(["--debug", "client"]))
+        self.assertTrue(main._requires_driver_args(["--help"]))
+        self.assertFalse(main._requires_driver_args(["exec", "server"]))
+        self.assertFalse(
+            main._requires_driver_args(["manage", "--list-nodes"])
+        )
+
+    def test__args_exec_no_driver_args(self):
+        main._parse_driver_args.reset_mock()
+        main._args(["exec", "--verb", "RUN", "command1"])
+        main._parse_driver_args.assert_called_once_with(
+            mock.ANY, mock.ANY, mock.ANY, load_drivers=False
+        )
+
+    def test__args_client_driver_args(self):
+        main._parse_driver_args.reset_mock()
+        main._args(["client"])
+        main._parse_driver_args.assert_called_once_with(
+            mock.ANY, mock.ANY, mock.ANY, load_drivers=True
+        )
+
+    def test__args_exec_static_driver_args(self):
+        with patch.object(main, "_parse_driver_args", PARSE_DRIVER_ARGS):
+            with patch.object(main, "_find_drivers") as mock_find_drivers:
+                args, _ = main._args(
+                    [
+                        "--grpc-port",
+                        "5559",
+                        "--zmq-shared-key",
+                        "secrete",
+                        "exec",
+                        "--verb",
+                        "RUN",
+                        "command1",
+                    ]
+                )
+        mock_find_drivers.assert_called_once_with(limit_modules=["drivers"])
+        self.assertEqual(args.grpc_port, 5559)
+        self.assertEqual(args.zmq_shared_key, "secrete")
+        self.assertEqual(args.messaging_address, "127.0.0.1")
+
     @patch("builtins.print")
     @patch("os.path.exists", autospec=True)
     @patch("os.makedirs", autospec=True)
@@ -889,3 +953,46 @@ class TestMain(tests.TestBase):
         mock__args.return_value = [parsed_args, parser]
         self.assertRaises(SystemExit, main.main)
         parser.print_help.assert_called()
+
+
+class TestMainImportTime(unittest.TestCase):
+    """Import regression tests for CLI invocations.
+
+    The interpreter is run with `-X importtime` so that every module loaded
+    while parsing arguments for a user facing mode is reported.
+    """
+
+    heavy_modules = ("grpc", "jinja2", "oslo_messaging", "tabulate", "zmq")
+
+    def _import_time(self, exec_args):
+        code = "from directord import main; main._args({})".format(
+            repr(exec_args)
+        )
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+        imported = dict()
+        for line in result.stderr.decode().splitlines():
+            if not line.startswith("import time:"):
+                continue
+            _, cumulative, name = line.split("|")
+            try:
+                imported[name.strip()] = int(cumulative)
+            except ValueError:
+                pass  # Header line
+        return imported
+
+    def test_exec_import_time(self):
+        imported = self._import_time(["exec", "--verb", "RUN", "command1"])
+        self.assertIn("directord.main", imported)
+        for module in self.heavy_modules:
+            self.assertNotIn(module, imported)
+
+    def test_manage_import_time(self):
+        imported = self._import_time(["manage", "--list-nodes"])
+        self.assertIn("directord.main", imported)
+        for module in self.heavy_modules:
+            self.assertNotIn(module, imported)
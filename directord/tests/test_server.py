@@ -13,9 +13,11 @@
 #   under the License.
 
 import json
+import time
 import unittest
 
 from unittest.mock import ANY
+from unittest.mock import call
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
@@ -24,6 +26,7 @@ from directord.datastores import memory  # noqa
 from directord import models
 from directord import server
 from directord import tests
+from directord import utils
 
 
 class TestServer(tests.TestDriverBase):
@@ -35,6 +38,7 @@ class TestServer(tests.TestDriverBase):
         self.server.workers = datastores.BaseDocument()
         self.server.return_jobs = datastores.BaseDocument()
         self.server.driver = self.mock_driver
+        self.server.held_work = dict()
         self.job_item = {
             "job_id": "XXX",
             "job_sha3_224": "YYY",
@@ -441,6 +445,36 @@ class TestServer(tests.TestDriverBase):
                 self.server.workers[w.identity] = w
             self.server.run_job()
 
+    def test_run_job_queuesentinel(self):
+        self._setup_send_lanes()
+        self.mock_driver.event.is_set.return_value = False
+        self.server.workers["test-node"].expire_time = time.time() + 60
+        q = tests.MockQueue()
+        with patch.object(q, "get_nowait", autospec=True) as mock_queue:
+            mock_queue.side_effect = [
+                {
+                    "verb": "RUN",
+                    "job_sha3_224": "YYY",
+                    "targets": ["test-node"],
+                    "job_id": "AAA",
+                },
+                {
+                    "verb": "QUEUESENTINEL",
+                    "job_sha3_224": "YYY",
+                    "targets": ["test-node"],
+                    "job_id": "XXX",
+                },
+            ]
+            self.server.job_queue = q
+            self.server.run_job()
+
+        self.assertEqual(self.server.send_queue_control.qsize(), 0)
+        self.assertEqual(self.server.send_queue.qsize(), 2)
+        self.assertEqual(self.server.send_queue.get()["command"], "RUN")
+        self.assertEqual(
+            self.server.send_queue.get()["command"], "QUEUESENTINEL"
+        )
+
     @patch("time.time", autospec=True)
     def test_run_interactions(self, mock_time):
         self.mock_driver.job_recv.side_effect = [
@@ -469,6 +503,103 @@ class TestServer(tests.TestDriverBase):
         with patch.object(self.mock_driver, "job_check") as mock_job_check:
             mock_job_check.side_effect = [True, True, False]
             self.server.run_interactions()
+        self.mock_driver.job_recv.assert_called_with(raw=True)
+
+    def test_job_records_raw(self):
+        compressed = utils.compress_frame(item="x" * 1024, threshold=64)
+        self.assertEqual(
+            list(
+                self.server._job_records(
+                    message=(
+                        "test-node",
+                        "XXX",
+                        self.mock_driver.job_end,
+                        "RUN",
+                        memoryview(compressed.encode()),
+                        "info",
+                        memoryview(b"\x00"),
+                        b"stdout",
+                    )
+                )
+            ),
+            [
+                (
+                    "test-node",
+                    "XXX",
+                    self.mock_driver.job_end,
+                    "RUN",
+                    "x" * 1024,
+                    "info",
+                    "\x00",
+                    "stdout",
+                )
+            ],
+        )
+
+    @patch("directord.server.Server.handle_job", autospec=True)
+    @patch("time.time", autospec=True)
+    def test_run_interactions_result_batch(self, mock_time, mock_handle_job):
+        self.mock_driver.job_recv.side_effect = [
+            (
+                "test-node",
+                "ZZZ",
+                self.mock_driver.batch_notice,
+                None,
+                json.dumps(
+                    [
+                        {
+                            "msg_id": "XXX",
+                            "control": self.mock_driver.job_processing,
+                            "command": None,
+                            "data": None,
+                            "info": "info",
+                            "stderr": None,
+                            "stdout": "out",
+                        },
+                        {
+                            "msg_id": "YYY",
+                            "control": self.mock_driver.job_end,
+                            "command": "REBOOT",
+                            "data": None,
+                            "info": None,
+                            "stderr": None,
+                            "stdout": None,
+                        },
+                    ]
+                ),
+                None,
+                None,
+                None,
+            ),
+        ]
+        mock_time.side_effect = [1, 1, 1, 1, 1, 1, 1, 1, 1]
+        with patch.object(self.mock_driver, "job_check") as mock_job_check:
+            mock_job_check.side_effect = [True, False]
+            self.server.run_interactions()
+        mock_handle_job.assert_has_calls(
+            [
+                call(
+                    ANY,
+                    identity="test-node",
+                    job_id="XXX",
+                    control=self.mock_driver.job_processing,
+                    data=self.mock_driver.nullbyte,
+                    info="info",
+                    stderr=self.mock_driver.nullbyte,
+                    stdout="out",
+                ),
+                call(
+                    ANY,
+                    identity="test-node",
+                    job_id="YYY",
+                    control=self.mock_driver.job_end,
+                    data=self.mock_driver.nullbyte,
+                    info=self.mock_driver.nullbyte,
+                    stderr=self.mock_driver.nullbyte,
+                    stdout=self.mock_driver.nullbyte,
+                ),
+            ]
+        )
 
     @patch("time.time", autospec=True)
     def test_run_interactions_idle(self, mock_time):
@@ -528,6 +659,413 @@ class TestServer(tests.TestDriverBase):
             mock_job_check.side_effect = [True, True, False]
             self.server.run_interactions()
 
+    def _setup_send_lanes(self):
+        for _, queue_name, _ in self.server.send_lanes:
+            setattr(self.server, queue_name, tests.MockQueue())
+        w = models.Worker(identity="test-node")
+        w.expire_time = 12345
+        self.server.workers[w.identity] = w
+
+    def test_run_interactions_send_lanes(self):
+        self._setup_send_lanes()
+        for i in range(40):
+            self.server._send_lane_put(
+                send_item=dict(
+                    identity="test-node",
+                    command="RUN",
+                    data={"job_id": "bulk-{}".format(i)},
+                )
+            )
+        self.server._send_lane_put(
+            send_item=dict(
+                identity="test-node",
+                command="ARG",
+                data={"job_id": "callback"},
+            ),
+            lane="callback",
+        )
+        self.server._send_lane_put(
+            send_item=dict(
+                identity="test-node",
+                command="RUN",
+                data={"job_id": "control"},
+            ),
+            lane="control",
+        )
+        with patch.object(self.mock_driver, "job_check") as mock_job_check:
+            mock_job_check.return_value = False
+            self.server.run_interactions()
+
+        sent = [
+            json.loads(i.kwargs["data"])["job_id"]
+            for i in self.mock_driver.job_send.call_args_list
+        ]
+        self.assertEqual(sent[:2], ["control", "callback"])
+        self.assertEqual(len(sent), 34)
+        self.assertEqual(self.server.send_queue.qsize(), 8)
+
+    def test_run_interactions_send_lanes_inactive(self):
+        self._setup_send_lanes()
+        self.server.workers["test-node"].active = False
+        self.server._send_lane_put(
+            send_item=dict(
+                identity="test-node",
+                command="ARG",
+                data={"job_id": "callback"},
+            ),
+            lane="callback",
+        )
+        with patch.object(self.mock_driver, "job_check") as mock_job_check:
+            mock_job_check.return_value = False
+            with patch.object(self.server, "_flush_held_work"):
+                self.server.run_interactions()
+
+        self.mock_driver.job_send.assert_not_called()
+        self.assertEqual(self.server.send_queue_callback.qsize(), 0)
+        self.assertEqual(len(self.server.worker_parked["test-node"]), 1)
+        self.assertEqual(len(self.server.held_work), 1)
+
+    def test_run_interactions_worker_credits(self):
+        self._setup_send_lanes()
+        worker = self.server.workers["test-node"]
+        worker.max_inflight_jobs = 2
+        self.server.workers["test-node"] = worker
+        for i in range(4):
+            self.server._send_lane_put(
+                send_item=dict(
+                    identity="test-node",
+                    command="RUN",
+                    data={"job_id": "bulk-{}".format(i)},
+                )
+            )
+        with patch.object(self.mock_driver, "job_check") as mock_job_check:
+            mock_job_check.return_value = False
+            self.server.run_interactions()
+            self.assertEqual(self.mock_driver.job_send.call_count, 2)
+            self.assertEqual(len(self.server.send_queue.queue), 2)
+            self.assertEqual(len(self.server.worker_backlog), 0)
+
+            self.server._release_worker_credit(
+                identity="test-node", job_id="bulk-0"
+            )
+            self.server.run_interactions()
+
+        self.assertEqual(self.mock_driver.job_send.call_count, 3)
+        self.assertEqual(len(self.server.send_queue.queue), 1)
+
+    def test_handle_job_worker_credit(self):
+        self.server.worker_inflight["test-node"]["XXX"] += 1
+        self.server.handle_job(
+            identity="test-node",
+            job_id="XXX",
+            control=self.mock_driver.job_end,
+            data=None,
+            info=None,
+            stderr=None,
+            stdout=None,
+        )
+        self.assertNotIn("test-node", self.server.worker_inflight)
+
+    def test_send_item_compression(self):
+        self._setup_send_lanes()
+        worker = self.server.workers["test-node"]
+        worker.compression = "zlib"
+        self.server.compression_threshold = 64
+        self.server._send_item(
+            worker=worker,
+            send_item=dict(
+                identity="test-node",
+                command="RUN",
+                data={"job_id": "XXX", "command": "x" * 1024},
+            ),
+        )
+        kwargs = self.mock_driver.job_send.call_args.kwargs
+        self.assertEqual(kwargs["control"], self.mock_driver.compress_notice)
+        self.assertTrue(
+            kwargs["data"].startswith(self.mock_driver.compress_notice)
+        )
+        self.assertEqual(
+            json.loads(utils.decompress_frame(kwargs["data"])),
+            {"job_id": "XXX", "command": "x" * 1024},
+        )
+
+    @unittest.skipIf(utils.msgpack is None, "msgpack is not installed")
+    def test_send_item_msgpack(self):
+        self._setup_send_lanes()
+        worker = self.server.workers["test-node"]
+        worker.encoding = "msgpack"
+        self.server.payload_encoding = "msgpack"
+        self.server._send_item(
+            worker=worker,
+            send_item=dict(
+                identity="test-node",
+                command="RUN",
+                data={"job_id": "XXX"},
+            ),
+        )
+        kwargs = self.mock_driver.job_send.call_args.kwargs
+        self.assertEqual(utils.get_payload_encoding(kwargs["data"]), "msgpack")
+        self.assertEqual(
+            utils.decode_payload(kwargs["data"]), {"job_id": "XXX"}
+        )
+
+    def test_send_item_msgpack_server_disabled(self):
+        self._setup_send_lanes()
+        worker = self.server.workers["test-node"]
+        worker.encoding = "msgpack"
+        self.server._send_item(
+            worker=worker,
+            send_item=dict(
+                identity="test-node",
+                command="RUN",
+                data={"job_id": "XXX"},
+            ),
+        )
+        kwargs = self.mock_driver.job_send.call_args.kwargs
+        self.assertEqual(kwargs["data"], json.dumps({"job_id": "XXX"}))
+
+    def test_job_records_decompress(self):
+        stdout = utils.compress_frame(item="x" * 1024, threshold=64)
+        self.assertEqual(
+            list(
+                self.server._job_records(
+                    message=(
+                        "test-node",
+                        "XXX",
+                        self.mock_driver.job_end,
+                        None,
+                        None,
+                        None,
+                        None,
+                        stdout,
+                    )
+                )
+            ),
+            [
+                (
+                    "test-node",
+                    "XXX",
+                    self.mock_driver.job_end,
+                    None,
+                    None,
+                    None,
+                    None,
+                    "x" * 1024,
+                )
+            ],
+        )
+
+    def test_handle_heartbeat_compression(self):
+        self.server.handle_heartbeat(
+            identity="test-node",
+            data=json.dumps(
+                {
+                    "job_id": "YYY",
+                    "machine_id": "ZZZ",
+                    "compression": "zlib",
+                }
+            ),
+        )
+        worker = self.server.workers["test-node"]
+        self.assertEqual(worker.compression, "zlib")
+
+    def test_handle_heartbeat_encoding(self):
+        self.server.handle_heartbeat(
+            identity="test-node",
+            data=json.dumps(
+                {
+                    "job_id": "YYY",
+                    "machine_id": "ZZZ",
+                    "encoding": "msgpack",
+                }
+            ),
+        )
+        worker = self.server.workers["test-node"]
+        self.assertEqual(worker.encoding, "msgpack")
+
+    def test_handle_heartbeat_worker_credit_reset(self):
+        self.server.worker_inflight["test-node"]["XXX"] += 1
+        self.server.worker_inflight_time["test-node"]["XXX"] = 10
+        self.server.worker_backlog["test-node"].append(dict())
+        self.server.handle_heartbeat(
+            identity="test-node",
+            data=json.dumps(
+                {
+                    "job_id": "YYY",
+                    "machine_id": "ZZZ",
+                    "max_inflight_jobs": 2,
+                    "slots": 2,
+                    "slots_timestamp": 20,
+                }
+            ),
+        )
+        worker = self.server.workers["test-node"]
+        self.assertNotIn("test-node", self.server.worker_inflight)
+        self.assertNotIn("test-node", self.server.worker_inflight_time)
+        self.assertEqual(worker.max_inflight_jobs, 2)
+        self.assertEqual(worker.inflight, 0)
+        self.assertEqual(worker.backlog, 1)
+
+    def test_handle_heartbeat_worker_credit_reset_inflight(self):
+        self.server.worker_inflight["test-node"]["XXX"] += 1
+        self.server.worker_inflight_time["test-node"]["XXX"] = 10
+        self.server.worker_inflight["test-node"]["YYY"] += 1
+        self.server.worker_inflight_time["test-node"]["YYY"] = 30
+        self.server.handle_heartbeat(
+            identity="test-node",
+            data=json.dumps(
+                {
+                    "job_id": "ZZZ",
+                    "machine_id": "ZZZ",
+                    "max_inflight_jobs": 2,
+                    "slots": 2,
+                    "slots_timestamp": 20,
+                }
+            ),
+        )
+        worker = self.server.workers["test-node"]
+        self.assertEqual(
+            dict(self.server.worker_inflight["test-node"]), {"YYY": 1}
+        )
+        self.assertEqual(worker.inflight, 1)
+
+    def test_prune_worker_credits(self):
+        self.server.worker_inflight["test-node-unknown"]["XXX"] += 1
+        self.server.worker_inflight_time["test-node-unknown"]["XXX"] = 10
+        self.server._prune_worker_credits()
+        self.assertFalse(self.server.worker_inflight)
+        self.assertFalse(self.server.worker_inflight_time)
+
+    def test_flush_held_work(self):
+        self._setup_send_lanes()
+        self.server.worker_backlog["test-node"].append(
+            self.server._hold_item(lane="bulk", send_item={"identity": "x"})
+        )
+        self.server.worker_parked["test-node"].append(
+            (
+                self.server._hold_item(
+                    lane="callback", send_item={"identity": "y"}
+                ),
+                "callback",
+            )
+        )
+        self.server._flush_held_work()
+        self.assertEqual(self.server.send_queue.qsize(), 1)
+        self.assertEqual(self.server.send_queue_callback.qsize(), 1)
+        self.assertFalse(self.server.worker_backlog)
+        self.assertFalse(self.server.worker_parked)
+        self.assertFalse(self.server.held_work)
+
+    def test_restore_held_work(self):
+        self._setup_send_lanes()
+        self.server._hold_item(lane="bulk", send_item={"identity": "x"})
+        self.server._hold_item(lane="control", send_item={"identity": "y"})
+        self.assertEqual(self.server._restore_held_work(), 2)
+        self.assertEqual(self.server.send_queue.qsize(), 1)
+        self.assertEqual(self.server.send_queue_control.qsize(), 1)
+        self.assertFalse(self.server.held_work)
+
+    def test_handle_heartbeat_unpark(self):
+        self._setup_send_lanes()
+        worker = self.server.workers["test-node"]
+        worker.active = False
+        self.server.workers["test-node"] = worker
+        self.server.worker_parked["test-node"].append(
+            (
+                self.server._hold_item(
+                    lane="control", send_item={"identity": "test-node"}
+                ),
+                "control",
+            )
+        )
+        self.server.handle_heartbeat(
+            identity="test-node",
+            data=json.dumps({"job_id": "YYY", "machine_id": "ZZZ"}),
+        )
+        self.assertTrue(self.server.workers["test-node"].active)
+        self.assertEqual(self.server.send_queue_control.qsize(), 1)
+        self.assertFalse(self.server.worker_parked)
+
+    def test_prune_parked_work(self):
+        self.server.worker_parked["test-node-unknown"].append(
+            (
+                self.server._hold_item(
+                    lane="bulk", send_item={"identity": "test-node-unknown"}
+                ),
+                "bulk",
+            )
+        )
+        self.server._prune_parked_work()
+        self.assertFalse(self.server.worker_parked)
+        self.assertFalse(self.server.held_work)
+
+    def test_send_lane_put_unknown(self):
+        with self.assertRaises(ValueError):
+            self.server._send_lane_put(send_item=dict(), lane="unknown")
+
+    def test_handle_job_output_delta(self):
+        for stdout in ["line1\n", "line2\n"]:
+            self.server.handle_job(
+                identity="test-node",
+                job_id="XXX",
+                control=self.mock_driver.job_processing,
+                data=json.dumps({"output_delta": True}),
+                info="task output",
+                stderr=self.mock_driver.nullbyte,
+                stdout=stdout,
+            )
+        job = self.server.return_jobs["XXX"]
+        self.assertEqual(job.STDOUT["test-node"], "line1\nline2\n")
+        self.assertIsNone(job.STDERR["test-node"])
+        self.assertTrue(job.processing)
+
+        self.server.handle_job(
+            identity="test-node",
+            job_id="XXX",
+            control=self.mock_driver.job_end,
+            data=None,
+            info="task finished",
+            stderr=None,
+            stdout="line1\nline2",
+        )
+        self.server.handle_job(
+            identity="test-node",
+            job_id="XXX",
+            control=self.mock_driver.job_processing,
+            data=json.dumps({"output_delta": True}),
+            info="task output",
+            stderr=None,
+            stdout="late\n",
+        )
+        job = self.server.return_jobs["XXX"]
+        self.assertEqual(job.STDOUT["test-node"], "line1\nline2")
+        self.assertEqual(job.INFO["test-node"], "task finished")
+
+    def test_handle_job_callback_lane(self):
+        self._setup_send_lanes()
+        self.server.handle_job(
+            identity="test-node",
+            job_id="XXX",
+            control=self.mock_driver.job_end,
+            data=json.dumps(
+                {
+                    "new_tasks": [
+                        {
+                            "verb": "ARG",
+                            "targets": ["test-node"],
+                            "job_id": "ZZZ",
+                            "job_sha3_224": "ZZZ",
+                        }
+                    ]
+                }
+            ),
+            info=None,
+            stderr=None,
+            stdout=None,
+        )
+        self.assertEqual(self.server.send_queue_callback.qsize(), 1)
+        self.assertEqual(self.server.send_queue.qsize(), 0)
+
     @patch("time.time", autospec=True)
     def test_run_interactions_run_backend(
         self,
@@ -605,6 +1143,7 @@ class TestServer(tests.TestDriverBase):
             return_timestamp=0,
             component_exec_timestamp=0,
             recv_time=1,
+            append=False,
         )
 
     @patch("os.chown", autospec=True)
@@ -662,6 +1201,12 @@ class TestServer(tests.TestDriverBase):
                             "host_uptime": None,
                             "agent_uptime": None,
                             "driver": None,
+                            "max_inflight_jobs": None,
+                            "slots": None,
+                            "compression": None,
+                            "encoding": None,
+                            "inflight": 0,
+                            "backlog": 0,
                             "expiry": 12345,
                         },
                     ],
@@ -676,6 +1221,12 @@ class TestServer(tests.TestDriverBase):
                             "host_uptime": None,
                             "agent_uptime": None,
                             "driver": None,
+                            "max_inflight_jobs": None,
+                            "slots": None,
+                            "compression": None,
+                            "encoding": None,
+                            "inflight": 0,
+                            "backlog": 0,
                             "expiry": 12345,
                         },
                     ],
@@ -735,6 +1286,24 @@ class TestServer(tests.TestDriverBase):
         mock_chmod.assert_called()
         mock_chown.assert_called()
 
+    @patch("os.chown", autospec=True)
+    @patch("os.chmod", autospec=True)
+    @patch("os.unlink", autospec=True)
+    @patch("socket.socket", autospec=True)
+    def test_run_socket_server_manage_driver_metrics(
+        self, mock_socket, mock_unlink, mock_chmod, mock_chown
+    ):
+        socket = mock_socket.return_value = MagicMock()
+        conn = MagicMock()
+        conn.recv.return_value = json.dumps(
+            {"manage": {"driver_metrics": None}}
+        ).encode()
+        conn.sendall = MagicMock()
+        socket.accept.return_value = [conn, MagicMock()]
+        self.server.driver.get_metrics.return_value = {"send_failures": 0}
+        self.server.run_socket_server()
+        conn.sendall.assert_called_with(b'{"send_failures": 0}')
+
     @patch("os.chown", autospec=True)
     @patch("os.chmod", autospec=True)
     @patch("os.unlink", autospec=True)
@@ -30,6 +30,11 @@ class TestUser(tests.TestBase):
         self.args = tests.FakeArgs()
         self.user = user.User(args=self.args)
 
+    def test_dummy_driver(self):
+        with patch("directord.plugin_import", autospec=True) as mock_import:
+            user.Manage(args=self.args)
+        mock_import.assert_called_once_with(plugin=".drivers.dummy")
+
     def test_send_data(self):
         user.directord.socket.socket = tests.MockSocket
         returned = directord.send_data(
@@ -124,6 +129,45 @@ class TestManager(tests.TestDriverBase):
         self.assertEqual(status, True)
         self.assertEqual(info, "Job Skipped: test-id")
 
+    @patch("builtins.print")
+    @patch("time.sleep", autospec=True)
+    @patch("directord.send_data", autospec=True)
+    def test_poll_job_stream(self, mock_send_data, mock_sleep, mock_print):
+        mock_send_data.side_effect = [
+            json.dumps(
+                {
+                    "test-id": {
+                        "STDOUT": {"hostname-node": "line1\n"},
+                        "_nodes": ["hostname-node"],
+                        "PROCESSING": b"\026".decode(),
+                    }
+                }
+            ),
+            json.dumps(
+                {
+                    "test-id": {
+                        "STDOUT": {"hostname-node": "line1\nline2"},
+                        "SUCCESS": ["hostname-node"],
+                        "_nodes": ["hostname-node"],
+                        "PROCESSING": b"\004".decode(),
+                    }
+                }
+            ),
+        ]
+        status, _, stdout, stderr, _ = self.manage.poll_job(
+            "test-id", stream=True
+        )
+        self.assertEqual(status, True)
+        mock_print.assert_called_once_with("hostname-node -- STDOUT\nline1\n")
+        self.manage.stream_output(stdout=stdout, stderr=stderr)
+        mock_print.assert_called_with("hostname-node -- STDOUT\nline2")
+
+    @patch("builtins.print")
+    def test_stream_output_replaced(self, mock_print):
+        self.manage.stream_output(stdout={"node": "line1\n"}, stderr=None)
+        self.manage.stream_output(stdout={"node": "head...tail"}, stderr=None)
+        mock_print.assert_called_with("node -- STDOUT\nhead...tail")
+
     def test_run_override_unknown(self):
         self.assertRaises(SystemExit, self.manage.run, override=None)
 
@@ -155,6 +199,13 @@ class TestManager(tests.TestDriverBase):
             unittest.mock.ANY, data='{"manage": {"purge_nodes": null}}'
         )
 
+    @patch("directord.send_data", autospec=True)
+    def test_run_override_driver_metrics(self, mock_send_data):
+        self.manage.run(override="driver-metrics")
+        mock_send_data.assert_called_once_with(
+            unittest.mock.ANY, data='{"manage": {"driver_metrics": null}}'
+        )
+
     @patch("builtins.print")
     @patch("directord.iodict.Cache", autospec=True)
     def test_run_override_dump_cache(self, mock_diskcache, mock_print):
@@ -12,6 +12,7 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 
+import json
 import unittest
 import uuid
 
@@ -105,6 +106,7 @@ class TestUtils(tests.TestConnectionBase):
 
     def test_ctx_mgr_clientstatus_enter_exit(self):
         ctx = unittest.mock.MagicMock()
+        ctx.result_batch = None
         with utils.ClientStatus(
             job_id="test-id",
             command="test",
@@ -122,6 +124,144 @@ class TestUtils(tests.TestConnectionBase):
             stdout=unittest.mock.ANY,
         )
 
+    def test_ctx_mgr_clientstatus_result_batch(self):
+        ctx = unittest.mock.MagicMock()
+        with utils.ClientStatus(
+            job_id="test-id",
+            command="test",
+            ctx=ctx,
+        ):
+            pass
+
+        ctx.driver.job_send.assert_not_called()
+        ctx.result_batch.add.assert_called_with(
+            msg_id="test-id",
+            command="test",
+            control=unittest.mock.ANY,
+            data=unittest.mock.ANY,
+            info=unittest.mock.ANY,
+            stderr=unittest.mock.ANY,
+            stdout=unittest.mock.ANY,
+        )
+
+    @patch("time.time", autospec=True)
+    def test_result_batch_check(self, mock_time):
+        mock_time.side_effect = [1, 1.5, 3]
+        ctx = unittest.mock.MagicMock()
+        batch = utils.ResultBatch(ctx=ctx, window=1)
+        batch.add(msg_id="test-id", control="x", stdout=b"out", stderr="")
+        self.assertTrue(batch.pending)
+        self.assertFalse(batch.check())
+        ctx.driver.job_send.assert_not_called()
+        self.assertTrue(batch.check())
+        self.assertFalse(batch.pending)
+        kwargs = ctx.driver.job_send.call_args.kwargs
+        self.assertEqual(kwargs["control"], ctx.driver.batch_notice)
+        self.assertEqual(
+            json.loads(kwargs["data"]),
+            [
+                {
+                    "msg_id": "test-id",
+                    "control": "x",
+                    "stdout": "out",
+                    "stderr": None,
+                }
+            ],
+        )
+
+    def test_compress_frame(self):
+        item = "x" * 1024
+        compressed = utils.compress_frame(item=item, threshold=64)
+        self.assertTrue(compressed.startswith("\x1a"))
+        self.assertLess(len(compressed), len(item))
+        self.assertEqual(utils.decompress_frame(compressed), item)
+
+    def test_compress_frame_bytes(self):
+        compressed = utils.compress_frame(item=b"x" * 1024, threshold=64)
+        self.assertEqual(utils.decompress_frame(compressed), "x" * 1024)
+
+    def test_decompress_frame_bytes(self):
+        compressed = utils.compress_frame(item="x" * 1024, threshold=64)
+        self.assertEqual(
+            utils.decompress_frame(memoryview(compressed.encode())),
+            "x" * 1024,
+        )
+        self.assertEqual(utils.decompress_frame(b"test"), "test")
+        self.assertEqual(utils.decompress_frame(memoryview(b"test")), "test")
+
+    @unittest.skipIf(utils.msgpack is None, "msgpack is not installed")
+    def test_encode_payload_msgpack(self):
+        item = {"job_id": "XXX", "args": {"a": [1, 2, 3]}}
+        encoded = utils.encode_payload(item, encoding="msgpack")
+        self.assertTrue(encoded.startswith("\x1c"))
+        self.assertEqual(utils.get_payload_encoding(encoded), "msgpack")
+        self.assertEqual(utils.decode_payload(encoded), item)
+
+    @unittest.skipIf(utils.msgpack is None, "msgpack is not installed")
+    def test_decode_payload_msgpack_bytes(self):
+        item = {"job_id": "XXX", "args": {1: "a"}}
+        encoded = utils.encode_payload(item, encoding="msgpack").encode()
+        self.assertEqual(utils.get_payload_encoding(encoded), "msgpack")
+        self.assertEqual(utils.decode_payload(encoded), item)
+        self.assertEqual(utils.decode_payload(memoryview(encoded)), item)
+
+    def test_decode_payload_json_bytes(self):
+        item = {"job_id": "XXX"}
+        encoded = json.dumps(item).encode()
+        self.assertEqual(utils.get_payload_encoding(encoded), "json")
+        self.assertEqual(utils.decode_payload(encoded), item)
+        self.assertEqual(utils.decode_payload(memoryview(encoded)), item)
+
+    def test_encode_payload_json(self):
+        item = {"job_id": "XXX"}
+        encoded = utils.encode_payload(item)
+        self.assertEqual(encoded, json.dumps(item))
+        self.assertEqual(utils.get_payload_encoding(encoded), "json")
+        self.assertEqual(utils.decode_payload(encoded), item)
+
+    @patch("directord.utils.msgpack", None)
+    def test_encode_payload_msgpack_unavailable(self):
+        item = {"job_id": "XXX"}
+        self.assertEqual(
+            utils.encode_payload(item, encoding="msgpack"), json.dumps(item)
+        )
+
+    def test_compress_frame_threshold(self):
+        self.assertEqual(
+            utils.compress_frame(item="x" * 32, threshold=64), "x" * 32
+        )
+        self.assertEqual(
+            utils.compress_frame(item="x" * 1024, threshold=0), "x" * 1024
+        )
+        self.assertEqual(utils.decompress_frame("test"), "test")
+
+    def test_ctx_mgr_clientstatus_compression(self):
+        ctx = unittest.mock.MagicMock()
+        ctx.result_batch = None
+        ctx.compression = True
+        ctx.compression_threshold = 64
+        with utils.ClientStatus(
+            job_id="test-id",
+            command="test",
+            ctx=ctx,
+        ) as c:
+            c.stdout = "x" * 1024
+
+        kwargs = ctx.driver.job_send.call_args.kwargs
+        self.assertTrue(kwargs["stdout"].startswith("\x1a"))
+        self.assertEqual(utils.decompress_frame(kwargs["stdout"]), "x" * 1024)
+
+    def test_result_batch_size(self):
+        ctx = unittest.mock.MagicMock()
+        batch = utils.ResultBatch(ctx=ctx, window=60, size=2)
+        batch.add(msg_id="test-id1")
+        ctx.driver.job_send.assert_not_called()
+        batch.add(msg_id="test-id2")
+        ctx.driver.job_send.assert_called_once()
+        self.assertFalse(batch.pending)
+        batch.flush()
+        ctx.driver.job_send.assert_called_once()
+
     @patch("ssh.key.import_privkey_file", autospec=True)
     def test_sshconnect_keyfile(self, mock_import_key):
         with utils.SSHConnect(
@@ -26,6 +26,8 @@ from directord import iodict
 class User(interface.Interface):
     """Directord User interface class."""
 
+    load_driver = False
+
     def __init__(self, args):
         """Initialize the User interface class.
 
@@ -51,14 +53,47 @@ class Manage(User):
         """
 
         super(User, self).__init__(args=args)
+        self.streamed = dict()
+
+    def stream_output(self, stdout, stderr):
+        """Print output which has not been printed for a given job.
+
+        Running jobs return output incrementally, only the output received
+        since the last call is printed. If the output no longer matches the
+        printed output, the complete output is printed.
+
+        :param stdout: Job stdout, by node.
+        :type stdout: Dictionary
+        :param stderr: Job stderr, by node.
+        :type stderr: Dictionary
+        """
+
+        outputs = [("STDOUT", stdout or dict()), ("STDERR", stderr or dict())]
+        for node in sorted(set(i for _, v in outputs for i in v.keys())):
+            for name, output in outputs:
+                value = output.get(node)
+                if not value:
+                    continue
+
+                printed = self.streamed.get((node, name), "")
+                if value.startswith(printed):
+                    delta = value.replace(printed, "", 1)
+                else:
+                    delta = value
+
+                self.streamed[(node, name)] = value
+                if delta.strip():
+                    print("{} -- {}\n{}".format(node, name, delta))
 
-    def poll_job(self, job_id):
+    def poll_job(self, job_id, stream=False):
         """Given a job poll for its completion and return status.
 
         > The status return is (Boolean, String)
 
         :param job_id: UUID for job
         :type job_id: String
+        :param stream: Enable|Disable printing output while a job runs.
+        :type stream: Boolean
         :returns: Tuple
         """
 
@@ -102,6 +137,8 @@ class Manage(User):
                 stderr = data_return.get("STDERR")
                 job_state = data_return.get("PROCESSING", "unknown")
                 if job_state == self.driver.job_processing:
+                    if stream:
+                        self.stream_output(stdout=stdout, stderr=stderr)
                     time.sleep(job_processing_interval)
                     processing_attempts += 1
                     if processing_attempts > 20:
@@ -309,6 +346,7 @@ class Manage(User):
 
         execution_map = {
             "dump-cache": _cache_dump,
+            "driver-metrics": {"driver_metrics": None},
             "export-jobs": {"list_jobs": None},
             "export-nodes": {"list_nodes": None},
             "job-info": {"job_info": override},
@@ -12,24 +12,34 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 
+import base64
 import hashlib
 import json
 import os
 import pkgutil
 import socket
 import sys
+import threading
 import time
 import uuid
+import zlib
 
-import tabulate
 import yaml
 
+try:
+    import msgpack
+except (ImportError, ModuleNotFoundError):
+    msgpack = None
+
 from ssh import options
 from ssh.session import Session
 from ssh import key as ssh_key
 
-from directord import components
 from directord import logger
+from directord import models
+
+COMPRESSION = "zlib"
+ENCODING = "msgpack"
 
 
 def dump_yaml(file_path, data):
@@ -86,6 +96,136 @@ def merge_dict(base, new, extend=True):
     return base
 
 
+def compress_frame(item, threshold):
+    """Return a compressed message frame.
+
+    Items smaller than the threshold, or items which do not shrink, are
+    returned unchanged. Compressed frames are base64 encoded so that they
+    are safe for all drivers and are prefixed with the `compress_notice`
+    control character.
+
+    :param item: Message frame.
+    :type item: String|Bytes
+    :param threshold: Minimum size, in bytes, of a compressed frame. A value
+                      of 0 disables compression.
+    :type threshold: Integer
+    :returns: String|Bytes
+    """
+
+    if not threshold or not item or len(item) < threshold:
+        return item
+
+    if isinstance(item, str):
+        encoded_item = item.encode()
+    else:
+        encoded_item = item
+
+    encoded = base64.b64encode(zlib.compress(encoded_item)).decode()
+    compressed = models.BaseModel.compress_notice + encoded
+    if len(compressed) >= len(encoded_item):
+        return item
+
+    return compressed
+
+
+def decompress_frame(item):
+    """Return a decompressed message frame.
+
+    Bytes-like frames are decompressed or decoded without first being
+    converted to a string. Other items which were not compressed are
+    returned unchanged.
+
+    :param item: Message frame.
+    :type item: String|Bytes|Memoryview
+    :returns: String
+    """
+
+    if isinstance(item, (bytes, bytearray, memoryview)):
+        if item[:1] == models.BaseModel.compress_notice.encode():
+            return zlib.decompress(base64.b64decode(item[1:])).decode()
+        return str(item, "utf-8")
+    elif isinstance(item, str) and item.startswith(
+        models.BaseModel.compress_notice
+    ):
+        return zlib.decompress(base64.b64decode(item[1:])).decode()
+
+    return item
+
+
+def encode_payload(item, encoding=None):
+    """Return an encoded message payload.
+
+    Payloads are JSON encoded unless msgpack is requested and available.
+    Msgpack payloads are base64 encoded so that they are safe for all
+    drivers and are prefixed with the `encoding_notice` control character.
+
+    :param item: Message payload.
+    :type item: Object
+    :param encoding: Payload encoding, json or msgpack.
+    :type encoding: String
+    :returns: String
+    """
+
+    if encoding == ENCODING and msgpack:
+        return (
+            models.BaseModel.encoding_notice
+            + base64.b64encode(msgpack.packb(item)).decode()
+        )
+
+    return json.dumps(item)
+
+
+def _has_encoding_notice(item):
+    """Return True when a message payload starts with the encoding notice.
+
+    :param item: Encoded message payload.
+    :type item: String|Bytes|Memoryview
+    :returns: Boolean
+    """
+
+    notice = models.BaseModel.encoding_notice
+    if isinstance(item, (bytes, bytearray, memoryview)):
+        notice = notice.encode()
+    elif not isinstance(item, str):
+        return False
+
+    return item[:1] == notice
+
+
+def decode_payload(item):
+    """Return a decoded message payload.
+
+    :param item: Encoded message payload.
+    :type item: String|Bytes|Memoryview
+    :returns: Object
+    """
+
+    if _has_encoding_notice(item):
+        # NOTE(cloudnull): Payloads may contain maps with non-string keys,
+        #                  which JSON payloads have always allowed.
+        return msgpack.unpackb(
+            base64.b64decode(item[1:]), strict_map_key=False
+        )
+    elif isinstance(item, memoryview):
+        item = item.tobytes()
+
+    return json.loads(item)
+
+
+def get_payload_encoding(item):
+    """Return the encoding used for a message payload.
+
+    :param item: Encoded message payload.
+    :type item: String|Bytes|Memoryview
+    :returns: String
+    """
+
+    if _has_encoding_notice(item):
+        return ENCODING
+
+    return "json"
+
+
 class ClientStatus:
     """Context manager for transmitting client status."""
 
@@ -128,7 +268,7 @@ class ClientStatus:
         except AttributeError:
             pass
 
-        job_sent = self.ctx.driver.job_send(
+        message = dict(
             msg_id=self.job_id,
             control=self.job_state,
             command=self.command,
@@ -137,11 +277,138 @@ class ClientStatus:
             stderr=self.stderr,
             stdout=self.stdout,
         )
+        if getattr(self.ctx, "compression", False) is True:
+            for key in ["data", "stderr", "stdout"]:
+                message[key] = compress_frame(
+                    item=message[key],
+                    threshold=self.ctx.compression_threshold,
+                )
+
+        result_batch = getattr(self.ctx, "result_batch", None)
+        if result_batch:
+            result_batch.add(**message)
+            self.ctx.log.debug(
+                "Job [ %s ] message added to result batch", self.job_id
+            )
+            return
+
+        job_sent = self.ctx.driver.job_send(**message)
         self.ctx.log.debug(
             "Job [ %s ] message sent on exit, %s", self.job_id, job_sent
         )
 
 
+class ResultBatch:
+    """Coalesce job messages into batches.
+
+    Messages added within the batch window are sent as a single message
+    using the `batch_notice` control character. The message data contains
+    a JSON encoded list of all message records.
+    """
+
+    def __init__(self, ctx, window, size=128):
+        """Initialize the result batch.
+
+        :param ctx: Object with access to the driver and log.
+        :type ctx: Object
+        :param window: Time, in seconds, messages are held before sending.
+        :type window: Float
+        :param size: Maximum number of messages within a batch.
+        :type size: Integer
+        """
+
+        self.ctx = ctx
+        self.window = window
+        self.size = size
+        self.records = list()
+        self.expire_time = None
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _encode(item):
+        """Return a JSON safe message item.
+
+        :param item: Message item.
+        :type item: String|Bytes
+        :returns: String|None
+        """
+
+        if isinstance(item, bytes):
+            item = item.decode(errors="replace")
+
+        return item or None
+
+    def add(self, **message):
+        """Add a message to the batch, sending the batch when full.
+
+        :param message: Keyword arguments used with `driver.job_send`.
+        :type message: Dictionary
+        """
+
+        with self.lock:
+            if not self.records:
+                self.expire_time = time.time() + self.window
+
+            self.records.append(
+                {k: self._encode(v) for k, v in message.items()}
+            )
+            full = len(self.records) >= self.size
+
+        if full:
+            self.flush()
+
+    @property
+    def pending(self):
+        """Return True when messages are held within the batch.
+
+        :returns: Boolean
+        """
+
+        return bool(self.records)
+
+    def check(self):
+        """Send the batch when the batch window has expired.
+
+        :returns: Boolean
+        """
+
+        with self.lock:
+            expired = self.records and time.time() >= self.expire_time
+
+        if expired:
+            self.flush()
+            return True
+        return False
+
+    def flush(self):
+        """Send all held messages."""
+
+        with self.lock:
+            records, self.records = self.records, list()
+
+        if not records:
+            return
+
+        data = encode_payload(
+            records, encoding=getattr(self.ctx, "encoding", None)
+        )
+        if getattr(self.ctx, "compression", False) is True:
+            data = compress_frame(
+                item=data, threshold=self.ctx.compression_threshold
+            )
+
+        job_sent = self.ctx.driver.job_send(
+            msg_id=get_uuid(),
+            control=self.ctx.driver.batch_notice,
+            data=data,
+        )
+        self.ctx.log.debug(
+            "Result batch with [ %s ] messages sent, %s",
+            len(records),
+            job_sent,
+        )
+
+
 class SSHConnect:
     """Context manager to remotely connect to servers using libssh.
 
@@ -287,6 +554,26 @@ def object_sha3_224(obj):
     return hashlib.sha3_224(json.dumps(obj).encode()).hexdigest()
 
 
+def strtobool(value):
+    """Return an integer for a truthy or falsy string.
+
+    This mirrors the distutils implementation, which is avoided as it is
+    slow to import.
+
+    :param value: String value to convert.
+    :type value: String
+    :returns: Integer
+    """
+
+    value = value.lower()
+    if value in ("y", "yes", "t", "true", "on", "1"):
+        return 1
+    elif value in ("n", "no", "f", "false", "off", "0"):
+        return 0
+    else:
+        raise ValueError("invalid truth value {}".format(repr(value)))
+
+
 def get_uuid():
     """Return a new UUID in String format.
 
@@ -305,6 +592,8 @@ def print_tabulated_data(data, headers):
     :type headers: List
     """
 
+    import tabulate
+
     print(
         tabulate.tabulate(
             data,
@@ -342,6 +631,8 @@ def return_poller_interval(poller_time, poller_interval, log=None):
 def component_lock_search():
     """Return a list of available components."""
 
+    from directord import components
+
     paths = [
         os.path.dirname(components.__file__),
         os.path.join(sys.base_prefix, "share/directord/components"),
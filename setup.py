@@ -31,6 +31,7 @@ REQUIREMENTS = {
     "oslo_messaging": ["oslo_messaging[amqp1]"],
     "zmq": ["pyzmq"],
     "grpc": [GPRC_PACKAGE, "protobuf"],
+    "msgpack": ["msgpack"],
 }
 
 REQUIREMENTS["all"] = list(